@@ -0,0 +1,3 @@
+"""
+Teljesítménymérések a gdspacypdf csomaghoz.
+"""
@@ -0,0 +1,67 @@
+"""
+Importálási idő ellenőrzése: az `import src` és a `gdspacypdf --help` futási
+idejének mérése külön folyamatban, a megadott időkorláthoz képest.
+A nyelvi modell (spacy, huspacy) nem töltődhet be importáláskor.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.bench_import_time --import-budget 1.0 --help-budget 1.5
+
+Ha valamelyik mérés túllépi a korlátot, a kilépési kód 1.
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+# Importálás után kiírja, hogy betöltődött-e a nyelvi modell csomagja
+_IMPORT_CHECK = (
+    "import sys, src; "
+    "print(','.join(m for m in ('spacy', 'huspacy') if m in sys.modules))"
+)
+
+
+def _best_time(command, repeat):
+    """A parancs legjobb futási ideje (másodperc) és utolsó kimenete"""
+    best = None
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = result.stdout
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importálási idő ellenőrzése')
+    parser.add_argument('--import-budget', type=float, default=1.0,
+                        help='Az `import src` megengedett ideje másodpercben')
+    parser.add_argument('--help-budget', type=float, default=1.5,
+                        help='A `gdspacypdf --help` megengedett ideje másodpercben')
+    parser.add_argument('--repeat', type=int, default=5, help='Ismétlések száma, a legjobb idő számít')
+    args = parser.parse_args()
+
+    ok = True
+
+    import_time, loaded = _best_time([sys.executable, '-c', _IMPORT_CHECK], args.repeat)
+    loaded = loaded.strip()
+    status = "OK" if import_time <= args.import_budget else "TÚLLÉPVE"
+    print(f"import src:        {import_time:6.3f} s (korlát: {args.import_budget:.3f} s) {status}")
+    if import_time > args.import_budget:
+        ok = False
+    if loaded:
+        print(f"HIBA: importáláskor betöltődött: {loaded}")
+        ok = False
+
+    help_time, _ = _best_time([sys.executable, '-m', 'src.main', '--help'], args.repeat)
+    status = "OK" if help_time <= args.help_budget else "TÚLLÉPVE"
+    print(f"gdspacypdf --help: {help_time:6.3f} s (korlát: {args.help_budget:.3f} s) {status}")
+    if help_time > args.help_budget:
+        ok = False
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
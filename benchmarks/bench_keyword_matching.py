@@ -0,0 +1,94 @@
+"""
+A kulcsszó illesztés sebessége: kulcsszavankénti regex keresés és az
+egymenetes KeywordMatcher összehasonlítása egyre hosszabb kulcsszó listákkal.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.bench_keyword_matching --keywords 9 100 500
+"""
+import argparse
+import random
+import re
+import time
+
+from src.resolutions.analyzer import KEYWORDS
+from src.resolutions.matcher import KeywordMatcher
+
+_WORDS = [
+    "önkormányzat", "helyi", "települési", "adósság", "keletkeztető", "ügylet",
+    "gazdasági", "társaság", "iparűzési", "adó", "kormány", "határozat",
+    "támogatás", "fejezet", "miniszter", "felhívja", "forrás", "biztosítás",
+    "beruházás", "fejlesztés", "költségvetés", "megyei", "város", "község",
+]
+
+
+def _legacy_keyword_matches(resolution, keywords):
+    """Az eredeti, kulcsszavanként regexet fordító és kisbetűsítő megoldás"""
+    keyword_matches = []
+    for keyword in keywords:
+        title_matches = len(re.findall(r'\b' + keyword + r'\w*\b', resolution['title'].lower()))
+        content_matches = len(re.findall(r'\b' + keyword + r'\w*\b', resolution['content'].lower()))
+        if title_matches > 0 or content_matches > 0:
+            keyword_matches.append({
+                'keyword': keyword,
+                'title_count': title_matches,
+                'content_count': content_matches
+            })
+    return keyword_matches
+
+
+def _make_keywords(count, rng):
+    """Az alap kulcsszavak kiegészítése véletlen két-három szavas kifejezésekkel"""
+    keywords = list(KEYWORDS)
+    while len(keywords) < count:
+        phrase = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 3)))
+        if phrase not in keywords:
+            keywords.append(phrase)
+    return keywords[:count]
+
+
+def _make_resolutions(count, words, rng):
+    resolutions = []
+    for i in range(count):
+        content = " ".join(rng.choice(_WORDS) + rng.choice(["", "ok", "i", "nak", "ban"])
+                           for _ in range(words))
+        resolutions.append({
+            'title': f"A Kormány {1000 + i}/2025. (V. 14.) Korm. határozata",
+            'content': content.capitalize(),
+        })
+    return resolutions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kulcsszó illesztés sebességmérése')
+    parser.add_argument('--keywords', type=int, nargs='+', default=[9, 100, 300, 600])
+    parser.add_argument('--resolutions', type=int, default=200)
+    parser.add_argument('--words', type=int, default=400, help='Szavak száma kormányhatározatonként')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resolutions = _make_resolutions(args.resolutions, args.words, rng)
+    print(f"{len(resolutions)} kormányhatározat, egyenként {args.words} szó")
+
+    for count in args.keywords:
+        keywords = _make_keywords(count, rng)
+
+        start = time.perf_counter()
+        legacy = [_legacy_keyword_matches(resolution, keywords) for resolution in resolutions]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compile_time = time.perf_counter() - start
+        start = time.perf_counter()
+        current = [matcher.match_resolution(resolution) for resolution in resolutions]
+        matcher_time = time.perf_counter() - start
+
+        same = "egyezik" if legacy == current else "ELTÉR"
+        print(f"{len(keywords):4d} kulcsszó: regex {legacy_time:8.3f} s, "
+              f"matcher {matcher_time:8.3f} s (+{compile_time:.3f} s fordítás), "
+              f"gyorsulás: {legacy_time / matcher_time:6.1f}x, eredmény: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+A soros és a párhuzamos PDF szövegkinyerés sebességének összehasonlítása.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.bench_pdf_extraction samples/MK_25_026.pdf --workers 2 4 8
+"""
+import argparse
+import time
+
+from src.pdf.pdf_processor import extract_page_texts, DEFAULT_CHUNK_SIZE
+
+
+def _measure(pdf_path, workers, chunk_size, repeat):
+    """Legjobb futási idő (másodperc) és az oldalszövegek"""
+    best = None
+    texts = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts = extract_page_texts(pdf_path, workers=workers, chunk_size=chunk_size, use_cache=False)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soros és párhuzamos PDF kinyerés összehasonlítása')
+    parser.add_argument('pdf_path', help='A mérendő PDF fájl útvonala')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4],
+                        help='Mérendő worker számok')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--repeat', type=int, default=3, help='Ismétlések száma, a legjobb idő számít')
+    args = parser.parse_args()
+
+    serial_time, serial_texts = _measure(args.pdf_path, 1, args.chunk_size, args.repeat)
+    pages = len(serial_texts)
+    print(f"Oldalak száma: {pages}")
+    print(f"Soros:        {serial_time:8.3f} s  ({pages / serial_time:7.1f} oldal/s)")
+
+    for workers in args.workers:
+        elapsed, texts = _measure(args.pdf_path, workers, args.chunk_size, args.repeat)
+        same = "egyezik" if texts == serial_texts else "ELTÉR"
+        print(f"{workers:2d} worker:    {elapsed:8.3f} s  ({pages / elapsed:7.1f} oldal/s)  "
+              f"gyorsulás: {serial_time / elapsed:5.2f}x  szöveg: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+A kormányhatározatok memóriaigénye szintetikus közlönyszövegeken: az
+extract_resolutions szótárlistája és a tömör, oszlopos ResolutionBatch
+(extract_resolutions(columnar=True)) összehasonlítása. A megtartott és a
+csúcs memóriát tracemalloc méri (a bemeneti szöveg nélkül), mellette a
+kinyerés és a kulcsszó illesztés ideje, valamint a folyamatok közötti
+átadás (pickle) mérete szerepel.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.bench_resolution_memory --sizes 10000 50000 100000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import pickle
+import time
+import tracemalloc
+
+from src.resolutions.analyzer import KEYWORDS
+from src.resolutions.extractor import extract_resolutions
+from src.resolutions.matcher import KeywordMatcher
+from .corpus import make_gazette_text
+
+
+def _measure(text, columnar):
+    """(kormányhatározatok, megtartott bájtok, csúcs bájtok, kinyerési idő)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resolutions = extract_resolutions(text, columnar=columnar)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resolutions, retained, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kormányhatározatok memóriaigénye: szótárak és ResolutionBatch')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000],
+                        help='Kormányhatározatok száma a szintetikus szövegekben')
+    parser.add_argument('--words', type=int, default=60, help='Szavak száma kormányhatározatonként')
+    args = parser.parse_args()
+
+    matcher = KeywordMatcher(KEYWORDS)
+    for size in args.sizes:
+        text = make_gazette_text(size, args.words)
+        print(f"{size} kormányhatározat ({len(text) / 1e6:.1f} M karakter):")
+        for label, columnar in (('szótárak', False), ('ResolutionBatch', True)):
+            resolutions, retained, peak, elapsed = _measure(text, columnar)
+
+            start = time.perf_counter()
+            for resolution in resolutions:
+                matcher.match_resolution(resolution)
+            match_elapsed = time.perf_counter() - start
+            pickled = len(pickle.dumps(resolutions, protocol=pickle.HIGHEST_PROTOCOL))
+
+            print(f"  {label:16s} megtartott {retained / 1e6:8.1f} MB ({retained / size:7.0f} B/db), "
+                  f"csúcs {peak / 1e6:8.1f} MB, kinyerés {elapsed:6.2f} s, "
+                  f"illesztés {match_elapsed:6.2f} s, pickle {pickled / 1e6:7.1f} MB")
+            del resolutions
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+A kormányhatározatokra bontás skálázódása szintetikus közlönyszövegeken:
+az eredeti, lusta DOTALL + lookahead regex és az egymenetes segment_resolutions
+összehasonlítása 10 000 - 100 000 kormányhatározatos szövegeken.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.bench_segmentation --sizes 10000 20000 50000 100000
+"""
+import argparse
+import contextlib
+import io
+import re
+import time
+
+from src.resolutions.extractor import extract_resolutions
+from .corpus import make_gazette_text
+
+# Az eredeti minta, összehasonlításhoz
+LEGACY_PATTERN = r"A\s+Kormány\s+(\d+)[\/\s]+(\d{4})[\.|\s]+[\(]+((?:I|V|X|L|C|D|M)+)[\.|\s]+(\d+)[\.|\s]+[\)]+\s+Korm[\.|\s]+határozata(.*?)(?=A\s+Kormány\s+\d+[\/\s]+\d{4}|$)"
+
+
+def _legacy_segment_count(text):
+    return sum(1 for _ in re.finditer(LEGACY_PATTERN, text, re.DOTALL | re.IGNORECASE))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kormányhatározatokra bontás skálázódása')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 20000, 50000, 100000],
+                        help='Kormányhatározatok száma a szintetikus szövegekben')
+    parser.add_argument('--words', type=int, default=60, help='Szavak száma kormányhatározatonként')
+    parser.add_argument('--skip-legacy', action='store_true', help='Az eredeti regex mérésének kihagyása')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        text = make_gazette_text(size, args.words)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resolutions = extract_resolutions(text)
+        elapsed = time.perf_counter() - start
+        line = (f"{size:7d} kormányhatározat ({len(text) / 1e6:6.1f} M karakter): "
+                f"egymenetes {elapsed:7.3f} s ({elapsed / size * 1e6:6.2f} µs/db)")
+
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            legacy_count = _legacy_segment_count(text)
+            legacy_elapsed = time.perf_counter() - start
+            line += (f", eredeti regex {legacy_elapsed:7.3f} s ({legacy_elapsed / size * 1e6:6.2f} µs/db)"
+                     f"{'' if legacy_count == len(resolutions) else ', DARABSZÁM ELTÉR'}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Az összefoglalás áteresztőképessége (dokumentum/másodperc): dokumentumonkénti
+teljes pipeline, kötegelt nlp.pipe csak a mondatra bontáshoz szükséges
+komponensekkel, illetve szabályalapú sentencizer.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.bench_summarization --docs 200 --batch-size 32
+    python -m benchmarks.bench_summarization --sentencizer-only
+"""
+import argparse
+import random
+import time
+from itertools import islice
+
+from src.resolutions.analyzer import get_nlp, summarize_contents, DEFAULT_BATCH_SIZE
+
+_WORDS = [
+    "a", "Kormány", "felhívja", "pénzügyminisztert", "helyi", "önkormányzatok",
+    "támogatására", "szükséges", "forrás", "biztosítására", "települési",
+    "adósságot", "keletkeztető", "ügyletek", "iparűzési", "adó", "bevételeiről",
+]
+
+
+def _make_contents(count, sentences, rng):
+    contents = []
+    for _ in range(count):
+        text = " ".join(
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 25))).capitalize() + "."
+            for _ in range(sentences)
+        )
+        contents.append(text)
+    return contents
+
+
+def _legacy_summaries(contents, model_name):
+    """Az eredeti megoldás: dokumentumonként a teljes pipeline"""
+    nlp = get_nlp(model_name)
+    return ['. '.join([sent.text for sent in list(nlp(content).sents)[:3]]) for content in contents]
+
+
+def _report(label, count, elapsed):
+    print(f"{label:40s} {elapsed:8.3f} s  {count / elapsed:8.1f} dokumentum/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Összefoglalás áteresztőképességének mérése')
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--sentences', type=int, default=20, help='Mondatok száma dokumentumonként')
+    parser.add_argument('--model', default=None)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--sentencizer-only', action='store_true',
+                        help='Csak a szabályalapú mondatra bontás mérése (nyelvi modell nélkül)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    contents = _make_contents(args.docs, args.sentences, random.Random(args.seed))
+
+    if not args.sentencizer_only:
+        # A modell betöltése ne számítson bele a mérésbe
+        get_nlp(args.model)
+
+        start = time.perf_counter()
+        legacy = _legacy_summaries(contents, args.model)
+        _report("nlp() dokumentumonként (eredeti)", len(contents), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batched = summarize_contents(contents, model_name=args.model, batch_size=args.batch_size,
+                                     n_process=args.n_process)
+        _report("nlp.pipe, csak mondatra bontás", len(contents), time.perf_counter() - start)
+        print(f"Összefoglalók: {'egyeznek' if legacy == batched else 'ELTÉRNEK'}")
+
+    summarize_contents(list(islice(contents, 1)), sentencizer=True)
+    start = time.perf_counter()
+    summarize_contents(contents, batch_size=args.batch_size, n_process=args.n_process, sentencizer=True)
+    _report("sentencizer", len(contents), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
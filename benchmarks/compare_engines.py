@@ -0,0 +1,72 @@
+"""
+A PDF szövegkinyerő motorok összehasonlítása: sebesség (oldal/s) és a kinyert
+szöveg egyezése a referencia motorral (kormányhatározatok száma és azonosítói,
+valamint a szókészletek hasonlósága).
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.compare_engines samples/ --engines pdfplumber pypdf
+"""
+import argparse
+import contextlib
+import io
+import re
+import time
+
+from src.pdf.engines import ENGINES, DEFAULT_ENGINE
+from src.pdf.pdf_processor import iter_pdf_pages
+from src.pipeline.batch import collect_pdf_paths
+from src.resolutions.extractor import extract_resolutions
+
+
+def _run(pdf_path, engine):
+    """Futási idő, oldalszám, kormányhatározat azonosítók és szókészlet egy motorral"""
+    start = time.perf_counter()
+    pages = list(iter_pdf_pages(pdf_path, engine=engine, use_cache=False))
+    elapsed = time.perf_counter() - start
+
+    text = ''.join(page['text'] for page in pages)
+    with contextlib.redirect_stdout(io.StringIO()):
+        resolutions = extract_resolutions(text)
+    ids = {f"{r['number']}/{r['year']}" for r in resolutions}
+    words = set(re.findall(r'\w+', text.lower()))
+    return elapsed, len(pages), ids, words
+
+
+def _jaccard(a, b):
+    """Két halmaz Jaccard-hasonlósága"""
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF szövegkinyerő motorok összehasonlítása')
+    parser.add_argument('paths', nargs='+', help='PDF fájlok, könyvtárak vagy glob minták')
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES),
+                        help='Mérendő motorok')
+    parser.add_argument('--reference', choices=sorted(ENGINES), default=DEFAULT_ENGINE,
+                        help='A referencia motor, amelyhez a többit hasonlítja')
+    args = parser.parse_args()
+
+    engines = [args.reference] + [e for e in args.engines if e != args.reference]
+    totals = {engine: [0.0, 0] for engine in engines}
+
+    for pdf_path in collect_pdf_paths(args.paths):
+        print(pdf_path)
+        results = {engine: _run(pdf_path, engine) for engine in engines}
+        _, _, ref_ids, ref_words = results[args.reference]
+        for engine in engines:
+            elapsed, pages, ids, words = results[engine]
+            totals[engine][0] += elapsed
+            totals[engine][1] += pages
+            parity = "egyezik" if ids == ref_ids else f"ELTÉR (hiányzik: {len(ref_ids - ids)}, többlet: {len(ids - ref_ids)})"
+            print(f"  {engine:12s} {elapsed:8.3f} s  {pages / elapsed:7.1f} oldal/s  "
+                  f"határozatok: {len(ids):4d} {parity}  szókészlet Jaccard: {_jaccard(words, ref_words):.3f}")
+
+    print("Összesen:")
+    ref_time = totals[args.reference][0]
+    for engine, (elapsed, pages) in totals.items():
+        if elapsed:
+            print(f"  {engine:12s} {pages / elapsed:7.1f} oldal/s  gyorsulás: {ref_time / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Szintetikus Magyar Közlöny korpusz a teljesítménymérésekhez: normalizált
+szöveg vagy valódi (pdfplumberrel és pypdf-fel is olvasható) PDF, megadható
+oldal- és kormányhatározat-számmal, valószerű fejlécekkel, pl.
+"A Kormány 1234/2025. (V. 14.) Korm. határozata". Ugyanazzal a seed-del
+mindig ugyanazt a korpuszt adja.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.corpus synthetic.pdf --pages 200 --resolutions 40
+    python -m benchmarks.corpus synthetic.txt --resolutions 10000 --text
+"""
+import argparse
+import random
+
+_MONTHS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII']
+_WORDS = ["a", "Kormány", "felhívja", "pénzügyminisztert", "helyi", "önkormányzatok",
+          "támogatására", "forrás", "biztosítására", "határidő:", "azonnal", "felelős:"]
+_SUBJECTS = ["a helyi önkormányzatok adósságot keletkeztető ügyleteiről",
+             "a települési önkormányzatok iparűzési adó bevételének kiegészítéséről",
+             "a Magyarország 2025. évi központi költségvetése fejezetei közötti átcsoportosításról",
+             "egyes beruházások kiemelt jelentőségű üggyé nyilvánításáról",
+             "a gazdasági társaságok adósságot keletkeztető ügyleteinek engedélyezéséről"]
+# A kormányhatározatokon kívüli (rendeleti) oldalak szókészlete
+_DECREE_WORDS = ["rendelet", "miniszter", "bekezdés", "pontja", "szerinti", "hatályba",
+                 "lép", "kihirdetését", "követő", "napon", "eljárás", "kérelem"]
+
+# Sorok száma oldalanként és szavak száma soronként a PDF-ben
+LINES_PER_PAGE = 60
+WORDS_PER_LINE = 12
+
+
+def make_header(number, rng, year=2025):
+    """Egy kormányhatározat fejléce véletlen dátummal"""
+    return f"A Kormány {number}/{year}. ({rng.choice(_MONTHS)}. {rng.randint(1, 28)}.) Korm. határozata"
+
+
+def make_gazette_text(resolutions, words, seed=42):
+    """Szintetikus, normalizált közlönyszöveg a megadott számú kormányhatározattal"""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(resolutions):
+        parts.append(make_header(1000 + i, rng) + " ")
+        parts.append(" ".join(rng.choice(_WORDS) for _ in range(words)) + " ")
+    return "".join(parts)
+
+
+def make_gazette_pages(pages, resolutions, seed=42, decree_ratio=0.5):
+    """
+    Szintetikus közlöny oldalai (oldalanként a sorok listája).
+    Az első decree_ratio arányú oldalak rendeletek, a kormányhatározatok
+    egyenletesen oszlanak el a többi oldalon.
+    """
+    rng = random.Random(seed)
+    first = min(pages - 1, int(pages * decree_ratio)) if resolutions else pages
+    starts = {}
+    for i in range(resolutions):
+        starts.setdefault(first + i * (pages - first) // resolutions, []).append(1000 + i)
+
+    result = []
+    for page in range(pages):
+        lines = []
+        if page == 0:
+            lines.append(f"MAGYAR KÖZLÖNY 2025. évi {rng.randint(1, 150)}. szám")
+        vocabulary = _DECREE_WORDS if page < first else _WORDS
+        headers = starts.get(page, [])
+        # A fejlécek az oldal sorai között egyenletesen helyezkednek el
+        header_lines = {LINES_PER_PAGE * k // len(headers): number for k, number in enumerate(headers)}
+        while len(lines) < LINES_PER_PAGE:
+            number = header_lines.pop(len(lines), None)
+            if number is not None:
+                lines.append(make_header(number, rng))
+                lines.append(rng.choice(_SUBJECTS))
+            else:
+                lines.append(" ".join(rng.choice(vocabulary) for _ in range(WORDS_PER_LINE)))
+        result.append(lines)
+    return result
+
+
+def _pdf_string(line):
+    """Egy sor PDF szöveg literálként (WinAnsi kódolás, az ő/ű a Differences táblán át)"""
+    line = line.translate(str.maketrans({'ő': 'õ', 'ű': 'û', 'Ő': 'Õ', 'Ű': 'Û'}))
+    escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return b"(" + escaped.encode('cp1252') + b")"
+
+
+def write_gazette_pdf(path, pages):
+    """
+    Minimális, külső függőség nélküli PDF írása: oldalanként egy Helvetica
+    szövegblokk. A kódolás a magyar ékezetes betűket (ő, ű) is tartalmazza.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding << /Type /Encoding "
+        b"/BaseEncoding /WinAnsiEncoding /Differences [213 /Odblacute 219 /Udblacute "
+        b"245 /odblacute 251 /udblacute] >> >>",
+    ]
+    kids = []
+    for lines in pages:
+        body = b"BT /F1 9 Tf 12 TL 40 800 Td " + b" ".join(_pdf_string(line) + b" '" for line in lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(body) + body + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = (b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % kid for kid in kids) +
+                  b"] /Count %d >>" % len(kids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Szintetikus Magyar Közlöny előállítása')
+    parser.add_argument('output', help='A kimeneti PDF (vagy --text esetén szöveg) fájl')
+    parser.add_argument('--pages', type=int, default=100, help='Oldalak száma')
+    parser.add_argument('--resolutions', type=int, default=20, help='Kormányhatározatok száma')
+    parser.add_argument('--words', type=int, default=60,
+                        help='Szavak száma kormányhatározatonként (csak --text esetén)')
+    parser.add_argument('--text', action='store_true', help='Normalizált szöveg PDF helyett')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.text:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(make_gazette_text(args.resolutions, args.words, args.seed))
+    else:
+        write_gazette_pdf(args.output, make_gazette_pages(args.pages, args.resolutions, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Tanítatlan spaCy pipeline a hu_core_news_lg komponenseivel (közös tok2vec,
+tagger, morphologizer, trainable_lemmatizer, parser, ner, valamint senter), a
+spacy init config alapértelmezett (efficiency) architektúráival, a nyelvi
+modellt igénylő mérésekhez olyan környezetben, ahol a modell nem tölthető le.
+
+A komponensek súlyai véletlenek (néhány szintetikus mondaton inicializálva),
+a szóvektorok hiányoznak, így a mért idők csak a komponensek egymáshoz
+viszonyított költségét mutatják, a valódi modellét nem; a mondathatárok és
+így az összefoglalók sem nyelvileg helyesek.
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.standin_pipeline /tmp/hu_standin
+    python -m benchmarks.bench_summarization --model /tmp/hu_standin --docs 200 --batch-size 32
+"""
+import argparse
+import random
+
+COMPONENTS = ('tagger', 'morphologizer', 'trainable_lemmatizer', 'parser', 'ner', 'senter')
+
+_WORDS = ["a", "Kormány", "felhívja", "pénzügyminisztert", "helyi", "önkormányzatok",
+          "támogatására", "szükséges", "forrás", "biztosítására", "települési"]
+
+
+def _examples(nlp, count, rng):
+    """Szintetikus tanítópéldák, hogy minden komponens címkekészlete inicializálható legyen"""
+    from spacy.training import Example
+
+    examples = []
+    for _ in range(count):
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 12))] + ["."]
+        length = len(words)
+        doc = nlp.make_doc(" ".join(words))
+        examples.append(Example.from_dict(doc, {
+            'words': words,
+            'tags': ['NOUN' if i % 2 else 'VERB' for i in range(length)],
+            'pos': ['NOUN' if i % 2 else 'VERB' for i in range(length)],
+            'morphs': ['Case=Nom' if i % 2 else 'Mood=Ind' for i in range(length)],
+            'lemmas': [word.lower() for word in words],
+            'heads': [0] + [i - 1 for i in range(1, length)],
+            'deps': ['ROOT'] + ['dep'] * (length - 1),
+            'sent_starts': [1] + [0] * (length - 1),
+            'entities': ['U-ORG'] + ['O'] * (length - 1),
+        }))
+    return examples
+
+
+def build_pipeline(seed=42):
+    """A tanítatlan pipeline (spacy.Language)"""
+    from spacy.cli.init_config import init_config
+    from spacy.util import load_model_from_config
+
+    config = init_config(lang='hu', pipeline=list(COMPONENTS), optimize='efficiency', gpu=False)
+    nlp = load_model_from_config(config, auto_fill=True)
+    examples = _examples(nlp, 20, random.Random(seed))
+    nlp.initialize(lambda: examples)
+    return nlp
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tanítatlan, a hu_core_news_lg felépítésű spaCy pipeline')
+    parser.add_argument('output', help='A pipeline könyvtára (spacy.load / huspacy.load ezzel betölthető)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    nlp = build_pipeline(args.seed)
+    nlp.to_disk(args.output)
+    print(f"Pipeline mentve: {args.output} ({', '.join(nlp.pipe_names)})")
+
+
+if __name__ == "__main__":
+    main()
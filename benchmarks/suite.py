@@ -0,0 +1,197 @@
+"""
+Reprodukálható teljesítménymérés a feldolgozás szakaszaira, tárolt alapértékkel
+összevetve.
+
+A mérések szintetikus korpuszon futnak (lásd corpus.py), szakaszonként
+bemelegítő futás után több körben; a körök idejéből minimum, maximum, átlag,
+medián és szórás készül. A kiválasztott statisztika (alapértelmezetten a
+zajra legkevésbé érzékeny minimum) az alapértékhez (baseline.json) képest
+legfeljebb --threshold arányban lehet nagyobb, különben a mérés regressziót
+jelez és a program 1-es kóddal lép ki (CI-ben is használható).
+
+Futtatás a repó gyökeréből:
+    python -m benchmarks.suite                   # összevetés a tárolt alapértékkel
+    python -m benchmarks.suite --save-baseline   # új alapérték mentése
+    python -m benchmarks.suite --only segmentation keyword_scoring --rounds 10
+"""
+import argparse
+import contextlib
+import gc
+import io
+import math
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from src.pdf.pdf_processor import extract_text_from_pdf
+from src.resolutions.analyzer import analyze_resolutions, KEYWORDS
+from src.resolutions.extractor import extract_resolutions
+from src.resolutions.matcher import KeywordMatcher
+from .corpus import make_gazette_pages, make_gazette_text, write_gazette_pdf
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# Egy mérési kör legrövidebb ideje; a gyors szakaszok egy körben többször futnak
+MIN_ROUND_TIME = 0.2
+
+# A korpusz méretei; az alapérték csak azonos paraméterekkel vethető össze
+PARAMS = {
+    'pdf_pages': 20,
+    'pdf_resolutions': 8,
+    'text_resolutions': 5000,
+    'words': 60,
+    'seed': 42,
+}
+
+
+def _quiet(func, *args, **kwargs):
+    """A mért függvények diagnosztikai kiírásainak elnyelése"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def build_cases(workdir, params):
+    """
+    A mérendő szakaszok: név -> paraméter nélküli függvény.
+    A korpusz előállítása nem része a mérésnek.
+    """
+    pdf_path = os.path.join(workdir, 'synthetic.pdf')
+    write_gazette_pdf(pdf_path, make_gazette_pages(params['pdf_pages'], params['pdf_resolutions'],
+                                                   params['seed']))
+    text = make_gazette_text(params['text_resolutions'], params['words'], params['seed'])
+    resolutions = _quiet(extract_resolutions, text)
+    matcher = KeywordMatcher(KEYWORDS)
+
+    return {
+        'pdf_extraction': lambda: _quiet(extract_text_from_pdf, pdf_path, use_cache=False),
+        'pdf_extraction_pypdf': lambda: _quiet(extract_text_from_pdf, pdf_path, use_cache=False,
+                                               engine='pypdf'),
+        'segmentation': lambda: _quiet(extract_resolutions, text),
+        'keyword_scoring': lambda: [matcher.match_resolution(resolution) for resolution in resolutions],
+        # A nyelvi modell helyett a szabályalapú mondatra bontással, hogy modell nélkül is fusson
+        'analysis': lambda: _quiet(analyze_resolutions, resolutions, sentencizer=True),
+    }
+
+
+def measure(func, rounds, min_round_time=MIN_ROUND_TIME):
+    """
+    Egy szakasz időmérése: egy bemelegítő futás, majd rounds kör, a körök statisztikáival
+    (egy futásra vetítve). A bemelegítés ideje alapján egy kör annyi futásból áll,
+    hogy legalább min_round_time ideig tartson. Mérés közben a szemétgyűjtés ki van kapcsolva.
+    """
+    start = time.perf_counter()
+    func()
+    iterations = max(1, math.ceil(min_round_time / max(time.perf_counter() - start, 1e-9)))
+
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            times.append((time.perf_counter() - start) / iterations)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        'rounds': rounds,
+        'iterations': iterations,
+        'min': min(times),
+        'max': max(times),
+        'mean': statistics.mean(times),
+        'median': statistics.median(times),
+        'stddev': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def machine_info():
+    """A mérést végző gép leírása; eltérő gépen mért alapérték csak tájékoztató"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold, stat='min'):
+    """
+    Összevetés az alapértékkel a megadott statisztika szerint.
+    Visszaadja a regressziót mutató szakaszok nevét.
+    """
+    regressions = []
+    base_results = baseline.get('benchmarks', {}) if baseline else {}
+    print(f"{'szakasz':22s} {stat:>10s} {'medián':>10s} {'szórás':>10s} {'alapérték':>10s} {'arány':>7s}")
+    for name, stats in results.items():
+        line = (f"{name:22s} {stats[stat] * 1000:8.2f}ms {stats['median'] * 1000:8.2f}ms "
+                f"{stats['stddev'] * 1000:8.2f}ms")
+        base = base_results.get(name)
+        if base:
+            ratio = stats[stat] / base[stat]
+            status = ""
+            if ratio > 1 + threshold:
+                status = "  REGRESSZIÓ"
+                regressions.append(name)
+            elif ratio < 1 - threshold:
+                status = "  gyorsabb"
+            line += f" {base[stat] * 1000:8.2f}ms {ratio:6.2f}x{status}"
+        else:
+            line += f" {'-':>10s} {'-':>7s}"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Szakaszonkénti teljesítménymérés alapértékkel összevetve')
+    parser.add_argument('--rounds', type=int, default=5, help='Mérési körök száma szakaszonként')
+    parser.add_argument('--only', nargs='+', default=None, help='Csak a megadott szakaszok mérése')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Az alapérték fájl')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Az eredmények mentése új alapértékként')
+    parser.add_argument('--stat', choices=['min', 'median', 'mean'], default='min',
+                        help='Az összevetés alapjául szolgáló statisztika')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='A megengedett lassulás az alapértékhez képest (0.25 = 25%%)')
+    parser.add_argument('--output', default=None, help='Az eredmények mentése JSON fájlba')
+    args = parser.parse_args()
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != PARAMS:
+            print("Figyelmeztetés: az alapérték más korpusz paraméterekkel készült, nem vethető össze.")
+            baseline = None
+        elif baseline.get('machine') != machine_info():
+            print("Figyelmeztetés: az alapérték más gépen vagy Python verzióval készült.")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = build_cases(workdir, PARAMS)
+        names = [name for name in cases if not args.only or name in args.only]
+        results = {name: measure(cases[name], args.rounds) for name in names}
+
+    regressions = compare(results, baseline, args.threshold, args.stat)
+    report = {'machine': machine_info(), 'params': PARAMS, 'benchmarks': results}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        # Részleges futáskor a többi szakasz korábbi alapértéke megmarad
+        if baseline and args.only:
+            report['benchmarks'] = {**baseline['benchmarks'], **results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Alapérték mentve: {args.baseline}")
+    elif regressions:
+        print(f"Regresszió: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
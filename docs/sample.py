@@ -1,3 +1,4 @@
+import json
 import spacy
 import PyPDF2
 from pathlib import Path
@@ -12,6 +13,16 @@ class PdfContent:
     def __str__(self):
         return f"Oldal: {self.oldal_szam}, Tartalom: {self.tartalom[:100]}..."
 
+# A program beépített szabálykészlete, hogy a példa ugyanazokat a kulcsszavakat keresse
+SZABALYKESZLET_UT = Path(__file__).resolve().parent.parent / "src" / "resolutions" / "rules" / "onkormanyzat.json"
+
+def kulcsszavak_betoltese(szabalykeszlet_ut: Path) -> List[str]:
+    """Kulcsszavak egy szabálykészlet fájlból (szövegek vagy {"term": ...} objektumok listája)"""
+    with open(szabalykeszlet_ut, encoding="utf-8") as file:
+        szabalykeszlet = json.load(file)
+    return [kulcsszo if isinstance(kulcsszo, str) else kulcsszo["term"]
+            for kulcsszo in szabalykeszlet["keywords"]]
+
 def pdf_oldalak_kinyerese(pdf_ut: str) -> List[str]:
     """PDF fájl oldalainak szövegének kinyerése"""
     oldalak = []
@@ -99,18 +110,8 @@ def onkormanyzati_dokumentum_kereses(pdf_ut: str) -> List[PdfContent]:
         print("Nem sikerült oldalakat kinyerni a PDF-ből.")
         return []
     
-    # más kifejezések, amiket keresni szeretnénk
-    keresesi_kifejezesek = [
-        "ix. helyi önkormányzatok",
-        "települési önkormányzatok", 
-        "önkormányzatok adósságot keletkeztető",
-        "gazdasági társaságok adósságot keletkeztető",
-        # Kibővített keresés - szemantikailag hasonló kifejezések
-        "helyi önkormányzat",
-        "önkormányzati adósság",
-        "önkormányzati hitelfelvétel",
-        "adósságot keletkeztető ügyletek"
-    ]
+    # A keresett kifejezések a program beépített szabálykészletéből (src/resolutions/rules/onkormanyzat.json)
+    keresesi_kifejezesek = kulcsszavak_betoltese(SZABALYKESZLET_UT)
     
     pontos_talalatok = pontos_kereseses_talalatok(oldalak, keresesi_kifejezesek)
     
@@ -5,15 +5,17 @@ gdspacypdf - A Magyar Közlöny önkormányzatokra vonatkozó tartalom elemzése
 __version__ = "0.1.0"
 
 # Főbb függvények importálása könnyű hozzáféréshez
-from .pdf.pdf_processor import extract_text_from_pdf
-from .resolutions.extractor import extract_resolutions
+from .pdf.pdf_processor import extract_text_from_pdf, iter_pdf_pages
+from .resolutions.extractor import extract_resolutions, iter_resolutions
 from .resolutions.analyzer import analyze_resolutions
 from .notification.email_sender import send_email_summary
 
 # Exportált funkciók listája
 __all__ = [
     'extract_text_from_pdf',
+    'iter_pdf_pages',
     'extract_resolutions',
+    'iter_resolutions',
     'analyze_resolutions',
     'send_email_summary',
 ]
\ No newline at end of file
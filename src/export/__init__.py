@@ -0,0 +1,7 @@
+"""
+A feldolgozási eredmények exportálására szolgáló modul.
+"""
+
+from .dataset import ResultExporter, FORMATS
+
+__all__ = ['ResultExporter', 'FORMATS']
@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('jsonl', 'parquet')
+DEFAULT_ROW_GROUP_SIZE = 10_000
+# Az összes partíció pufferében együtt legfeljebb ennyi sor várakozhat
+DEFAULT_MAX_BUFFERED_ROWS = 50_000
+
+
+def _parquet_schema():
+    """
+    A Parquet fájlok sémája. Az év és a hónap a partíció könyvtárnevében
+    (year=2025/month=05) szerepel, a Parquet fájlokban nem (a JSON Lines sorokban igen).
+    """
+    import pyarrow as pa
+    return pa.schema([
+        ('source', pa.string()),
+        ('number', pa.string()),
+        ('day', pa.int8()),
+        ('date', pa.date32()),
+        ('title', pa.string()),
+        ('content', pa.string()),
+        ('relevance_score', pa.int32()),
+        ('keyword_matches', pa.list_(pa.struct([
+            ('keyword', pa.string()),
+            ('title_count', pa.int32()),
+            ('content_count', pa.int32()),
+        ]))),
+        ('summary', pa.string()),
+        ('semantic_score', pa.float64()),
+        ('semantic_matches', pa.list_(pa.struct([
+            ('keyword', pa.string()),
+            ('sentence', pa.string()),
+            ('similarity', pa.float64()),
+        ]))),
+    ])
+
+
+class _JsonlPart:
+    """Egy partíció JSON Lines fájlja"""
+
+    def __init__(self, path: Path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows: List[Dict]) -> None:
+        self.file.writelines(json.dumps({**row, 'date': row['date'].isoformat()}, ensure_ascii=False) + "\n"
+                             for row in rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _ParquetPart:
+    """Egy partíció Parquet fájlja; minden write() egy sorcsoport"""
+
+    def __init__(self, path: Path):
+        import pyarrow.parquet as pq
+        self.schema = _parquet_schema()
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression='zstd')
+
+    def write(self, rows: List[Dict]) -> None:
+        import pyarrow as pa
+        columns = {name: [row.get(name) for row in rows] for name in self.schema.names}
+        self.writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ResultExporter:
+    """
+    Kormányhatározatok és elemzési eredmények folyamatos kiírása év/hónap
+    szerint particionált (year=2025/month=05) JSON Lines vagy Parquet adathalmazba
+
+    A sorok partíciónként legfeljebb row_group_size soros pufferben gyűlnek, és
+    egy sorcsoportként (Parquet row group) íródnak ki. Mivel egy hónapban
+    jellemzően csak néhány száz kormányhatározat van, a pufferek együttes
+    mérete is korlátos (max_buffered_rows): ennek túllépésekor a legnagyobb
+    pufferek íródnak ki, így a memóriahasználat sok kis partíció esetén sem
+    függ a feldolgozott közlönyök számától. Minden exportálás új fájlokat
+    (part-<időbélyeg>-<azonosító>) hoz létre, a meglévő adathalmazt nem írja
+    újra. A fájlok írás közben rejtett (.part-...) néven készülnek, és csak a
+    close() után kapják meg a végleges nevüket, így az olvasók (pl.
+    pyarrow.dataset) nem látnak félkész fájlt.
+    """
+
+    def __init__(self, path: str, format: str = 'jsonl', row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 include_content: bool = True, max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS):
+        """
+        Inicializálja az exportálót
+
+        Args:
+            path: Az adathalmaz gyökérkönyvtára (ha nem létezik, létrejön)
+            format: 'jsonl' vagy 'parquet' (ez utóbbihoz a pyarrow csomag kell)
+            row_group_size: Partíciónként ennyi sor gyűlik össze egy kiírás előtt
+            include_content: A kormányhatározatok teljes szövegének kiírása
+            max_buffered_rows: Az összes partíció pufferében együtt legfeljebb
+                               ennyi sor várakozhat kiírás előtt
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Ismeretlen exportálási formátum: {format} (lehetséges: {', '.join(FORMATS)})")
+        if format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("A Parquet exportáláshoz a pyarrow csomag szükséges (pip install pyarrow)")
+        self.path = Path(path)
+        self.format = format
+        self.row_group_size = max(1, row_group_size)
+        self.include_content = include_content
+        self.max_buffered_rows = max(1, max_buffered_rows)
+
+        self._session = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._buffers = {}
+        self._buffered = 0
+        self._parts = {}
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_gazette(self, resolutions: Iterable, relevant_resolutions: Optional[List[Dict]] = None,
+                      source: Optional[str] = None) -> int:
+        """
+        Egy közlöny kormányhatározatainak hozzáadása
+
+        Args:
+            resolutions: A közlöny összes kormányhatározata (szótárak vagy ResolutionBatch)
+            relevant_resolutions: Az elemzés releváns kormányhatározatai (az analyze_resolutions
+                                  eredménye, vagy year/number mezős szótárak); a többi
+                                  kormányhatározat relevance_score értéke 0. Ha None, nem
+                                  volt elemzés, és az elemzési mezők üresek maradnak.
+            source: A forrás PDF fájl útvonala
+
+        Returns:
+            A hozzáadott sorok száma
+        """
+        results = None
+        if relevant_resolutions is not None:
+            results = {}
+            for item in relevant_resolutions:
+                resolution = item.get('resolution', item)
+                results[(str(resolution['year']), str(resolution['number']))] = item
+
+        count = 0
+        for resolution in resolutions:
+            row = {
+                'source': source,
+                'number': resolution['number'],
+                'year': int(resolution['year']),
+                'month': resolution['month'],
+                'day': resolution['day'],
+                'date': resolution['date'],
+                'title': resolution['title'],
+                'content': resolution['content'] if self.include_content else None,
+            }
+            if results is not None:
+                item = results.get((resolution['year'], resolution['number']), {})
+                row.update(relevance_score=item.get('relevance_score', 0),
+                           keyword_matches=item.get('keyword_matches', []),
+                           summary=item.get('summary'),
+                           semantic_score=item.get('semantic_score'),
+                           semantic_matches=item.get('semantic_matches'))
+            self._add_row(row)
+            count += 1
+        return count
+
+    def _add_row(self, row: Dict) -> None:
+        """
+        Egy sor a partíciója pufferébe; tele puffer esetén kiírás, a pufferek
+        együttes korlátjának túllépésekor a legnagyobbak kiírása
+        """
+        partition = (row['year'], row['month'])
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(row)
+        self._buffered += 1
+        if len(buffer) >= self.row_group_size:
+            self._write(partition)
+        elif self._buffered > self.max_buffered_rows:
+            for largest in sorted(self._buffers, key=lambda key: len(self._buffers[key]), reverse=True):
+                self._write(largest)
+                if self._buffered <= self.max_buffered_rows // 2:
+                    break
+
+    def _write(self, partition) -> None:
+        """Egy partíció pufferének kiírása egy sorcsoportként"""
+        rows = self._buffers.pop(partition, None)
+        if not rows:
+            return
+        self._buffered -= len(rows)
+        if partition not in self._parts:
+            year, month = partition
+            directory = self.path / f"year={year}" / f"month={month:02d}"
+            directory.mkdir(parents=True, exist_ok=True)
+            final = directory / f"part-{self._session}.{self.format}"
+            temporary = directory / f".{final.name}"
+            writer = (_ParquetPart if self.format == 'parquet' else _JsonlPart)(temporary)
+            self._parts[partition] = (writer, temporary, final)
+        self._parts[partition][0].write(rows)
+        self.rows_written += len(rows)
+
+    def flush(self) -> None:
+        """Az összes puffer kiírása (a fájlok nyitva maradnak)"""
+        for partition in list(self._buffers):
+            self._write(partition)
+
+    def close(self) -> None:
+        """A pufferek kiírása, a fájlok lezárása és végleges nevükre helyezése"""
+        self.flush()
+        for writer, temporary, final in self._parts.values():
+            writer.close()
+            os.replace(temporary, final)
+        if self._parts:
+            logger.info(f"{self.rows_written} sor exportálva {len(self._parts)} partícióba: {self.path}")
+        self._parts = {}
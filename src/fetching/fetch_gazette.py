@@ -1,11 +1,20 @@
 import os
+import time
+import json
+import hashlib
 import sqlite3
+import threading
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
+
+from ..pdf.cache import ExtractionCache
+from ..profiling import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +24,25 @@ class GazetteFetcher:
     FEED_URL = "https://magyarkozlony.hu/feed"
     DB_FILE = "gazettes.db"
     DOWNLOAD_DIR = "downloads"
+    CACHE_DIR = "cache"
+    
+    # Egyszerre futó letöltések száma
+    MAX_WORKERS = 4
+    # Kapcsolódási és olvasási időkorlát másodpercben
+    TIMEOUT = (10, 60)
+    # Újrapróbálkozások száma és a várakozás alapideje (másodperc, kétszereződik)
+    MAX_RETRIES = 3
+    BACKOFF = 1.0
+    CHUNK_SIZE = 64 * 1024
     
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(self, base_dir: Optional[str] = None, max_workers: int = MAX_WORKERS):
         """
         Inicializálja a Magyar Közlöny letöltőt
         
         Args:
             base_dir: Alap könyvtár, ahol az adatbázist és letöltéseket tárolja
                      Ha nincs megadva, az aktuális munkakönyvtárat használja
+            max_workers: Egyszerre futó letöltések maximális száma
         """
         if base_dir:
             self.base_dir = Path(base_dir)
@@ -32,76 +52,212 @@ class GazetteFetcher:
         # Adatbázis és letöltési könyvtár elérési útvonala
         self.db_path = self.base_dir / self.DB_FILE
         self.download_path = self.base_dir / self.DOWNLOAD_DIR
+        self.cache_path = self.base_dir / self.CACHE_DIR
         
         # Letöltési könyvtár létrehozása, ha nem létezik
         if not self.download_path.exists():
             self.download_path.mkdir(parents=True)
             
+        # A letöltött közlönyökből kinyert szöveg gyorsítótára; tartalom alapján
+        # címzett, így az újra letöltött közlönyöket sem kell újra feldolgozni
+        self.extraction_cache = ExtractionCache(self.cache_path)
+            
+        # Közös HTTP session, a párhuzamos letöltésekhez elegendő kapcsolattal
+        self.max_workers = max(1, max_workers)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+            
+        # Egyetlen, a fetcher élettartama alatt nyitva tartott adatbázis kapcsolat.
+        # A letöltő szálak is használhatják, ezért zárral védjük.
+        self._db_lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        
+        # A legutóbb letöltött, még nem mentett feed ETag / Last-Modified értékei
+        # és feldolgozási határa
+        self._pending_feed_state = None
+        
         # Adatbázis inicializálása
         self._init_database()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self) -> None:
+        """Az adatbázis kapcsolat és a HTTP session lezárása"""
+        self.conn.close()
+        self.session.close()
         
     def _init_database(self):
         """Adatbázis inicializálása, ha még nem létezik"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS gazettes (
-            id INTEGER PRIMARY KEY,
-            title TEXT NOT NULL,
-            publication_date TEXT NOT NULL,
-            url TEXT NOT NULL UNIQUE,
-            filename TEXT NOT NULL,
-            download_date TEXT NOT NULL
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._db_lock, self.conn:
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS gazettes (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                publication_date TEXT NOT NULL,
+                url TEXT NOT NULL UNIQUE,
+                filename TEXT NOT NULL,
+                download_date TEXT NOT NULL
+            )
+            ''')
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_gazettes_publication_date ON gazettes (publication_date)"
+            )
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS feed_state (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                checked_date TEXT NOT NULL
+            )
+            ''')
+            # Régebbi adatbázisok kiegészítése a feldolgozási határ oszlopával
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(feed_state)")}
+            if 'cutoff_date' not in columns:
+                self.conn.execute("ALTER TABLE feed_state ADD COLUMN cutoff_date TEXT")
         
-    def fetch_feed(self) -> List[Dict]:
+    def fetch_feed(self, conditional: bool = True) -> List[Dict]:
         """
         RSS feed letöltése és feldolgozása
         
+        Feltételes kéréssel (ETag / Last-Modified) tölti le a feedet: ha az
+        a legutóbbi lekérdezés óta nem változott (304), azonnal üres listával tér
+        vissza. A feedet folyamatosan dolgozza fel, és az első olyan bejegyzésnél
+        megáll, amely régebbi a feldolgozási határnál: a legutóbbi teljesen
+        sikeres lekérdezés legújabb bejegyzésének dátumánál. Az új ETag /
+        Last-Modified értékeket és határt a save_feed_state menti el (a
+        fetch_new_gazettes csak akkor hívja, ha az összes letöltés sikerült), így
+        a sikertelen letöltéseket a következő lekérdezés újrapróbálja, akkor is,
+        ha közben újabb közlönyök jelentek meg.
+        
+        Args:
+            conditional: Ha False, feltétel nélkül letölti és a teljes feedet feldolgozza
+        
         Returns:
             A Magyar Közlöny bejegyzések listája
         """
+        self._pending_feed_state = None
         try:
-            response = requests.get(self.FEED_URL)
-            response.raise_for_status()
-            
-            # XML feldolgozása
-            root = ET.fromstring(response.content)
-            
-            # RSS névtér kezelése
-            namespaces = {'atom': 'http://www.w3.org/2005/Atom'}
+            headers = {}
+            cutoff = None
+            if conditional:
+                etag, last_modified, cutoff = self._load_feed_state()
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
             
-            # Bejegyzések kinyerése
-            entries = []
-            for entry in root.findall('.//atom:entry', namespaces):
-                title_elem = entry.find('atom:title', namespaces)
-                title = title_elem.text if title_elem is not None else ""
+            with metrics.stage('feed_fetch') as counts, \
+                    self.session.get(self.FEED_URL, timeout=self.TIMEOUT, headers=headers, stream=True) as response:
+                if response.status_code == 304:
+                    logger.info("A feed nem változott a legutóbbi lekérdezés óta")
+                    return []
+                response.raise_for_status()
                 
-                # Csak a Magyar Közlöny bejegyzéseket szűrjük
-                if "Magyar Közlöny" in title:
-                    link_elem = entry.find('atom:link[@rel="alternate"]', namespaces)
-                    url = link_elem.get('href') if link_elem is not None else ""
-                    
-                    published_elem = entry.find('atom:published', namespaces)
-                    published = published_elem.text if published_elem is not None else ""
-                    
-                    entries.append({
-                        'title': title,
-                        'url': url,
-                        'published': published
-                    })
-            
-            return entries
+                # XML folyamatos feldolgozása
+                response.raw.decode_content = True
+                entries = self._parse_feed(response.raw, cutoff)
+                counts['entries'] = len(entries)
+                counts['bytes'] = response.raw.tell()
+                
+                # A következő határ a most látott legújabb bejegyzés (vagy a régi határ)
+                dates = [date for date in (_parse_date(entry['published']) for entry in entries) if date]
+                if cutoff is not None:
+                    dates.append(cutoff)
+                new_cutoff = max(dates).isoformat() if dates else None
+                self._pending_feed_state = (response.headers.get('ETag'),
+                                            response.headers.get('Last-Modified'), new_cutoff)
+                return entries
             
         except Exception as e:
             logger.error(f"Hiba történt az RSS feed lekérése közben: {e}")
             return []
     
+    def _parse_feed(self, source, cutoff: Optional[datetime] = None) -> List[Dict]:
+        """
+        Atom feed bejegyzéseinek folyamatos feldolgozása iterparse segítségével
+        
+        Args:
+            source: A feed tartalmát adó fájlszerű objektum
+            cutoff: A legutóbbi teljesen sikeres lekérdezés feldolgozási határa;
+                    az ennél régebbi első bejegyzésnél a feldolgozás leáll
+            
+        Returns:
+            A Magyar Közlöny bejegyzések listája
+        """
+        # RSS névtér kezelése
+        namespaces = {'atom': 'http://www.w3.org/2005/Atom'}
+        entry_tag = '{http://www.w3.org/2005/Atom}entry'
+        
+        # Bejegyzések kinyerése
+        entries = []
+        for _, entry in ET.iterparse(source, events=('end',)):
+            if entry.tag != entry_tag:
+                continue
+            
+            title_elem = entry.find('atom:title', namespaces)
+            title = title_elem.text if title_elem is not None else ""
+            
+            published_elem = entry.find('atom:published', namespaces)
+            published = published_elem.text if published_elem is not None else ""
+            
+            # A feed a legújabb bejegyzésekkel kezdődik, a határnál régebbieket egy
+            # korábbi, teljesen sikeres lekérdezés már mind letöltötte
+            published_date = _parse_date(published)
+            if cutoff is not None and published_date is not None and published_date < cutoff:
+                break
+            
+            # Csak a Magyar Közlöny bejegyzéseket szűrjük
+            if "Magyar Közlöny" in title:
+                link_elem = entry.find('atom:link[@rel="alternate"]', namespaces)
+                url = link_elem.get('href') if link_elem is not None else ""
+                
+                entries.append({
+                    'title': title,
+                    'url': url,
+                    'published': published
+                })
+            
+            # A feldolgozott bejegyzés felszabadítása
+            entry.clear()
+        
+        return entries
+    
+    def _load_feed_state(self) -> Tuple[Optional[str], Optional[str], Optional[datetime]]:
+        """A feed legutóbbi ETag és Last-Modified értéke, valamint feldolgozási határa"""
+        with self._db_lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, cutoff_date FROM feed_state WHERE url = ?", (self.FEED_URL,)
+            ).fetchone()
+        if not row:
+            return None, None, None
+        etag, last_modified, cutoff = row
+        return etag, last_modified, _parse_date(cutoff)
+    
+    def save_feed_state(self) -> None:
+        """
+        A legutóbb sikeresen feldolgozott feed ETag és Last-Modified értékének és
+        feldolgozási határának mentése; csak akkor hívandó, ha a feed összes új
+        bejegyzése letöltődött
+        """
+        if not self._pending_feed_state:
+            return
+        etag, last_modified, cutoff = self._pending_feed_state
+        with self._db_lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO feed_state (url, etag, last_modified, checked_date, cutoff_date) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.FEED_URL, etag, last_modified, datetime.now().isoformat(), cutoff)
+            )
+        self._pending_feed_state = None
+    
     def is_already_downloaded(self, url: str) -> bool:
         """
         Ellenőrzi, hogy egy adott URL-t már letöltöttünk-e
@@ -112,15 +268,26 @@ class GazetteFetcher:
         Returns:
             True, ha már letöltöttük, egyébként False
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT id FROM gazettes WHERE url = ?", (url,))
-        result = cursor.fetchone()
-        
-        conn.close()
+        return url in self.get_downloaded_urls([url])
+    
+    def get_downloaded_urls(self, urls: List[str]) -> Set[str]:
+        """
+        A megadott URL-ek közül a már letöltöttek, egyetlen lekérdezéssel
         
-        return result is not None
+        Args:
+            urls: Az ellenőrizendő URL-ek
+            
+        Returns:
+            A már letöltött URL-ek halmaza
+        """
+        if not urls:
+            return set()
+        with self._db_lock:
+            rows = self.conn.execute(
+                "SELECT url FROM gazettes WHERE url IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(urls)),)
+            ).fetchall()
+        return {row[0] for row in rows}
     
     def download_gazette(self, entry: Dict) -> Tuple[bool, Optional[str]]:
         """
@@ -136,6 +303,24 @@ class GazetteFetcher:
             logger.info(f"A közlöny már le volt töltve: {entry['title']}")
             return False, None
         
+        filename = self._download_entry(entry)
+        if filename is None:
+            return False, None
+        
+        # Mentés az adatbázisba
+        self._save_to_database(entry, filename)
+        return True, filename
+    
+    def _download_entry(self, entry: Dict) -> Optional[str]:
+        """
+        Egy közlöny PDF fájljának letöltése, adatbázis mentés nélkül
+        
+        Args:
+            entry: A letöltendő közlöny adatai
+            
+        Returns:
+            A letöltött fájl neve, vagy None hiba esetén
+        """
         try:
             # PDF URL kinyerése (ha az entry['url'] nem közvetlenül PDF-re mutat)
             if entry['url'].endswith('.pdf'):
@@ -150,22 +335,59 @@ class GazetteFetcher:
             filepath = self.download_path / filename
             
             # PDF letöltése
-            response = requests.get(pdf_url, stream=True)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            # Mentés az adatbázisba
-            self._save_to_database(entry, filename)
+            self._download_file(pdf_url, filepath)
             
             logger.info(f"Sikeresen letöltve: {entry['title']} -> {filename}")
-            return True, filename
+            return filename
             
         except Exception as e:
             logger.error(f"Hiba történt a letöltés közben: {e}")
-            return False, None
+            return None
+    
+    def _download_file(self, url: str, filepath: Path) -> None:
+        """
+        Fájl letöltése újrapróbálkozással és folytatással
+        
+        A letöltés egy URL-ből képzett .part fájlba történik, így megszakadt
+        kapcsolat (akár egy korábbi futásban) esetén HTTP Range kéréssel
+        a már letöltött résztől folytatódik. Sikeres letöltés után a .part
+        fájl a végleges nevére kerül.
+        
+        Args:
+            url: A letöltendő fájl URL-je
+            filepath: A letöltött fájl végleges helye
+        """
+        url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        part_path = self.download_path / f"{url_hash}.part"
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            headers = {'Range': f"bytes={offset}-"} if offset else {}
+            try:
+                with metrics.stage('download') as counts, \
+                        self.session.get(url, stream=True, timeout=self.TIMEOUT, headers=headers) as response:
+                    # A .part fájl már a teljes tartalmat tartalmazza
+                    if offset and response.status_code == 416:
+                        break
+                    response.raise_for_status()
+                    
+                    # Ha a szerver nem támogatja a Range kérést, elölről kezdjük
+                    mode = 'ab' if offset and response.status_code == 206 else 'wb'
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                            f.write(chunk)
+                            counts['bytes'] = counts.get('bytes', 0) + len(chunk)
+                break
+            except requests.RequestException as e:
+                # Kliens oldali hibánál (pl. 404) nincs értelme újrapróbálni
+                status = e.response.status_code if e.response is not None else None
+                if attempt == self.MAX_RETRIES or (status is not None and status < 500 and status != 429):
+                    raise
+                delay = self.BACKOFF * (2 ** attempt)
+                logger.warning(f"Letöltési hiba ({e}), újrapróbálkozás {delay:.1f} mp múlva: {url}")
+                time.sleep(delay)
+        
+        os.replace(part_path, filepath)
     
     def _generate_filename(self, title: str) -> str:
         """Fájlnév generálása a címből"""
@@ -186,18 +408,26 @@ class GazetteFetcher:
             entry: A közlöny adatai
             filename: A letöltött fájl neve
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._save_many_to_database([(entry, filename)])
+    
+    def _save_many_to_database(self, items: List[Tuple[Dict, str]]) -> None:
+        """
+        Több letöltött közlöny mentése az adatbázisba egyetlen tranzakcióban
         
-        now = datetime.now().isoformat()
+        Args:
+            items: (közlöny adatai, letöltött fájl neve) párok
+        """
+        if not items:
+            return
         
-        cursor.execute(
-            "INSERT INTO gazettes (title, publication_date, url, filename, download_date) VALUES (?, ?, ?, ?, ?)",
-            (entry['title'], entry['published'], entry['url'], filename, now)
-        )
+        now = datetime.now().isoformat()
         
-        conn.commit()
-        conn.close()
+        with self._db_lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO gazettes (title, publication_date, url, filename, download_date) VALUES (?, ?, ?, ?, ?)",
+                [(entry['title'], entry['published'], entry['url'], filename, now)
+                 for entry, filename in items]
+            )
     
     def fetch_new_gazettes(self) -> List[str]:
         """
@@ -212,18 +442,54 @@ class GazetteFetcher:
         entries = self.fetch_feed()
         
         if not entries:
-            logger.warning("Nem találhatók Magyar Közlöny bejegyzések a feed-ben")
+            logger.info("Nem találhatók új Magyar Közlöny bejegyzések a feed-ben")
+            self.save_feed_state()
             return downloaded_files
         
-        # Közlönyök letöltése, amelyek még nem voltak letöltve
+        # Ugyanaz az URL csak egyszer szerepeljen, különben két szál írná ugyanazt a fájlt
+        entries = list({entry['url']: entry for entry in entries}.values())
+        
+        # A már letöltött közlönyök kiszűrése egyetlen lekérdezéssel
+        downloaded_urls = self.get_downloaded_urls([entry['url'] for entry in entries])
+        new_entries = [entry for entry in entries if entry['url'] not in downloaded_urls]
         for entry in entries:
-            success, filename = self.download_gazette(entry)
-            if success and filename:
-                downloaded_files.append(str(self.download_path / filename))
+            if entry['url'] in downloaded_urls:
+                logger.info(f"A közlöny már le volt töltve: {entry['title']}")
+        
+        # Közlönyök letöltése, amelyek még nem voltak letöltve, egyszerre
+        # legfeljebb max_workers párhuzamos letöltéssel
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            filenames = list(executor.map(self._download_entry, new_entries))
+        
+        # Az új közlönyök mentése egyetlen tranzakcióban
+        saved = [(entry, filename) for entry, filename in zip(new_entries, filenames) if filename]
+        self._save_many_to_database(saved)
+        
+        # A feed állapota csak akkor kerül mentésre, ha minden letöltés sikerült,
+        # különben a következő lekérdezés 304-et kapna, és a hibás letöltés elveszne
+        if len(saved) == len(new_entries):
+            self.save_feed_state()
+        
+        for _, filename in saved:
+            downloaded_files.append(str(self.download_path / filename))
                 
         return downloaded_files
 
 
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """ISO 8601 dátum feldolgozása (pl. 2025-05-14T10:00:00Z), hibás érték esetén None"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # Időzóna nélküli dátumok UTC-ként értelmezve, hogy összehasonlíthatók legyenek
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def main():
     """Fő futtatható funkció"""
     logging.basicConfig(
@@ -232,10 +498,9 @@ def main():
     )
     
     # Alapértelmezett könyvtár használata
-    fetcher = GazetteFetcher()
-    
-    # Új közlönyök letöltése
-    downloaded = fetcher.fetch_new_gazettes()
+    with GazetteFetcher() as fetcher:
+        # Új közlönyök letöltése
+        downloaded = fetcher.fetch_new_gazettes()
     
     if downloaded:
         print(f"{len(downloaded)} új Magyar Közlöny került letöltésre:")
@@ -1,54 +1,480 @@
 import argparse
+import asyncio
+import contextlib
+import datetime
+import logging
 import os
-from .pdf.pdf_processor import extract_text_from_pdf
+import sqlite3
+import sys
+import time
+from .pdf.pdf_processor import iter_pdf_pages, DEFAULT_CHUNK_SIZE
+from .pdf.engines import ENGINES, DEFAULT_ENGINE
 from .resolutions.extractor import extract_resolutions
-from .resolutions.analyzer import analyze_resolutions
+from .resolutions.analyzer import (analyze_resolutions, DEFAULT_BATCH_SIZE,
+                                   DEFAULT_SEMANTIC_THRESHOLD, DEFAULT_TOP_K)
+from .resolutions.store import ResolutionStore
+from .resolutions.memo import AnalysisMemo
+from .resolutions.lemma_index import LemmaIndex
+from .resolutions.rules import load_rule_engine
+from .pipeline.batch import run_batch, collect_pdf_paths
+from .pipeline.incremental import IncrementalPipeline
+from .pipeline.daemon import GazetteDaemon
 from .notification.email_sender import send_email_summary
+from .profiling import profile_session
+from .export import ResultExporter, FORMATS
 
-def main():
-    parser = argparse.ArgumentParser(description='PDF kormányhatározat feldolgozó')
-    parser.add_argument('pdf_path', help='A feldolgozandó PDF fájl útvonala')
+def _analysis_options():
+    """
+    Az elemzés közös kapcsolói (a fő parancs, a batch, a run és a daemon szülő parsere).
+    """
+    parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--analyze', action='store_true', help='Önkormányzati tartalom elemzése')
+    parser.add_argument('--rules', metavar='PATH', action='append', default=None,
+                        help='Szabálykészlet fájl (JSON) a beépített kulcsszavak helyett; többször is '
+                             'megadható, ekkor minden szabálykészlet szerint egy menetben pontoz')
+    parser.add_argument('--lemma-index', action='store_true',
+                        help='A lemma módú kulcsszavak keresése a kormányhatározatok tárolt lemma '
+                             'indexében (lemmas.db); a nyelvi modell csak az új kormányhatározatokhoz kell')
+    parser.add_argument('--model', default=None,
+                        help='A használt huspacy modell neve (alapértelmezett: hu_core_news_lg)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Az összefoglaláskor egy kötegben feldolgozott kormányhatározatok száma')
+    parser.add_argument('--sentencizer', action='store_true',
+                        help='Gyors, szabályalapú mondatra bontás a nyelvi modell helyett')
+    return parser
+
+def _extraction_options():
+    """
+    A PDF szövegkinyerés közös kapcsolói.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE,
+                        help='A PDF szövegkinyerő motor (alapértelmezett: %(default)s)')
+    parser.add_argument('--prefilter', action='store_true',
+                        help='Csak a kormányhatározatokat tartalmazó oldalak teljes feldolgozása')
+    return parser
+
+def _export_options():
+    """
+    A particionált adathalmazba exportálás kapcsolói.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--export', metavar='DIR', default=None,
+                        help='A kormányhatározatok és az elemzési eredmények hozzáfűzése egy '
+                             'év/hónap szerint particionált adathalmazhoz')
+    parser.add_argument('--export-format', choices=FORMATS, default='jsonl',
+                        help='Az exportált adathalmaz formátuma (a parquet a pyarrow csomagot igényli)')
+    return parser
+
+def _profiling_options():
+    """
+    A mérések és a profilozás kapcsolói.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--metrics', metavar='PATH', default=None,
+                        help='Szakaszonkénti mérések (idő, CPU, memória, darabszámok) JSON fájlba')
+    parser.add_argument('--prometheus', metavar='PATH', default=None,
+                        help='A mérések Prometheus szöveges formátumban')
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help='cProfile eredmény (pstats) fájlba, a legdrágább függvények kiírásával')
+    return parser
+
+def _use_lemma_index(args, rules):
+    """
+    A --lemma-index csak lemma módú kulcsszavakkal ("match": "lemma") hasznos; ha a
+    szabálykészletekben (vagy a beépített kulcsszavak között) nincs ilyen,
+    figyelmeztet, és a lemma index kimarad.
+    """
+    if not args.lemma_index:
+        return False
+    if rules is not None and rules.uses_lemmas:
+        return True
+    print("Figyelmeztetés: a --lemma-index hatástalan, mert a szabálykészletekben nincs lemma módú "
+          "kulcsszó (\"match\": \"lemma\"); a lemma index nem kerül használatra.")
+    return False
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Alparancsok: gdspacypdf query ..., gdspacypdf ingest ...
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    
+    parser = argparse.ArgumentParser(
+        description='PDF kormányhatározat feldolgozó',
+        parents=[_analysis_options(), _extraction_options(), _export_options(), _profiling_options()],
+        epilog='További parancsok: "gdspacypdf query --help" (keresés a tárolt kormányhatározatokban), '
+               '"gdspacypdf ingest --help" (PDF-ek tömeges betöltése a tárba), '
+               '"gdspacypdf batch --help" (sok közlöny párhuzamos feldolgozása), '
+               '"gdspacypdf run --help" (új közlönyök letöltése és feldolgozása, cronból is), '
+               '"gdspacypdf daemon --help" (a feed folyamatos figyelése és feldolgozása), '
+               '"gdspacypdf memo --help" (a tárolt elemzési eredmények törlése)'
+    )
+    parser.add_argument('pdf_path', help='A feldolgozandó PDF fájl útvonala')
     parser.add_argument('--email', action='store_true', help='Email küldése az eredményekről')
-    args = parser.parse_args()
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Párhuzamos PDF feldolgozó folyamatok száma (1 = soros feldolgozás)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Egy folyamat által egyszerre feldolgozott oldalak száma')
+    parser.add_argument('--n-process', type=int, default=1,
+                        help='Az összefoglalást végző spaCy folyamatok száma')
+    parser.add_argument('--semantic', action='store_true',
+                        help='Szemantikus pontozás a kulcsszavak és a mondatok szóvektoraival')
+    parser.add_argument('--semantic-threshold', type=float, default=DEFAULT_SEMANTIC_THRESHOLD,
+                        help='A mondat és a kulcsszó minimális koszinusz hasonlósága')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                        help='Kormányhatározatonként a legjobb szemantikus találatok száma')
+    parser.add_argument('--no-memo', action='store_true',
+                        help='A korábbi elemzési eredmények (analysis.db) használatának kikapcsolása')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='A kinyert szöveg gyorsítótárának kikapcsolása')
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help='A PDF újrafeldolgozása és a gyorsítótár bejegyzés felülírása')
+    parser.add_argument('--store', action='store_true',
+                        help='A kormányhatározatok mentése a kereshető tárba (resolutions.db)')
+    parser.add_argument('--base-dir', default=None,
+                        help='A resolutions.db és az analysis.db könyvtára (alapértelmezett: aktuális könyvtár)')
+    args = parser.parse_args(argv)
     
+    with profile_session(args.metrics, args.prometheus, args.profile):
+        _process_pdf(args)
+
+def _process_pdf(args):
+    """
+    Egy PDF feldolgozása a parancssori argumentumok szerint.
+    """
     # Ellenőrizzük, hogy létezik-e a fájl
     if not os.path.exists(args.pdf_path):
         print(f"Hiba: A megadott fájl nem létezik: {args.pdf_path}")
         return
     
-    # PDF szöveg kinyerése
+    # PDF szöveg kinyerése oldalanként, a kormányhatározatok keresése közben
     print(f"PDF feldolgozása: {args.pdf_path}")
-    pdf_text = extract_text_from_pdf(args.pdf_path)
+    pages = iter_pdf_pages(args.pdf_path, workers=args.workers, chunk_size=args.chunk_size,
+                           use_cache=not args.no_cache, rebuild_cache=args.rebuild_cache,
+                           engine=args.engine, prefilter=args.prefilter)
     
     # Kormányhatározatok kinyerése
     print("Kormányhatározatok keresése...")
-    resolutions = extract_resolutions(pdf_text)
+    try:
+        resolutions = extract_resolutions(pages)
+    except Exception as e:
+        print(f"Hiba a PDF feldolgozása közben: {e}")
+        return
     print(f"{len(resolutions)} kormányhatározat található.")
     
     # Kormányhatározatok listázása
     for i, resolution in enumerate(resolutions, 1):
         print(f"{i}. {resolution['title']}")
     
+    # Mentés a kereshető tárba, ha kérték
+    if args.store:
+        with ResolutionStore(args.base_dir) as store:
+            store.add_resolutions(resolutions, source=os.path.abspath(args.pdf_path))
+        print(f"{len(resolutions)} kormányhatározat mentve a tárba.")
+    
     # Elemzés, ha kérték
     if args.analyze:
         print("Önkormányzati tartalom elemzése...")
-        results = analyze_resolutions(resolutions)
+        try:
+            rules = load_rule_engine(args.rules, args.model) if args.rules else None
+        except (OSError, ValueError) as e:
+            print(f"Hiba a szabálykészlet betöltése közben: {e}")
+            return
+        # A korábban már elemzett kormányhatározatok eredménye a tárból jön
+        memo = None if args.no_memo else AnalysisMemo(args.base_dir)
+        lemma_index = LemmaIndex(args.base_dir) if _use_lemma_index(args, rules) else None
+        with memo or contextlib.nullcontext(), lemma_index or contextlib.nullcontext():
+            results = analyze_resolutions(resolutions, model_name=args.model, rules=rules,
+                                          lemma_index=lemma_index,
+                                          batch_size=args.batch_size, n_process=args.n_process,
+                                          sentencizer=args.sentencizer, semantic=args.semantic,
+                                          semantic_threshold=args.semantic_threshold, top_k=args.top_k,
+                                          memo=memo)
         print(f"{len(results['relevant_resolutions'])} releváns kormányhatározat található.")
         for res in results['relevant_resolutions']:
             print(f"Releváns kormányhatározat: {res['resolution']['title']}")            
             print(f"Relevancia pontszám: {res['relevance_score']}")
+            if args.rules:
+                print("Szabálykészletek: " + ", ".join(f"{name} ({score})"
+                                                      for name, score in res['rule_scores'].items()))
             print("Kulcsszó találatok:")
             for match in res['keyword_matches']:
                 print(f"- Kulcsszó: {match['keyword']}, Cím találatok: {match['title_count']}, Tartalom találatok: {match['content_count']}")
+            if args.semantic:
+                print(f"Szemantikus pontszám: {res['semantic_score']:.3f}")
+                for match in res['semantic_matches']:
+                    print(f"- {match['keyword']} ({match['similarity']:.3f}): {match['sentence']}")
             print(f"Összefoglaló: {res['summary']}")
         
         # Email küldése, ha kérték
         if args.email and results['relevant_resolutions']:
             print("Email küldése az eredményekről...")
-            send_email_summary(results)
+            try:
+                send_email_summary(results)
+            except ValueError as e:
+                print(f"Hiba: {e}")
+    
+    # Exportálás az adathalmazba, ha kérték
+    if args.export:
+        with ResultExporter(args.export, format=args.export_format) as exporter:
+            count = exporter.write_gazette(resolutions,
+                                           results['relevant_resolutions'] if args.analyze else None,
+                                           source=os.path.abspath(args.pdf_path))
+        print(f"{count} kormányhatározat exportálva: {args.export}")
     
     print("Feldolgozás befejezve.")
 
+def _parse_date_arg(value):
+    """
+    Dátum parancssori argumentum: ÉÉÉÉ-HH-NN, ÉÉÉÉ-HH vagy ÉÉÉÉ.
+    """
+    parts = value.split('-')
+    try:
+        return datetime.date(int(parts[0]), int(parts[1]) if len(parts) > 1 else 1,
+                             int(parts[2]) if len(parts) > 2 else 1)
+    except (ValueError, IndexError):
+        raise argparse.ArgumentTypeError(f"Érvénytelen dátum: {value}")
+
+def query_main(argv):
+    """
+    Keresés a tárolt kormányhatározatokban, a PDF-ek újrafeldolgozása nélkül.
+    """
+    parser = argparse.ArgumentParser(prog='gdspacypdf query',
+                                     description='Keresés a tárolt kormányhatározatokban')
+    parser.add_argument('query', nargs='?', default=None,
+                        help='FTS5 keresőkifejezés, pl. \'"iparűzési adó"\' vagy \'önkormányzat*\'')
+    parser.add_argument('--since', type=_parse_date_arg, help='Legkorábbi dátum (pl. 2023 vagy 2023-05-01)')
+    parser.add_argument('--until', type=_parse_date_arg, help='Legkésőbbi dátum')
+    parser.add_argument('--year', help='A kormányhatározat éve')
+    parser.add_argument('--limit', type=int, default=50, help='A találatok maximális száma')
+    parser.add_argument('--content', action='store_true', help='A teljes tartalom kiírása')
+    parser.add_argument('--base-dir', default=None,
+                        help='A resolutions.db könyvtára (alapértelmezett: aktuális könyvtár)')
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    with ResolutionStore(args.base_dir) as store:
+        try:
+            results = store.search(args.query, since=args.since, until=args.until,
+                                   year=args.year, limit=args.limit)
+        except sqlite3.OperationalError as e:
+            print(f"Hibás keresőkifejezés: {e}")
+            return
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    for resolution in results:
+        print(f"{resolution['date']}  {resolution['title']}")
+        if args.content:
+            print(f"    {resolution['content']}")
+        elif resolution['snippet']:
+            print(f"    {resolution['snippet']}")
+    print(f"{len(results)} találat ({elapsed:.1f} ms)")
+
+def ingest_main(argv):
+    """
+    PDF fájlok tömeges feldolgozása és a kormányhatározatok mentése a kereshető tárba.
+    """
+    parser = argparse.ArgumentParser(prog='gdspacypdf ingest',
+                                     description='PDF-ek kormányhatározatainak betöltése a tárba',
+                                     parents=[_extraction_options()])
+    parser.add_argument('paths', nargs='+', help='PDF fájlok, PDF-eket tartalmazó könyvtárak vagy glob minták')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Párhuzamos PDF feldolgozó folyamatok száma fájlonként')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Egy folyamat által egyszerre feldolgozott oldalak száma')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='A kinyert szöveg gyorsítótárának kikapcsolása')
+    parser.add_argument('--base-dir', default=None,
+                        help='A resolutions.db könyvtára (alapértelmezett: aktuális könyvtár)')
+    args = parser.parse_args(argv)
+    
+    pdf_paths = collect_pdf_paths(args.paths)
+    
+    total = 0
+    with ResolutionStore(args.base_dir) as store:
+        for pdf_path in pdf_paths:
+            if not os.path.exists(pdf_path):
+                print(f"Hiba: A megadott fájl nem létezik: {pdf_path}")
+                continue
+            try:
+                pages = iter_pdf_pages(pdf_path, workers=args.workers, chunk_size=args.chunk_size,
+                                       use_cache=not args.no_cache, engine=args.engine,
+                                       prefilter=args.prefilter)
+                resolutions = extract_resolutions(pages)
+            except Exception as e:
+                print(f"Hiba a PDF feldolgozása közben ({pdf_path}): {e}")
+                continue
+            total += store.add_resolutions(resolutions, source=os.path.abspath(pdf_path))
+            print(f"{pdf_path}: {len(resolutions)} kormányhatározat")
+        print(f"{total} kormányhatározat mentve, a tárban összesen {store.count()} található.")
+
+def memo_main(argv):
+    """
+    A tárolt elemzési eredmények (analysis.db) számának kiírása, illetve törlése.
+    """
+    parser = argparse.ArgumentParser(prog='gdspacypdf memo',
+                                     description='A tárolt elemzési eredmények kezelése')
+    parser.add_argument('--clear', action='store_true',
+                        help='Az összes tárolt elemzési eredmény törlése (a következő elemzés mindent újraszámol)')
+    parser.add_argument('--base-dir', default=None,
+                        help='Az analysis.db könyvtára (alapértelmezett: aktuális könyvtár)')
+    args = parser.parse_args(argv)
+    
+    with AnalysisMemo(args.base_dir) as memo:
+        if args.clear:
+            print(f"{memo.invalidate()} tárolt elemzési eredmény törölve.")
+        else:
+            print(f"{memo.count()} tárolt elemzési eredmény.")
+
+def batch_main(argv):
+    """
+    Sok közlöny párhuzamos feldolgozása, az eredmények strukturált (JSON Lines) fájlba írásával.
+    """
+    parser = argparse.ArgumentParser(prog='gdspacypdf batch',
+                                     description='Közlönyök párhuzamos feldolgozása',
+                                     parents=[_analysis_options(), _extraction_options(), _export_options()])
+    parser.add_argument('paths', nargs='+',
+                        help='PDF fájlok, könyvtárak (pl. downloads/) vagy glob minták')
+    parser.add_argument('--output', default='results.jsonl',
+                        help='Az eredményfájl (JSON Lines, fájlonként egy sor)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Párhuzamos worker folyamatok száma (alapértelmezett: CPU magok száma)')
+    parser.add_argument('--no-memo', action='store_true',
+                        help='A korábbi elemzési eredmények (analysis.db) használatának kikapcsolása')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='A kinyert szöveg gyorsítótárának kikapcsolása')
+    args = parser.parse_args(argv)
+    
+    pdf_paths = [path for path in collect_pdf_paths(args.paths) if os.path.exists(path)]
+    if not pdf_paths:
+        print("Hiba: Nem található feldolgozandó PDF fájl.")
+        return
+    
+    # A hibás szabálykészlet a workerek indítása előtt kiderül (a lefordított alak gyorsítótárazódik)
+    rules = None
+    if args.analyze and args.rules:
+        try:
+            rules = load_rule_engine(args.rules, args.model)
+        except (OSError, ValueError) as e:
+            print(f"Hiba a szabálykészlet betöltése közben: {e}")
+            return
+    use_lemma_index = args.analyze and _use_lemma_index(args, rules)
+    
+    print(f"{len(pdf_paths)} PDF fájl feldolgozása...")
+    run_batch(pdf_paths, args.output, workers=args.workers, analyze=args.analyze,
+              model_name=args.model, sentencizer=args.sentencizer,
+              batch_size=args.batch_size, use_cache=not args.no_cache, engine=args.engine,
+              prefilter=args.prefilter, use_memo=not args.no_memo, export_path=args.export,
+              export_format=args.export_format, rule_paths=args.rules,
+              use_lemma_index=use_lemma_index)
+
+def run_main(argv):
+    """
+    Az új vagy megváltozott közlönyök letöltése és feldolgozása.
+    A már feldolgozott közlönyöket kihagyja, így cronból gyakran futtatható.
+    """
+    parser = argparse.ArgumentParser(prog='gdspacypdf run',
+                                     description='Új közlönyök letöltése és feldolgozása',
+                                     parents=[_analysis_options(), _extraction_options(), _profiling_options()])
+    parser.add_argument('--no-fetch', action='store_true',
+                        help='A feed lekérdezése nélkül csak a letöltött közlönyök feldolgozása')
+    parser.add_argument('--email', action='store_true',
+                        help='Email küldése a releváns kormányhatározatokról (elemzéssel együtt)')
+    parser.add_argument('--base-dir', default=None,
+                        help='A gazettes.db, a downloads/ és a resolutions.db könyvtára '
+                             '(alapértelmezett: aktuális könyvtár)')
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    # A hibás szabálykészlet a feldolgozás indítása előtt kiderül (a lefordított alak gyorsítótárazódik)
+    if args.rules:
+        try:
+            load_rule_engine(args.rules, args.model)
+        except (OSError, ValueError) as e:
+            print(f"Hiba a szabálykészlet betöltése közben: {e}")
+            return
+    
+    with profile_session(args.metrics, args.prometheus, args.profile), \
+            IncrementalPipeline(args.base_dir, analyze=args.analyze, email=args.email,
+                                engine=args.engine, prefilter=args.prefilter, model_name=args.model,
+                                sentencizer=args.sentencizer, batch_size=args.batch_size,
+                                rule_paths=args.rules, lemma_index=args.lemma_index) as pipeline:
+        summary = pipeline.run(fetch=not args.no_fetch)
+    
+    if summary is None:
+        print("Egy másik feldolgozás még fut.")
+        return
+    print(f"{summary['fetched']} új közlöny letöltve, {summary['processed']} feldolgozva, "
+          f"{summary['failed']} hibás.")
+    if summary['stuck']:
+        print(f"{summary['stuck']} közlöny {IncrementalPipeline.MAX_ATTEMPTS} sikertelen próbálkozás "
+              f"után kihagyva (lásd a naplót).")
+
+def daemon_main(argv):
+    """
+    A feed folyamatos figyelése: ütemezett lekérdezés, az új közlönyök
+    párhuzamos letöltése és azonnali feldolgozása, SIGINT / SIGTERM-ig.
+    """
+    parser = argparse.ArgumentParser(prog='gdspacypdf daemon',
+                                     description='A feed folyamatos figyelése és feldolgozása',
+                                     parents=[_analysis_options(), _extraction_options()])
+    parser.add_argument('--interval', type=float, default=GazetteDaemon.INTERVAL,
+                        help='A lekérdezések közötti idő másodpercben (alapértelmezett: %(default)s)')
+    parser.add_argument('--jitter', type=float, default=GazetteDaemon.JITTER,
+                        help='A lekérdezési idő véletlen eltolásának aránya (0.1 = ±10%%)')
+    parser.add_argument('--max-downloads', type=int, default=GazetteDaemon.MAX_DOWNLOADS,
+                        help='Egyszerre futó letöltések maximális száma')
+    parser.add_argument('--queue-size', type=int, default=GazetteDaemon.QUEUE_SIZE,
+                        help='A feldolgozásra váró közlönyök maximális száma; ha megtelik, '
+                             'a letöltés várakozik')
+    parser.add_argument('--digest-interval', type=float, default=0.0,
+                        help='Az összesítő értesítők közötti legkisebb idő másodpercben; addig a '
+                             'közlönyök eredményei egy üzenetbe gyűlnek (0 = feldolgozásonként)')
+    parser.add_argument('--email', action='store_true',
+                        help='Email küldése a releváns kormányhatározatokról (elemzéssel együtt)')
+    parser.add_argument('--base-dir', default=None,
+                        help='A gazettes.db, a downloads/ és a resolutions.db könyvtára '
+                             '(alapértelmezett: aktuális könyvtár)')
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    # A hibás szabálykészlet a feldolgozás indítása előtt kiderül (a lefordított alak gyorsítótárazódik)
+    if args.rules:
+        try:
+            load_rule_engine(args.rules, args.model)
+        except (OSError, ValueError) as e:
+            print(f"Hiba a szabálykészlet betöltése közben: {e}")
+            return
+    
+    with GazetteDaemon(args.base_dir, interval=args.interval, jitter=args.jitter,
+                       max_downloads=args.max_downloads, queue_size=args.queue_size,
+                       analyze=args.analyze, email=args.email, engine=args.engine,
+                       prefilter=args.prefilter, model_name=args.model,
+                       sentencizer=args.sentencizer, batch_size=args.batch_size,
+                       digest_interval=args.digest_interval, rule_paths=args.rules,
+                       lemma_index=args.lemma_index) as daemon:
+        summary = asyncio.run(daemon.run())
+    
+    print(f"{summary['polls']} lekérdezés, {summary['fetched']} új közlöny letöltve, "
+          f"{summary['processed']} feldolgozva, {summary['failed']} hibás.")
+
+COMMANDS = {
+    'query': query_main,
+    'ingest': ingest_main,
+    'batch': batch_main,
+    'run': run_main,
+    'daemon': daemon_main,
+    'memo': memo_main,
+}
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
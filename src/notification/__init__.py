@@ -2,6 +2,6 @@
 Email küldésre szolgáló modul.
 """
 
-from .email_sender import send_email_summary
+from .email_sender import send_email_summary, EmailSender, SmtpSettings
 
-__all__ = ['send_email_summary']
\ No newline at end of file
+__all__ = ['send_email_summary', 'EmailSender', 'SmtpSettings']
\ No newline at end of file
@@ -1,62 +1,273 @@
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from jinja2 import Template
-from datetime import datetime
+import logging
+import os
+import smtplib
+import ssl
+import time
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional
 
-def send_email_summary(results):
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # a python-dotenv nélkül csak a környezeti változók számítanak
+    load_dotenv = None
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+TEMPLATE_NAME = "email_template.html"
+
+
+@lru_cache(maxsize=None)
+def get_template_environment() -> Environment:
+    """A lefordított sablonokat tároló Jinja2 környezet, folyamatonként egyszer létrehozva"""
+    return Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                       autoescape=select_autoescape(['html']),
+                       trim_blocks=True, lstrip_blocks=True)
+
+
+def render_summary(gazettes: List[Dict]) -> Dict:
     """
-    Email küldése az önkormányzatokat érintő kormányhatározatokról.
+    Az értesítő tárgya és HTML tartalma
+
+    Args:
+        gazettes: Közlönyönként {'title': ..., 'relevant_resolutions': [...]};
+                  egy közlönynél a cím el is hagyható
+
+    Returns:
+        {'subject': ..., 'body': ...}
+    """
+    relevant_count = sum(len(gazette['relevant_resolutions']) for gazette in gazettes)
+    body = get_template_environment().get_template(TEMPLATE_NAME).render(
+        gazettes=gazettes, relevant_count=relevant_count)
+    subject = f"Önkormányzati vonatkozású kormányhatározatok - {relevant_count} találat"
+    if len(gazettes) > 1:
+        subject += f" ({len(gazettes)} közlöny)"
+    return {'subject': subject, 'body': body}
+
+
+class SmtpSettings:
+    """Az SMTP kapcsolat és a címzettek beállításai (lásd .env.example)"""
+
+    def __init__(self, server: str, port: int = 587, sender: Optional[str] = None,
+                 password: Optional[str] = None, recipients: Optional[List[str]] = None,
+                 timeout: float = 30.0):
+        """
+        Args:
+            server: Az SMTP szerver címe
+            port: Az SMTP szerver portja; 465 esetén SSL, különben STARTTLS, ha a szerver támogatja
+            sender: A feladó címe (és a bejelentkezési név)
+            password: A bejelentkezési jelszó; ha nincs megadva, nem jelentkezik be
+            recipients: A címzettek listája
+            timeout: A kapcsolat időkorlátja másodpercben
+        """
+        self.server = server
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.recipients = recipients or []
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> 'SmtpSettings':
+        """
+        Beállítások a környezeti változókból (SMTP_SERVER, SMTP_PORT, SENDER_EMAIL,
+        SENDER_PASSWORD, RECIPIENT_LIST), a munkakönyvtár .env fájljával kiegészítve
+        """
+        if load_dotenv is not None:
+            load_dotenv()
+        recipients = os.environ.get('RECIPIENT_LIST', '')
+        return cls(
+            server=os.environ.get('SMTP_SERVER', 'localhost'),
+            port=int(os.environ.get('SMTP_PORT', 587)),
+            sender=os.environ.get('SENDER_EMAIL'),
+            password=os.environ.get('SENDER_PASSWORD') or None,
+            recipients=[address.strip() for address in recipients.split(',') if address.strip()],
+        )
+
+
+class EmailSender:
     """
-        
-    # HTML sablon az email tartalmához
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body { font-family: Arial, sans-serif; }
-            .resolution { margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; }
-            .title { font-weight: bold; }
-            .summary { font-style: italic; color: #555; }
-        </style>
-    </head>
-    <body>
-        <h2>Önkormányzatokkal kapcsolatos kormányhatározatok</h2>
-        <p>A legutóbbi Magyar Közlönyben {{ relevant_count }} olyan kormányhatározat található, amely önkormányzatokkal kapcsolatos.</p>
-        
-        {% for item in relevant_resolutions %}
-        <div class="resolution">
-            <div class="title">{{ item.resolution.title }}</div>
-            <div class="date">Kiadva: {{ item.resolution.date }}</div>
-            <div class="summary">
-                <strong>Összefoglaló:</strong> {{ item.summary }}
-            </div>
-        </div>
-        {% endfor %}
-    </body>
-    </html>
+    Értesítők küldése egyetlen, a címzettek és az üzenetek között újrahasznált
+    SMTP kapcsolaton
+
+    Összesítő (digest) módban a közlönyök eredményei a queue() hívásokkal
+    gyűlnek, és a flush() egyetlen üzenetben küldi el őket, legfeljebb
+    digest_interval másodpercenként; így egy visszamenőleges feldolgozás sem
+    nyit közlönyönként új kapcsolatot.
+    """
+
+    # Ennyi másodperc tétlenség után küldés előtt ellenőrzi (NOOP), hogy a kapcsolat él-e még
+    IDLE_CHECK = 30.0
+
+    def __init__(self, settings: Optional[SmtpSettings] = None, digest_interval: float = 0.0):
+        """
+        Inicializálja a küldőt; a kapcsolat csak az első küldéskor nyílik meg
+
+        Args:
+            settings: SMTP beállítások; ha nincs megadva, a környezeti változókból
+            digest_interval: Összesítő módban két küldés közötti legkisebb idő másodpercben
+        """
+        self.settings = settings or SmtpSettings.from_env()
+        self.digest_interval = digest_interval
+        self._connection = None
+        self._last_used = 0.0
+        self._pending = []
+        self._last_flush = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Az SMTP kapcsolat lezárása (a még nem küldött összesítő elvész)"""
+        if self._connection is None:
+            return
+        try:
+            self._connection.quit()
+        except (smtplib.SMTPException, OSError):
+            self._connection.close()
+        self._connection = None
+
+    def _connect(self) -> smtplib.SMTP:
+        """Új SMTP kapcsolat: SSL vagy STARTTLS, majd bejelentkezés, ha van jelszó"""
+        settings = self.settings
+        context = ssl.create_default_context()
+        if settings.port == 465:
+            connection = smtplib.SMTP_SSL(settings.server, settings.port, timeout=settings.timeout,
+                                          context=context)
+        else:
+            connection = smtplib.SMTP(settings.server, settings.port, timeout=settings.timeout)
+            connection.ehlo()
+            if connection.has_extn('starttls'):
+                connection.starttls(context=context)
+                connection.ehlo()
+        if settings.password:
+            connection.login(settings.sender, settings.password)
+        logger.debug(f"SMTP kapcsolat megnyitva: {settings.server}:{settings.port}")
+        return connection
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """A nyitott kapcsolat, ha még él (a szerver a tétlen kapcsolatot bonthatja), különben egy új"""
+        if self._connection is not None and time.monotonic() - self._last_used > self.IDLE_CHECK:
+            try:
+                self._connection.noop()
+            except (smtplib.SMTPException, OSError):
+                self._connection.close()
+                self._connection = None
+        if self._connection is None:
+            self._connection = self._connect()
+        self._last_used = time.monotonic()
+        return self._connection
+
+    def send(self, gazettes: List[Dict]) -> int:
+        """
+        Egy értesítő küldése minden címzettnek egyetlen üzenetben (egy SMTP
+        tranzakcióban). A címzettek csak a borítékban szerepelnek, egymás címét
+        nem látják. Mivel a szerver az üzenetet egyszerre fogadja el az összes
+        címzettnek, egy sikertelen küldés újrapróbálása sem küld senkinek kétszer.
+
+        Args:
+            gazettes: Közlönyönként {'title': ..., 'relevant_resolutions': [...]}
+
+        Returns:
+            Azon címzettek száma, akiknek a szerver elfogadta az üzenetet
+
+        Raises:
+            ValueError: Ha nincs megadva a feladó címe (SENDER_EMAIL)
+        """
+        if not self.settings.sender:
+            # Nélküle a "None" kerülne a From fejlécbe és a borítékba
+            raise ValueError("Nincs megadva a feladó címe (SENDER_EMAIL), az értesítő nem küldhető el")
+        recipients = self.settings.recipients
+        if not recipients:
+            logger.warning("Nincs megadva címzett (RECIPIENT_LIST), az értesítő nem került elküldésre")
+            return 0
+        content = render_summary(gazettes)
+        message = EmailMessage()
+        message['Subject'] = content['subject']
+        message['From'] = self.settings.sender
+        message['To'] = 'undisclosed-recipients:;'
+        message['Date'] = formatdate(localtime=True)
+        message['Message-ID'] = make_msgid()
+        message.set_content(content['body'], subtype='html')
+        try:
+            refused = self._get_connection().send_message(message, to_addrs=recipients)
+        except smtplib.SMTPServerDisconnected:
+            # A szerver közben bontotta a kapcsolatot (az üzenetet nem fogadta el):
+            # egy újrapróbálkozás új kapcsolattal
+            self._connection = None
+            refused = self._get_connection().send_message(message, to_addrs=recipients)
+        for recipient, (code, reason) in refused.items():
+            logger.warning(f"A szerver elutasította a címzettet: {recipient} ({code} {reason!r})")
+        sent = len(recipients) - len(refused)
+        logger.info(f"Értesítő elküldve {sent} címzettnek: {content['subject']}")
+        return sent
+
+    def queue(self, title: str, relevant_resolutions: List[Dict], key: Optional[Hashable] = None) -> None:
+        """
+        Egy közlöny eredményeinek hozzáadása az összesítőhöz
+
+        Args:
+            title: A közlöny címe
+            relevant_resolutions: A releváns kormányhatározatok
+            key: Azonosító, amelyet a flush() a sikeres küldés után visszaad (pl. adatbázis id)
+        """
+        self._pending.append((key, {'title': title, 'relevant_resolutions': relevant_resolutions}))
+
+    @property
+    def pending_count(self) -> int:
+        """Az összesítőben várakozó közlönyök száma"""
+        return len(self._pending)
+
+    def digest_due(self) -> bool:
+        """Igaz, ha van várakozó közlöny és a legutóbbi küldés óta eltelt a digest_interval"""
+        if not self._pending:
+            return False
+        return self._last_flush is None or time.monotonic() - self._last_flush >= self.digest_interval
+
+    def flush(self, force: bool = False) -> List[Hashable]:
+        """
+        Az összesítő elküldése, ha esedékes (vagy force esetén mindenképp)
+
+        Returns:
+            Az elküldött közlönyök queue()-nak átadott azonosítói
+        """
+        if not self._pending or not (force or self.digest_due()):
+            return []
+        self.send([gazette for _, gazette in self._pending])
+        keys = [key for key, _ in self._pending]
+        self._pending = []
+        self._last_flush = time.monotonic()
+        return keys
+
+    def discard(self) -> List[Hashable]:
+        """
+        A várakozó összesítő eldobása (pl. sikertelen küldés után)
+
+        Returns:
+            Az eldobott közlönyök azonosítói
+        """
+        keys = [key for key, _ in self._pending]
+        self._pending = []
+        return keys
+
+
+def send_email_summary(results, sender: Optional[EmailSender] = None) -> int:
+    """
+    Email küldése az önkormányzatokat érintő kormányhatározatokról.
+    Ha nincs megadva küldő, a környezeti változók beállításaival egy
+    ideiglenes kapcsolatot nyit. Visszaadja azon címzettek számát, akiknek
+    a szerver elfogadta az üzenetet.
     """
-    
-    # Sablon kitöltése adatokkal
-    template = Template(html_template)
-    html_content = template.render(
-        relevant_count=len(results['relevant_resolutions']),
-        relevant_resolutions=results['relevant_resolutions']
-    )
-    
-    # Email összeállítása
-    msg = {
-        'subject': f"Önkormányzati vonatkozású kormányhatározatok - {len(results['relevant_resolutions'])} találat",
-        'body': html_content,
-        'recipients': ["gallzoltan@gmail.com"],
-        'bccRecipients': [],
-        'ccRecipients': [],
-        'attachments': [],
-        'dateSending': datetime.now(),
-    }
-    
-    
-    # msg.attach(MIMEText(html_content, 'html'))
-    
-    # Email küldése
-    
\ No newline at end of file
+    gazettes = [{'title': results.get('title'), 'relevant_resolutions': results['relevant_resolutions']}]
+    if sender is not None:
+        return sender.send(gazettes)
+    with EmailSender() as sender:
+        return sender.send(gazettes)
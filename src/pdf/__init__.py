@@ -2,6 +2,6 @@
 PDF fájlok feldolgozására szolgáló modul.
 """
 
-from .pdf_processor import extract_text_from_pdf
+from .pdf_processor import extract_text_from_pdf, iter_pdf_pages
 
-__all__ = ['extract_text_from_pdf']
\ No newline at end of file
+__all__ = ['extract_text_from_pdf', 'iter_pdf_pages']
\ No newline at end of file
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# A gyorsítótár alapértelmezett könyvtára (a GazetteFetcher alapkönyvtárához képest)
+CACHE_DIR = "cache"
+# A gyorsítótár könyvtárát felülíró környezeti változó
+CACHE_DIR_ENV = "GDSPACYPDF_CACHE_DIR"
+# Alapértelmezett méretkorlát: 512 MB
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SUFFIX = ".jsonl.gz"
+
+
+class ExtractionCache:
+    """Kinyert PDF szövegek tartalom-címzett, lemezen tárolt gyorsítótára"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializálja a gyorsítótárat
+
+        Args:
+            cache_dir: A gyorsítótár könyvtára, ha nem létezik, létrehozza
+            max_bytes: A gyorsítótár maximális mérete, efölött a legrégebben
+                       használt bejegyzések törlődnek
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key_for(self, pdf_path: str, version: str) -> str:
+        """
+        Gyorsítótár kulcs a fájl tartalmából és a kinyerő verziójából
+
+        Args:
+            pdf_path: A PDF fájl útvonala
+            version: A szövegkinyerő verziója; ha változik, a régi bejegyzések nem érvényesek
+
+        Returns:
+            A kulcs (hexadecimális SHA-256 hash)
+        """
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(b"\0" + version.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Iterator[str]]:
+        """
+        Gyorsítótárazott oldalszövegek lekérése
+
+        Args:
+            key: A key_for által adott kulcs
+
+        Returns:
+            Az oldalszövegek iterátora, vagy None, ha nincs ilyen bejegyzés
+        """
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        # Utolsó használat idejének frissítése az LRU törléshez
+        os.utime(path)
+        return self._read_pages(path)
+
+    def _read_pages(self, path: Path) -> Iterator[str]:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def store(self, key: str, pages: Iterable[str]) -> Iterator[str]:
+        """
+        Oldalszövegek mentése a gyorsítótárba továbbítás közben
+
+        Az oldalakat egyenként írja a tömörített fájlba és adja tovább, így a
+        teljes dokumentumot nem kell memóriában tartani. A bejegyzés csak akkor
+        kerül a gyorsítótárba, ha az összes oldal feldolgozása sikeres volt.
+
+        Args:
+            key: A key_for által adott kulcs
+            pages: Az oldalszövegek
+
+        Returns:
+            Az oldalszövegek iterátora
+        """
+        path = self._entry_path(key)
+        tmp_path = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                for text in pages:
+                    f.write(json.dumps(text, ensure_ascii=False) + "\n")
+                    yield text
+            os.replace(tmp_path, path)
+            self.evict()
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def evict(self) -> None:
+        """A legrégebben használt bejegyzések törlése, amíg a méret a korlát alá nem csökken"""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                logger.info(f"Gyorsítótár bejegyzés törölve: {path.name}")
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """Az összes bejegyzés törlése"""
+        for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            path.unlink()
+
+
+def get_default_cache() -> ExtractionCache:
+    """
+    Az alapértelmezett gyorsítótár
+
+    A könyvtár a GDSPACYPDF_CACHE_DIR környezeti változóból, ennek hiányában
+    az aktuális munkakönyvtár cache alkönyvtárából származik, ami megegyezik
+    az alapértelmezett GazetteFetcher gyorsítótárával.
+    """
+    return ExtractionCache(os.environ.get(CACHE_DIR_ENV) or Path.cwd() / CACHE_DIR)
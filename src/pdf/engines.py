@@ -0,0 +1,77 @@
+"""
+Cserélhető PDF szövegkinyerő motorok.
+
+Minden motor ugyanazt a felületet adja: name, version, page_count(pdf_path) és
+iter_page_texts(pdf_path, start, end), amely a [start, end) oldaltartomány
+(0-tól számozva, end=None esetén a dokumentum végéig) nyers szövegét adja
+oldalanként.
+"""
+
+# Az alapértelmezett motor
+DEFAULT_ENGINE = "pdfplumber"
+
+
+class PdfplumberEngine:
+    """Elrendezés-érzékeny, pontos, de lassú kinyerés (pdfplumber)"""
+
+    name = "pdfplumber"
+
+    @property
+    def version(self):
+        import pdfplumber
+        return pdfplumber.__version__
+
+    def page_count(self, pdf_path):
+        import pdfplumber
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_page_texts(self, pdf_path, start=0, end=None):
+        import pdfplumber
+        # A pdfplumber 1-től számozza az oldalakat
+        pages = list(range(start + 1, end + 1)) if end is not None else None
+        with pdfplumber.open(pdf_path, pages=pages) as pdf:
+            for page in (pdf.pages if end is not None else pdf.pages[start:]):
+                yield page.extract_text() or ""
+                # A feldolgozott oldal gyorsítótárainak felszabadítása
+                page.close()
+
+
+class PypdfEngine:
+    """Gyors, tisztán Python kinyerés (pypdf, a PyPDF2 utódja), elrendezés-elemzés nélkül"""
+
+    name = "pypdf"
+
+    @property
+    def version(self):
+        import pypdf
+        return pypdf.__version__
+
+    def page_count(self, pdf_path):
+        import pypdf
+        return len(pypdf.PdfReader(pdf_path).pages)
+
+    def iter_page_texts(self, pdf_path, start=0, end=None):
+        import pypdf
+        with open(pdf_path, 'rb') as f:
+            reader = pypdf.PdfReader(f)
+            end = len(reader.pages) if end is None else min(end, len(reader.pages))
+            for index in range(start, end):
+                yield reader.pages[index].extract_text() or ""
+
+
+ENGINES = {
+    PdfplumberEngine.name: PdfplumberEngine,
+    PypdfEngine.name: PypdfEngine,
+}
+
+
+def get_engine(name=None):
+    """
+    Szövegkinyerő motor név alapján (None esetén az alapértelmezett).
+    """
+    name = name or DEFAULT_ENGINE
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Ismeretlen PDF motor: {name} (elérhető: {', '.join(ENGINES)})")
@@ -1,28 +1,174 @@
-import pdfplumber
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .cache import get_default_cache
+from .engines import get_engine, DEFAULT_ENGINE
+from .prefilter import find_resolution_pages
+from ..profiling import metrics
 
-def extract_text_from_pdf(pdf_path):
+# Egy worker által egyszerre feldolgozott oldalak száma párhuzamos módban
+DEFAULT_CHUNK_SIZE = 25
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# A szövegkinyerés verziója: ha a kinyerés eredménye változik, növelni kell,
+# így a gyorsítótárban lévő régi eredmények érvénytelenné válnak.
+# A gyorsítótár kulcsában a motor neve és verziója is szerepel.
+EXTRACTOR_VERSION = "1"
+
+def _extract_page_range(pdf_path, start, end, engine=DEFAULT_ENGINE):
+    """
+    Egy oldaltartomány szövegének kinyerése.
+    A process pool workerei ezt hívják, mindegyik önállóan nyitja meg a PDF-et.
+    """
+    return start, list(get_engine(engine).iter_page_texts(pdf_path, start, end))
+
+def get_page_count(pdf_path, engine=DEFAULT_ENGINE):
+    """
+    A PDF oldalainak száma.
+    """
+    return get_engine(engine).page_count(pdf_path)
+
+def iter_page_texts(pdf_path, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                    use_cache=True, rebuild_cache=False, engine=DEFAULT_ENGINE,
+                    prefilter=False, cache=None):
+    """
+    Oldalankénti nyers szöveg generátor, oldalsorrendben.
+    Az engine a szövegkinyerő motor neve (lásd engines.ENGINES).
+    prefilter=True esetén csak a kormányhatározatokat tartalmazó oldalakat
+    dolgozza fel, a többi oldal szövege üres (lásd prefilter.find_resolution_pages).
+    A már feldolgozott fájlok szövegét a lemezen lévő gyorsítótárból adja
+    (use_cache=False esetén nem használja, rebuild_cache=True esetén újraépíti).
+    A cache egy ExtractionCache; ha nincs megadva, az alapértelmezett
+    (cache.get_default_cache, a munkakönyvtárban).
+    """
+    if not use_cache:
+        yield from _extract_page_texts(pdf_path, workers, chunk_size, engine, prefilter)
+        return
+
+    extractor = get_engine(engine)
+    if cache is None:
+        cache = get_default_cache()
+    version = f"{EXTRACTOR_VERSION}-{extractor.name}-{extractor.version}"
+    if prefilter:
+        version += "-prefilter"
+    key = cache.key_for(pdf_path, version)
+    cached = None if rebuild_cache else cache.get(key)
+    if cached is not None:
+        yield from cached
+    else:
+        yield from cache.store(key, _extract_page_texts(pdf_path, workers, chunk_size, engine, prefilter))
+
+def _extract_page_texts(pdf_path, workers, chunk_size, engine=DEFAULT_ENGINE, prefilter=False):
+    """
+    Oldalankénti nyers szöveg kinyerése a PDF-ből.
+    Ha workers > 1, az oldaltartományt chunk_size méretű darabokra bontja,
+    és process poolban dolgozza fel. Egyszerre legfeljebb 2 * workers darab
+    van feldolgozás alatt, így a memóriahasználat a dokumentum méretétől független.
+    Előszűréskor a kihagyott oldalak helyén üres szöveget ad.
+    """
+    found = find_resolution_pages(pdf_path) if prefilter else None
+    if found is None:
+        if workers is None or workers <= 1:
+            yield from get_engine(engine).iter_page_texts(pdf_path)
+            return
+        page_count = get_page_count(pdf_path, engine)
+        selected = [(0, page_count)]
+    else:
+        page_count, selected = found
+
+    if workers is None or workers <= 1:
+        next_page = 0
+        for start, end in selected:
+            yield from [""] * (start - next_page)
+            yield from get_engine(engine).iter_page_texts(pdf_path, start, end)
+            next_page = end
+        yield from [""] * (page_count - next_page)
+        return
+
+    chunk_size = max(1, chunk_size)
+    ranges = deque((start, min(start + chunk_size, range_end))
+                   for range_start, range_end in selected
+                   for start in range(range_start, range_end, chunk_size))
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(ranges)))) as executor:
+        pending = deque()
+        next_page = 0
+        while ranges or pending:
+            while ranges and len(pending) < 2 * workers:
+                start, end = ranges.popleft()
+                pending.append(executor.submit(_extract_page_range, pdf_path, start, end, engine))
+            start, texts = pending.popleft().result()
+            yield from [""] * (start - next_page)
+            yield from texts
+            next_page = start + len(texts)
+    yield from [""] * (page_count - next_page)
+
+def extract_page_texts(pdf_path, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                       use_cache=True, rebuild_cache=False, engine=DEFAULT_ENGINE,
+                       prefilter=False):
+    """
+    Oldalankénti szöveg kinyerése oldalsorrendben, listaként.
+    """
+    return list(iter_page_texts(pdf_path, workers, chunk_size, use_cache, rebuild_cache,
+                                engine, prefilter))
+
+def iter_pdf_pages(pdf_path, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                   use_cache=True, rebuild_cache=False, engine=DEFAULT_ENGINE,
+                   prefilter=False, cache=None):
+    """
+    Normalizált oldalszövegek generátora.
+
+    Minden elem egy szótár: page_number (1-től számozva), text, valamint
+    start és end, a szöveg karakterpozíciói az extract_text_from_pdf által
+    visszaadott teljes szövegben. Az oldalak összefűzött szövege pontosan
+    megegyezik az extract_text_from_pdf eredményével.
+    Előszűréskor (prefilter=True) a kormányhatározatot nem tartalmazó oldalak
+    szövege üres; a kinyert kormányhatározatok ugyanazok maradnak.
+    A cache a használandó ExtractionCache (lásd iter_page_texts).
+    """
+    offset = 0
+    ends_with_space = False
+    page_texts = metrics.timed_iter(
+        'pdf_extraction',
+        iter_page_texts(pdf_path, workers, chunk_size, use_cache, rebuild_cache, engine, prefilter, cache),
+        lambda text: {'pages': 1, 'chars': len(text)})
+    for page_number, text in enumerate(page_texts, 1):
+        normalized = ""
+        if text:
+            # Töröljük a túl sok whitespace-t, az oldalhatáron átnyúlót is
+            normalized = _WHITESPACE_RE.sub(' ', text + "\n")
+            if ends_with_space and normalized.startswith(' '):
+                normalized = normalized[1:]
+            if normalized:
+                ends_with_space = normalized.endswith(' ')
+        yield {
+            'page_number': page_number,
+            'text': normalized,
+            'start': offset,
+            'end': offset + len(normalized),
+        }
+        offset += len(normalized)
+
+def extract_text_from_pdf(pdf_path, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                          use_cache=True, rebuild_cache=False, engine=DEFAULT_ENGINE,
+                          prefilter=False):
     """
     Szöveg kinyerése a PDF fájlból.
+    workers > 1 esetén az oldalakat párhuzamosan, több folyamatban dolgozza fel.
+    A már feldolgozott fájlok szövegét a gyorsítótárból veszi.
+    Nagy dokumentumoknál az iter_pdf_pages oldalankénti feldolgozása kevesebb memóriát igényel.
     """
-    full_text = ""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # print(f"PDF oldalak száma: {len(pdf.pages)}")
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
-                # print(f"  - {i+1}. oldal: {len(text) if text else 0} karakter")
-        
-        # Némi tisztítás a szövegen
-        # Töröljük a túl sok whitespace-t
-        full_text = re.sub(r'\s+', ' ', full_text)
+        # Némi tisztítás a szövegen: a whitespace-t már oldalanként normalizáljuk
+        full_text = "".join(page['text'] for page in iter_pdf_pages(pdf_path, workers, chunk_size,
+                                                              use_cache, rebuild_cache, engine,
+                                                              prefilter))
         # Keressünk kormányhatározatot jelző szöveget
         korm_matches = re.findall(r'Korm[\.|\s]+hat[á|a]rozat', full_text)
         print(f"'Korm. határozat' típusú kifejezések száma: {len(korm_matches)}")
-        
+
         return full_text
     except Exception as e:
         print(f"Hiba a PDF feldolgozása közben: {e}")
-        return ""
\ No newline at end of file
+        return ""
@@ -0,0 +1,55 @@
+"""
+Gyors előszűrés: a kormányhatározatokat tartalmazó oldaltartományok keresése.
+
+Az első menet a PDF content stream-jeiből, elrendezés-elemzés nélkül (pypdf)
+nyeri ki az oldalak szövegét, és ebben keresi a kormányhatározatok fejléceit
+és tartalmuk végét. A második menetben csak ezeket az oldalakat kell a lassú,
+elrendezés-érzékeny motorral feldolgozni.
+"""
+from bisect import bisect_right
+
+from .engines import get_engine
+from ..resolutions.extractor import segment_resolutions, BOUNDARY_RE
+
+# Az első menet motorja
+PREFILTER_ENGINE = "pypdf"
+
+
+def find_resolution_pages(pdf_path, engine=PREFILTER_ENGINE):
+    """
+    A kormányhatározatokat tartalmazó oldaltartományok keresése.
+
+    Visszaadja az oldalak számát és a [start, end) oldaltartományok
+    (0-tól számozva) rendezett, összevont listáját. Egy tartomány a fejléc
+    első karakterét tartalmazó oldaltól a tartalmat lezáró hivatkozás utolsó
+    karakterét tartalmazó oldalig (vagy a dokumentum végéig) tart, így a
+    kihagyott oldalak szövege egyik kormányhatározathoz sem tartozik.
+    Ha a gyors kinyerés egyetlen oldalon sem talál szöveget (pl. szkennelt PDF),
+    None-t ad vissza: ilyenkor a teljes dokumentumot fel kell dolgozni.
+    """
+    page_starts = []
+    parts = []
+    offset = 0
+    for text in get_engine(engine).iter_page_texts(pdf_path):
+        page_starts.append(offset)
+        parts.append(text)
+        # Az oldalakat elválasztó sortörés a fejlécek \s+ részeire is illeszkedik
+        parts.append("\n")
+        offset += len(text) + 1
+
+    text = "".join(parts)
+    if not text.strip():
+        return None
+
+    ranges = []
+    for header, end in segment_resolutions(text):
+        # A lezáró hivatkozás is kerüljön teljes egészében a tartományba
+        boundary = BOUNDARY_RE.match(text, end)
+        stop = boundary.end() if boundary else len(text)
+        first = bisect_right(page_starts, header.start()) - 1
+        last = bisect_right(page_starts, stop - 1) - 1
+        if ranges and first <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], last + 1)
+        else:
+            ranges.append([first, last + 1])
+    return len(page_starts), [tuple(r) for r in ranges]
@@ -0,0 +1,9 @@
+"""
+Több közlöny együttes feldolgozására szolgáló modul.
+"""
+
+from .batch import run_batch, collect_pdf_paths
+from .incremental import IncrementalPipeline
+from .daemon import GazetteDaemon
+
+__all__ = ['run_batch', 'collect_pdf_paths', 'IncrementalPipeline', 'GazetteDaemon']
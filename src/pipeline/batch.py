@@ -0,0 +1,174 @@
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from ..pdf.pdf_processor import iter_pdf_pages
+from ..pdf.engines import DEFAULT_ENGINE
+from ..resolutions.extractor import extract_resolutions
+from ..resolutions.analyzer import analyze_resolutions, get_nlp, DEFAULT_BATCH_SIZE
+from ..resolutions.memo import AnalysisMemo
+from ..resolutions.lemma_index import LemmaIndex
+from ..resolutions.rules import load_rule_engine
+from ..resolutions.columnar import ResolutionBatch
+from ..export import ResultExporter
+
+def collect_pdf_paths(inputs):
+    """
+    PDF fájlok összegyűjtése: a bemenet lehet fájl, könyvtár (a benne lévő
+    *.pdf fájlok) vagy glob minta (pl. downloads/*2025*.pdf).
+    """
+    pdf_paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            pdf_paths.extend(sorted(str(p) for p in Path(item).glob('*.pdf')))
+        elif glob.has_magic(item):
+            pdf_paths.extend(sorted(glob.glob(item)))
+        else:
+            pdf_paths.append(item)
+    # Ismétlődések kiszűrése a sorrend megtartásával
+    return list(dict.fromkeys(pdf_paths))
+
+def _init_worker(analyze, model_name, sentencizer):
+    """
+    Worker folyamat inicializálása: a nyelvi modellt folyamatonként egyszer tölti be.
+    """
+    if analyze and not sentencizer:
+        get_nlp(model_name)
+
+def process_file(pdf_path, analyze=False, model_name=None, sentencizer=False,
+                 batch_size=DEFAULT_BATCH_SIZE, use_cache=True, engine=DEFAULT_ENGINE,
+                 prefilter=False, use_memo=True, rules=None, use_lemma_index=False):
+    """
+    Egy közlöny feldolgozása: szövegkinyerés, kormányhatározatokra bontás és
+    opcionálisan elemzés. Az eredmény JSON-ba írható szótár.
+    use_memo=True esetén a korábbi elemzési eredményeket az aktuális könyvtár
+    analysis.db tárából veszi (lásd AnalysisMemo). A rules (RuleEngine) a
+    beépített kulcsszavak helyett pontozó szabálykészletek; use_lemma_index=True
+    esetén a lemma módú kulcsszavak az aktuális könyvtár lemmas.db indexében
+    keresendők (lásd LemmaIndex).
+    """
+    result = {
+        'source': os.path.abspath(pdf_path),
+        'resolutions': [],
+        'relevant_resolutions': [],
+        'timings': {},
+        'error': None,
+        'messages': [],
+    }
+    start = time.perf_counter()
+    # A feldolgozás közbeni kiírások az eredménybe kerülnek, hogy a workerek ne írjanak egymásba
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured):
+            # Tömör, oszlopos tárolás: a worker ezt olcsóbban adja át, mint a szótárak listáját
+            resolutions = extract_resolutions(iter_pdf_pages(pdf_path, use_cache=use_cache,
+                                                                engine=engine, prefilter=prefilter),
+                                              columnar=True)
+        result['timings']['extract'] = time.perf_counter() - start
+        result['resolutions'] = resolutions
+
+        if analyze:
+            analyze_start = time.perf_counter()
+            memo = AnalysisMemo() if use_memo else None
+            lemma_index = LemmaIndex() if use_lemma_index else None
+            with contextlib.redirect_stdout(captured), memo or contextlib.nullcontext(), \
+                    lemma_index or contextlib.nullcontext():
+                analysis = analyze_resolutions(resolutions, model_name=model_name,
+                                               batch_size=batch_size, sentencizer=sentencizer,
+                                               memo=memo, rules=rules, lemma_index=lemma_index)
+            result['timings']['analyze'] = time.perf_counter() - analyze_start
+            result['relevant_resolutions'] = [
+                {
+                    'number': item['resolution']['number'],
+                    'year': item['resolution']['year'],
+                    'title': item['resolution']['title'],
+                    'relevance_score': item['relevance_score'],
+                    'keyword_matches': item['keyword_matches'],
+                    'rule_scores': item['rule_scores'],
+                    'summary': item['summary'],
+                }
+                for item in analysis['relevant_resolutions']
+            ]
+    except Exception as e:
+        result['error'] = str(e)
+    result['messages'] = captured.getvalue().splitlines()
+    result['timings']['total'] = time.perf_counter() - start
+    return result
+
+def _json_default(value):
+    """
+    A JSON által nem ismert típusok (datetime.date, ResolutionBatch) átalakítása.
+    """
+    if isinstance(value, ResolutionBatch):
+        return value.to_dicts()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Nem szerializálható típus: {type(value).__name__}")
+
+def run_batch(pdf_paths, output_path, workers=None, analyze=False, model_name=None,
+              sentencizer=False, batch_size=DEFAULT_BATCH_SIZE, use_cache=True,
+              engine=DEFAULT_ENGINE, prefilter=False, use_memo=True, export_path=None,
+              export_format='jsonl', rule_paths=None, use_lemma_index=False):
+    """
+    Több közlöny párhuzamos feldolgozása process poolban.
+
+    Minden worker egyszer tölti be a nyelvi modellt, a fájlonkénti eredmények
+    a befejezés sorrendjében, soronként egy JSON objektumként (JSON Lines)
+    kerülnek az output_path fájlba. Visszaadja a feldolgozott fájlok és a
+    hibás fájlok számát.
+    Ha az export_path meg van adva, a kormányhatározatok és az elemzési
+    eredmények a feldolgozás ütemében az ottani, év/hónap szerint particionált
+    adathalmazhoz is hozzáfűződnek (lásd ResultExporter).
+    A rule_paths szabálykészlet fájljai egyszer, itt fordítódnak le, a workerek
+    a lefordított motort kapják meg.
+    """
+    total = len(pdf_paths)
+    rules = load_rule_engine(rule_paths, model_name) if analyze and rule_paths else None
+    failed = 0
+    batch_start = time.perf_counter()
+
+    exporter = ResultExporter(export_path, format=export_format) if export_path else None
+    with open(output_path, 'w', encoding='utf-8') as output, exporter or contextlib.nullcontext(), \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(analyze, model_name, sentencizer)) as executor:
+        futures = {
+            executor.submit(process_file, pdf_path, analyze, model_name, sentencizer,
+                            batch_size, use_cache, engine, prefilter, use_memo, rules,
+                            use_lemma_index): pdf_path
+            for pdf_path in pdf_paths
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                result = future.result()
+            except Exception as e:
+                # A worker folyamat leállt (pl. elfogyott a memória a modell betöltésekor,
+                # BrokenProcessPool): a fájl hibás eredményként kerül a kimenetbe
+                result = {'source': os.path.abspath(futures[future]), 'resolutions': [],
+                          'relevant_resolutions': [], 'timings': {'total': 0.0},
+                          'error': f"{type(e).__name__}: {e}", 'messages': []}
+            output.write(json.dumps(result, ensure_ascii=False, default=_json_default) + "\n")
+            output.flush()
+            if exporter is not None and not result['error']:
+                exporter.write_gazette(result['resolutions'],
+                                       result['relevant_resolutions'] if analyze else None,
+                                       source=result['source'])
+
+            name = os.path.basename(futures[future])
+            elapsed = result['timings']['total']
+            if result['error']:
+                failed += 1
+                print(f"[{done}/{total}] {name}: HIBA: {result['error']} ({elapsed:.2f} s)")
+            else:
+                line = f"[{done}/{total}] {name}: {len(result['resolutions'])} kormányhatározat"
+                if analyze:
+                    line += f", {len(result['relevant_resolutions'])} releváns"
+                print(f"{line} ({elapsed:.2f} s)")
+
+    print(f"{total} fájl feldolgozva {time.perf_counter() - batch_start:.2f} s alatt, "
+          f"{failed} hibás. Eredmények: {output_path}")
+    return total, failed
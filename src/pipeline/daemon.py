@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import random
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from ..fetching.fetch_gazette import GazetteFetcher
+from .incremental import IncrementalPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class GazetteDaemon:
+    """
+    Folyamatosan futó, asyncio alapú feedfigyelő
+
+    A feedet véletlen eltolással (jitter) ütemezve kérdezi le, az új közlönyöket
+    legfeljebb max_downloads párhuzamos letöltéssel tölti le, és egy belső
+    sorba teszi, ahonnan a feldolgozás (IncrementalPipeline) azonnal elviszi.
+    Ha a feldolgozás lemarad és a sor megtelik, a letöltések és a következő
+    lekérdezés megvárják, amíg hely szabadul fel. SIGINT / SIGTERM hatására
+    nem kérdez le újra, a folyamatban lévő letöltéseket és a sorban álló
+    közlönyök feldolgozását befejezi, majd kilép.
+
+    A letöltő (requests) és a feldolgozás blokkoló, ezért szálakban futnak;
+    a feldolgozás mindig ugyanazon az egy szálon (az SQLite kapcsolatai ahhoz a
+    szálhoz kötődnek), a letöltőtől külön adatbázis kapcsolattal.
+    """
+
+    # A lekérdezések közötti idő másodpercben és a véletlen eltolás aránya
+    INTERVAL = 300.0
+    JITTER = 0.1
+    # Egyszerre futó letöltések és a feldolgozásra váró közlönyök maximális száma
+    MAX_DOWNLOADS = 4
+    QUEUE_SIZE = 8
+
+    def __init__(self, base_dir: Optional[str] = None, interval: float = INTERVAL,
+                 jitter: float = JITTER, max_downloads: int = MAX_DOWNLOADS,
+                 queue_size: int = QUEUE_SIZE, **pipeline_options):
+        """
+        Inicializálja a feedfigyelőt
+
+        Args:
+            base_dir: Alap könyvtár (gazettes.db, downloads/, cache/, resolutions.db, analysis.db)
+                     Ha nincs megadva, az aktuális munkakönyvtárat használja
+            interval: A lekérdezések közötti idő másodpercben
+            jitter: A lekérdezési idő véletlen eltolásának aránya (0.1 = ±10%)
+            max_downloads: Egyszerre futó letöltések maximális száma
+            queue_size: A feldolgozásra váró közlönyök maximális száma
+            pipeline_options: Az IncrementalPipeline paraméterei (analyze, email, engine,
+                              digest_interval...)
+        """
+        self.interval = interval
+        self.jitter = jitter
+        self.max_downloads = max(1, max_downloads)
+        self.queue_size = max(1, queue_size)
+
+        self.fetcher = GazetteFetcher(base_dir, max_workers=self.max_downloads)
+        self._processor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gazette-processor')
+        self.pipeline = self._processor.submit(IncrementalPipeline, base_dir, **pipeline_options).result()
+
+        self.stats = {'polls': 0, 'fetched': 0, 'processed': 0, 'failed': 0}
+        self._stopping = None
+        self._queue = None
+        self._downloads = None
+        # Egy másik futás miatt elhalasztott feldolgozás
+        self._deferred = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Az adatbázis kapcsolatok és a HTTP session lezárása"""
+        self._processor.submit(self.pipeline.close).result()
+        self._processor.shutdown()
+        self.fetcher.close()
+
+    def stop(self) -> None:
+        """Leállás kérése: nem kérdez le újra, a sorban állókat még feldolgozza"""
+        if self._stopping is not None and not self._stopping.is_set():
+            logger.info("Leállás: a folyamatban lévő letöltések és feldolgozás befejezése...")
+            self._stopping.set()
+
+    def next_delay(self) -> float:
+        """A következő lekérdezésig hátralévő idő, véletlen eltolással"""
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    async def run(self, max_polls: Optional[int] = None) -> Dict:
+        """
+        A lekérdezés és a feldolgozás futtatása leállásig
+
+        Args:
+            max_polls: Ennyi lekérdezés után leáll (None: leállítás kéréséig fut)
+
+        Returns:
+            Összesítés (polls, fetched, processed, failed)
+        """
+        self._stopping = asyncio.Event()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._downloads = asyncio.Semaphore(self.max_downloads)
+
+        loop = asyncio.get_running_loop()
+        handled = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                handled.append(sig)
+            except (NotImplementedError, RuntimeError):  # Windows, vagy nem a fő szálban fut
+                pass
+
+        consumer = asyncio.create_task(self._consume())
+        try:
+            await self._poll_loop(max_polls)
+        finally:
+            # A feldolgozás a sorban állók után a None jelzésre áll le
+            await self._queue.put(None)
+            await consumer
+            # A még várakozó összesítő értesítő elküldése a digest_interval letelte nélkül
+            await loop.run_in_executor(self._processor, self.pipeline.flush_notifications, True)
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+        return dict(self.stats)
+
+    async def _poll_loop(self, max_polls: Optional[int]) -> None:
+        """A feed ütemezett lekérdezése leállásig"""
+        while not self._stopping.is_set():
+            await self.poll()
+            if max_polls is not None and self.stats['polls'] >= max_polls:
+                break
+            delay = self.next_delay()
+            logger.debug(f"Következő lekérdezés {delay:.0f} mp múlva")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll(self) -> List[str]:
+        """
+        Egy lekérdezés: a feed letöltése, az új közlönyök párhuzamos letöltése
+        és sorba állítása
+
+        Returns:
+            A sikeresen letöltött fájlok listája
+        """
+        self.stats['polls'] += 1
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(None, self.fetcher.fetch_feed)
+        # Ugyanaz az URL csak egyszer szerepeljen, különben két szál írná ugyanazt a fájlt
+        entries = list({entry['url']: entry for entry in entries}.values())
+        downloaded_urls = await loop.run_in_executor(None, self.fetcher.get_downloaded_urls,
+                                                     [entry['url'] for entry in entries])
+        new_entries = [entry for entry in entries if entry['url'] not in downloaded_urls]
+        if not new_entries:
+            self.fetcher.save_feed_state()
+            return []
+
+        logger.info(f"{len(new_entries)} új közlöny a feedben")
+        paths = await asyncio.gather(*(self._download(entry) for entry in new_entries))
+        downloaded = [path for path in paths if path]
+        self.stats['fetched'] += len(downloaded)
+
+        # Ha valamelyik letöltés nem sikerült, a következő lekérdezés újrapróbálja
+        if len(downloaded) == len(new_entries):
+            self.fetcher.save_feed_state()
+        return downloaded
+
+    async def _download(self, entry: Dict) -> Optional[str]:
+        """
+        Egy közlöny letöltése a párhuzamossági korláton belül, majd sorba állítása
+
+        A letöltési hely csak a sorba állítás után szabadul fel, így tele sor
+        esetén nem indul újabb letöltés: legfeljebb queue_size + max_downloads
+        letöltött, feldolgozatlan közlöny lehet egyszerre.
+        """
+        async with self._downloads:
+            success, filename = await asyncio.get_running_loop().run_in_executor(
+                None, self.fetcher.download_gazette, entry)
+            if not success:
+                return None
+            path = str(self.fetcher.download_path / filename)
+            if self._queue.full():
+                logger.info("A feldolgozás lemaradt, a letöltés várakozik")
+            # Tele sor esetén itt várakozik: ez lassítja a letöltést és a lekérdezést
+            await self._queue.put(path)
+        return path
+
+    async def _consume(self) -> None:
+        """
+        A sorba került közlönyök feldolgozása. Egy körben a sorban álló összes
+        közlönyt feldolgozza; induláskor a korábbi futásokból félbemaradtakat is.
+        """
+        await self._process([])
+        while True:
+            try:
+                # Elhalasztott feldolgozás vagy várakozó összesítő értesítő esetén
+                # legkésőbb egy lekérdezési idő múlva újra futtatja a feldolgozást
+                waiting = self._deferred or self.pipeline.has_pending_notifications
+                timeout = self.interval if waiting else None
+                paths = [await asyncio.wait_for(self._queue.get(), timeout=timeout)]
+            except asyncio.TimeoutError:
+                await self._process([])
+                continue
+            while not self._queue.empty():
+                paths.append(self._queue.get_nowait())
+            done = None in paths
+            paths = [path for path in paths if path is not None]
+            if paths:
+                await self._process(paths)
+            if done:
+                return
+
+    async def _process(self, paths: List[str]) -> None:
+        """A függőben lévő közlönyök feldolgozása az IncrementalPipeline-nal, külön szálon"""
+        try:
+            summary = await asyncio.get_running_loop().run_in_executor(self._processor, self.pipeline.run, False)
+        except Exception as e:
+            logger.error(f"Hiba a feldolgozás közben: {e}")
+            return
+        self._deferred = summary is None
+        if summary is None:
+            logger.warning(f"Egy másik feldolgozás még fut, {len(paths)} közlöny később kerül sorra")
+            return
+        self.stats['processed'] += summary['processed']
+        self.stats['failed'] += summary['failed']
+        if summary['processed'] or summary['failed']:
+            logger.info(f"{summary['processed']} közlöny feldolgozva, {summary['failed']} hibás")
@@ -0,0 +1,429 @@
+import contextlib
+import hashlib
+import io
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: nincs flock, a párhuzamos futások kizárása elmarad
+    fcntl = None
+
+from ..fetching.fetch_gazette import GazetteFetcher
+from ..pdf.engines import DEFAULT_ENGINE
+from ..pdf.pdf_processor import iter_pdf_pages
+from ..resolutions.extractor import extract_resolutions
+from ..resolutions.analyzer import analyze_resolutions, DEFAULT_BATCH_SIZE
+from ..resolutions.rules import load_rule_engine
+from ..resolutions.store import ResolutionStore
+from ..resolutions.memo import AnalysisMemo
+from ..resolutions.lemma_index import LemmaIndex
+from ..notification.email_sender import EmailSender
+
+logger = logging.getLogger(__name__)
+
+# Feldolgozási szakaszok állapotai
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class IncrementalPipeline:
+    """
+    Állapotot tartó feldolgozás: letöltés → szövegkinyerés → kormányhatározatokra
+    bontás → elemzés → értesítés, csak az új vagy megváltozott közlönyökre
+
+    A szakaszok állapota és a fájlok ellenőrzőösszege a gazettes táblában van,
+    így a megszakadt vagy hibás feldolgozás a következő futáskor folytatódik,
+    a már feldolgozott közlönyök pedig kimaradnak. Cronból is biztonságosan
+    futtatható: egyszerre csak egy példány dolgozhat.
+    """
+
+    LOCK_FILE = "pipeline.lock"
+    # Ennyi sikertelen feldolgozási próbálkozás után a közlönyt nem próbálja újra;
+    # a sikertelen értesítőküldés (SMTP hiba) nem számít bele, azt mindig újrapróbálja
+    MAX_ATTEMPTS = 3
+    CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+    # A gazettes tábla feldolgozási oszlopai
+    STAGE_COLUMNS = {
+        'checksum': 'TEXT',
+        'file_size': 'INTEGER',
+        'file_mtime': 'REAL',
+        'extract_status': 'TEXT',
+        'analyze_status': 'TEXT',
+        'notify_status': 'TEXT',
+        'resolution_count': 'INTEGER',
+        'analysis': 'TEXT',
+        'attempts': 'INTEGER NOT NULL DEFAULT 0',
+        'notify_attempts': 'INTEGER NOT NULL DEFAULT 0',
+        'last_error': 'TEXT',
+        'processed_date': 'TEXT',
+    }
+
+    def __init__(self, base_dir: Optional[str] = None, analyze: bool = False, email: bool = False,
+                 engine: str = DEFAULT_ENGINE, prefilter: bool = False, model_name: Optional[str] = None,
+                 sentencizer: bool = False, batch_size: int = DEFAULT_BATCH_SIZE,
+                 digest_interval: float = 0.0, rule_paths: Optional[List[str]] = None,
+                 lemma_index: bool = False):
+        """
+        Inicializálja a feldolgozást
+
+        Args:
+            base_dir: Alap könyvtár (gazettes.db, downloads/, cache/, resolutions.db, analysis.db)
+                     Ha nincs megadva, az aktuális munkakönyvtárat használja
+            analyze: Önkormányzati tartalom elemzése
+            email: Email küldése a releváns kormányhatározatokról (elemzést igényel)
+            engine: A PDF szövegkinyerő motor neve
+            prefilter: Csak a kormányhatározatokat tartalmazó oldalak teljes feldolgozása
+            model_name: A használt huspacy modell neve
+            sentencizer: Szabályalapú mondatra bontás a nyelvi modell helyett
+            batch_size: Az összefoglaláskor egy kötegben feldolgozott kormányhatározatok száma
+            digest_interval: Az összesítő értesítők közötti legkisebb idő másodpercben;
+                             0 esetén minden futás végén egy összesítő megy ki
+            rule_paths: Szabálykészlet fájlok a beépített kulcsszavak helyett; minden
+                        elemzés előtt újratöltődnek, ha megváltoztak
+            lemma_index: A lemma módú kulcsszavak keresése a lemmas.db indexben
+        """
+        # A hibás szabálykészlet még az adatbázisok megnyitása előtt kiderül
+        self.rule_paths = rule_paths
+        self.model_name = model_name
+        self._rule_engine = None
+        self._get_rules()
+
+        self.fetcher = GazetteFetcher(base_dir)
+        self.base_dir = self.fetcher.base_dir
+        self.conn = self.fetcher.conn
+        self.store = ResolutionStore(str(self.base_dir))
+        # A változatlan kormányhatározatok elemzési eredménye (pl. egy megváltozott közlönyben)
+        self.memo = AnalysisMemo(str(self.base_dir))
+        # A kormányhatározatok lemma indexe, hogy az újrapontozáshoz ne kelljen a nyelvi modell
+        if lemma_index and not (self._rule_engine is not None and self._rule_engine.uses_lemmas):
+            logger.warning("A lemma index hatástalan: a szabálykészletekben nincs lemma módú "
+                           "kulcsszó (\"match\": \"lemma\")")
+            # A beépített kulcsszavak nem változnak; a szabálykészlet fájlok futás közben
+            # kaphatnak lemma módú kulcsszót, ezért velük az index nyitva marad
+            lemma_index = bool(self.rule_paths)
+        self.lemma_index = LemmaIndex(str(self.base_dir)) if lemma_index else None
+
+        self.analyze = analyze or email
+        self.email = email
+        self.engine = engine
+        self.prefilter = prefilter
+        self.sentencizer = sentencizer
+        self.batch_size = batch_size
+        # Az értesítők egy összesítőbe gyűlnek; a küldő egy SMTP kapcsolatot használ
+        self.sender = EmailSender(digest_interval=digest_interval) if email else None
+
+        self._lock_file = None
+        # Az összesítőben várakozó közlönyök azonosítói
+        self._queued = set()
+        # A kihagyott közlönyök, amelyekről már volt figyelmeztetés
+        self._reported_stuck = set()
+        self._init_database()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Az adatbázis kapcsolatok lezárása és a zárolás feloldása"""
+        self._release_lock()
+        if self.sender is not None:
+            self.sender.close()
+        self.memo.close()
+        if self.lemma_index is not None:
+            self.lemma_index.close()
+        self.store.close()
+        self.fetcher.close()
+
+    def _get_rules(self):
+        """
+        A szabálykészletek aktuális motorja (a megváltozott fájlok újratöltésével);
+        ha egy módosított fájl hibás, a korábbi motor marad érvényben
+        """
+        if not self.rule_paths:
+            return None
+        try:
+            self._rule_engine = load_rule_engine(self.rule_paths, self.model_name)
+        except (OSError, ValueError) as e:
+            if self._rule_engine is None:
+                raise
+            logger.error(f"A szabálykészlet nem tölthető be, a korábbi marad érvényben: {e}")
+        return self._rule_engine
+
+    def _init_database(self):
+        """A gazettes tábla kiegészítése a feldolgozási oszlopokkal, ha még hiányoznak"""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(gazettes)")}
+        with self.conn:
+            for name, declaration in self.STAGE_COLUMNS.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE gazettes ADD COLUMN {name} {declaration}")
+
+    def _acquire_lock(self) -> bool:
+        """Kizárólagos zárolás, hogy egyszerre csak egy futás dolgozzon"""
+        if fcntl is None:
+            return True
+        self._lock_file = open(self.base_dir / self.LOCK_FILE, 'w')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+        return True
+
+    def _release_lock(self) -> None:
+        """A zárolás feloldása"""
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def run(self, fetch: bool = True) -> Optional[Dict]:
+        """
+        Egy feldolgozási kör: új közlönyök letöltése, majd a függőben lévők feldolgozása
+
+        Args:
+            fetch: Ha False, nem tölti le a feedet, csak a már letöltött közlönyöket dolgozza fel
+
+        Returns:
+            Összesítés (fetched, processed, failed, stuck), vagy None, ha egy másik futás még tart
+        """
+        if not self._acquire_lock():
+            logger.info("Egy másik feldolgozás még fut, kihagyva")
+            return None
+        try:
+            fetched = self.fetcher.fetch_new_gazettes() if fetch else []
+            summary = {'fetched': len(fetched), 'processed': 0, 'failed': 0}
+            for row in self._pending_gazettes():
+                if self._process(row):
+                    summary['processed'] += 1
+                else:
+                    summary['failed'] += 1
+            self.flush_notifications()
+            summary['stuck'] = len(self.stuck_gazettes())
+            return summary
+        finally:
+            self._release_lock()
+
+    def stuck_gazettes(self) -> List[Dict]:
+        """
+        A MAX_ATTEMPTS sikertelen próbálkozás után kihagyott közlönyök; ezeket
+        csak a fájl tartalmának változása (pl. újbóli letöltés) indítja újra.
+        Mindegyikről egyszer (a daemonban sem minden körben) figyelmeztetést
+        naplóz, hogy ne maradjanak észrevétlenül.
+
+        Returns:
+            A közlönyök (id, title, last_error) adatai
+        """
+        rows = self.conn.execute(
+            "SELECT id, title, last_error FROM gazettes WHERE attempts >= ? ORDER BY publication_date",
+            (self.MAX_ATTEMPTS,)
+        ).fetchall()
+        stuck = [dict(zip(('id', 'title', 'last_error'), row)) for row in rows]
+        for row in stuck:
+            if row['id'] in self._reported_stuck:
+                continue
+            self._reported_stuck.add(row['id'])
+            logger.warning(f"{row['title']}: {self.MAX_ATTEMPTS} sikertelen próbálkozás után kihagyva "
+                           f"(utolsó hiba: {row['last_error']})")
+        return stuck
+
+    def _required_stages(self) -> List[str]:
+        """A kért szakaszok állapot oszlopai"""
+        stages = ['extract_status']
+        if self.analyze:
+            stages.append('analyze_status')
+        if self.email:
+            stages.append('notify_status')
+        return stages
+
+    def _pending_gazettes(self) -> List[Dict]:
+        """
+        Az új, megváltozott vagy félbemaradt közlönyök
+
+        A fájl méretét és módosítási idejét veti össze a tárolttal; az
+        ellenőrzőösszeget csak ezek változásakor számolja újra. Ha a tartalom
+        megváltozott, a közlöny összes szakasza újra lefut.
+
+        Returns:
+            A feldolgozandó közlönyök adatbázis sorai
+        """
+        stages = self._required_stages()
+        columns = ['id', 'title', 'filename', 'checksum', 'file_size', 'file_mtime',
+                   'extract_status', 'analyze_status', 'notify_status', 'attempts']
+        pending = []
+        rows = self.conn.execute(f"SELECT {', '.join(columns)} FROM gazettes ORDER BY publication_date").fetchall()
+        for values in rows:
+            row = dict(zip(columns, values))
+            path = self.fetcher.download_path / row['filename']
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if (stat.st_size, stat.st_mtime) != (row['file_size'], row['file_mtime']):
+                checksum = _file_checksum(path, self.CHECKSUM_CHUNK_SIZE)
+                with self.conn:
+                    if checksum != row['checksum']:
+                        # Új vagy megváltozott tartalom: minden szakasz újrakezdődik
+                        self.conn.execute(
+                            "UPDATE gazettes SET checksum = ?, extract_status = NULL, analyze_status = NULL, "
+                            "notify_status = NULL, attempts = 0, notify_attempts = 0, last_error = NULL "
+                            "WHERE id = ?",
+                            (checksum, row['id'])
+                        )
+                        row.update(checksum=checksum, extract_status=None, analyze_status=None,
+                                   notify_status=None, attempts=0)
+                    self.conn.execute("UPDATE gazettes SET file_size = ?, file_mtime = ? WHERE id = ?",
+                                      (stat.st_size, stat.st_mtime, row['id']))
+
+            if row['attempts'] >= self.MAX_ATTEMPTS:
+                continue
+            if any(row[stage] not in (DONE, SKIPPED) for stage in stages):
+                row['path'] = path
+                pending.append(row)
+        return pending
+
+    def _process(self, row: Dict) -> bool:
+        """
+        Egy közlöny hiányzó szakaszainak futtatása
+
+        Args:
+            row: A közlöny adatbázis sora (a _pending_gazettes eredménye)
+
+        Returns:
+            True, ha minden kért szakasz sikerült
+        """
+        stage = 'extract_status'
+        try:
+            if row['extract_status'] != DONE or (self.analyze and row['analyze_status'] != DONE):
+                # A feldolgozás közbeni kiírások helyett naplózunk
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resolutions = extract_resolutions(iter_pdf_pages(
+                        str(row['path']), engine=self.engine, prefilter=self.prefilter,
+                        cache=self.fetcher.extraction_cache), columnar=True)
+                if row['extract_status'] != DONE:
+                    # A fájl korábbi tartalmából kinyert kormányhatározatok már nem érvényesek
+                    source = str(row['path'].resolve())
+                    self.store.delete_source(source)
+                    self.store.add_resolutions(resolutions, source=source)
+                    self._set_status(row['id'], stage, DONE, resolution_count=len(resolutions))
+                    logger.info(f"{row['title']}: {len(resolutions)} kormányhatározat")
+
+            if self.analyze and row['analyze_status'] != DONE:
+                stage = 'analyze_status'
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = analyze_resolutions(resolutions, model_name=self.model_name,
+                                                  batch_size=self.batch_size,
+                                                  sentencizer=self.sentencizer, memo=self.memo,
+                                                  rules=self._get_rules(), lemma_index=self.lemma_index)
+                relevant = [_relevant_item(item) for item in results['relevant_resolutions']]
+                self._set_status(row['id'], stage, DONE,
+                                 analysis=json.dumps(relevant, ensure_ascii=False))
+                logger.info(f"{row['title']}: {len(relevant)} releváns kormányhatározat")
+
+            if self.email and row['notify_status'] != DONE:
+                stage = 'notify_status'
+                relevant = json.loads(self._get_analysis(row['id']) or '[]')
+                if not relevant:
+                    self._set_status(row['id'], stage, SKIPPED)
+                elif row['id'] not in self._queued:
+                    # Az állapot csak az összesítő elküldése után lesz kész (flush_notifications)
+                    self.sender.queue(row['title'], relevant, key=row['id'])
+                    self._queued.add(row['id'])
+            return True
+
+        except Exception as e:
+            logger.error(f"Hiba a feldolgozás közben ({row['title']}, {stage}): {e}")
+            with self.conn:
+                self.conn.execute(
+                    f"UPDATE gazettes SET {stage} = ?, attempts = attempts + 1, last_error = ?, "
+                    "processed_date = ? WHERE id = ?",
+                    (FAILED, str(e), datetime.now().isoformat(), row['id'])
+                )
+            return False
+
+    @property
+    def has_pending_notifications(self) -> bool:
+        """Igaz, ha az összesítőben még el nem küldött közlöny várakozik"""
+        return self.sender is not None and self.sender.pending_count > 0
+
+    def flush_notifications(self, force: bool = False) -> int:
+        """
+        Az összesítő értesítő elküldése egyetlen üzenetben az összes címzettnek, ha esedékes
+
+        Args:
+            force: A digest_interval letelte nélkül is elküldi (pl. leálláskor)
+
+        Returns:
+            Az értesítőben szereplő közlönyök száma
+        """
+        if not self.has_pending_notifications:
+            return 0
+        try:
+            sent = self.sender.flush(force)
+        except Exception as e:
+            # A közlönyök a következő futáskor újra az összesítőbe kerülnek. Az SMTP
+            # hiba nem a közlöny hibája, ezért külön számoljuk, és nem zárja ki a
+            # közlönyt a további feldolgozásból (lásd MAX_ATTEMPTS).
+            failed = self.sender.discard()
+            self._queued.difference_update(failed)
+            logger.error(f"Hiba az értesítő küldése közben ({len(failed)} közlöny): {e}")
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE gazettes SET notify_status = ?, notify_attempts = notify_attempts + 1, "
+                    "last_error = ?, processed_date = ? WHERE id = ?",
+                    [(FAILED, str(e), datetime.now().isoformat(), gazette_id) for gazette_id in failed]
+                )
+            return 0
+        for gazette_id in sent:
+            self._set_status(gazette_id, 'notify_status', DONE, notify_attempts=0)
+        self._queued.difference_update(sent)
+        return len(sent)
+
+    def _set_status(self, gazette_id: int, stage: str, status: str, **values) -> None:
+        """Egy szakasz állapotának és eredményének mentése"""
+        assignments = [f"{stage} = ?", "processed_date = ?"] + [f"{name} = ?" for name in values]
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE gazettes SET {', '.join(assignments)} WHERE id = ?",
+                [status, datetime.now().isoformat(), *values.values(), gazette_id]
+            )
+
+    def _get_analysis(self, gazette_id: int) -> Optional[str]:
+        """A tárolt elemzési eredmény (JSON)"""
+        row = self.conn.execute("SELECT analysis FROM gazettes WHERE id = ?", (gazette_id,)).fetchone()
+        return row[0] if row else None
+
+
+def _file_checksum(path: Path, chunk_size: int) -> str:
+    """A fájl SHA-256 ellenőrzőösszege"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _relevant_item(item: Dict) -> Dict:
+    """Egy releváns kormányhatározat JSON-ba írható, az email sablonnak megfelelő alakja"""
+    resolution = item['resolution']
+    return {
+        'resolution': {
+            'number': resolution['number'],
+            'year': resolution['year'],
+            'title': resolution['title'],
+            'date': resolution['date'].isoformat(),
+        },
+        'relevance_score': item['relevance_score'],
+        'keyword_matches': item['keyword_matches'],
+        'rule_scores': item['rule_scores'],
+        'summary': item['summary'],
+    }
@@ -0,0 +1,7 @@
+"""
+Feldolgozási szakaszok mérésére és profilozására szolgáló modul.
+"""
+
+from .metrics import metrics, MetricsRecorder, profile_session
+
+__all__ = ['metrics', 'MetricsRecorder', 'profile_session']
@@ -0,0 +1,217 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: a memóriacsúcs nem mérhető
+    resource = None
+
+# A mért darabszámok (oldalak, kormányhatározatok, bájtok...) neve a jelentésben
+COUNTERS = ('pages', 'chars', 'resolutions', 'bytes', 'entries')
+
+# A Prometheus metrikák névelőtagja
+PROMETHEUS_PREFIX = "gdspacypdf"
+
+
+def _peak_rss_bytes():
+    """
+    A folyamat eddigi legnagyobb rezidens memóriahasználata bájtban (None, ha nem mérhető).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linuxon kilobájtban, macOS-en bájtban adja vissza
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MetricsRecorder:
+    """
+    Feldolgozási szakaszonkénti mérések: falióra és CPU idő, memóriacsúcs és darabszámok.
+
+    Alapértelmezetten ki van kapcsolva; ilyenkor a stage() szinte semmibe sem kerül.
+    A szakaszok mérései összegződnek, pl. a pdf_extraction szakasz oldalanként
+    egyszer fut, a jelentésben a hívások száma, az összes és a leghosszabb idő szerepel.
+    A memóriacsúcs a folyamatra vonatkozik (a jelentés peak_rss_bytes értéke); a
+    szakaszoknál az szerepel, hogy futásuk alatt összesen mennyivel nőtt
+    (peak_rss_growth_bytes), így látszik, melyik szakasz emelte meg.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        # A letöltések több szálon futnak
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Az eddigi mérések törlése"""
+        self.stages = {}
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def enable(self):
+        """A mérés bekapcsolása, az eddigi mérések törlésével"""
+        self.reset()
+        self.enabled = True
+
+    def disable(self):
+        """A mérés kikapcsolása; az eddigi mérések megmaradnak"""
+        self.enabled = False
+
+    @contextmanager
+    def stage(self, name, **counts):
+        """
+        Egy szakasz mérése. A blokk a visszaadott szótárban növelheti a
+        darabszámokat, pl. counts['bytes'] += len(chunk).
+        """
+        counts = dict(counts)
+        if not self.enabled:
+            yield counts
+            return
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        rss = _peak_rss_bytes()
+        try:
+            yield counts
+        finally:
+            self._record(name, time.perf_counter() - wall, time.process_time() - cpu, rss, counts)
+
+    def timed_iter(self, name, iterable, counter=None):
+        """
+        Egy generátor elemeinek előállítási idejét méri, elemenként egy szakaszként.
+        A counter(elem) az elemhez tartozó darabszámokat adja, pl. {'pages': 1}.
+        A fogyasztó ideje nem számít bele.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        while True:
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            rss = _peak_rss_bytes()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self._record(name, time.perf_counter() - wall, time.process_time() - cpu, rss,
+                         counter(item) if counter else {})
+            yield item
+
+    def _record(self, name, wall, cpu, rss, counts):
+        """
+        Egy szakasz mérésének hozzáadása az összesítéshez; rss a folyamat
+        memóriacsúcsa a szakasz kezdetén
+        """
+        growth = None if rss is None else _peak_rss_bytes() - rss
+        with self._lock:
+            self._add(name, wall, cpu, growth, counts)
+
+    def _add(self, name, wall, cpu, growth, counts):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                'max_wall_seconds': 0.0, 'peak_rss_growth_bytes': None,
+            }
+        stats['calls'] += 1
+        stats['wall_seconds'] += wall
+        stats['cpu_seconds'] += cpu
+        stats['max_wall_seconds'] = max(stats['max_wall_seconds'], wall)
+        if growth is not None:
+            stats['peak_rss_growth_bytes'] = (stats['peak_rss_growth_bytes'] or 0) + growth
+        for counter, value in counts.items():
+            stats[counter] = stats.get(counter, 0) + value
+
+    def report(self):
+        """
+        A mérések JSON-ba írható összesítése.
+        """
+        return {
+            'wall_seconds': time.perf_counter() - self._started,
+            'cpu_seconds': time.process_time() - self._started_cpu,
+            'peak_rss_bytes': _peak_rss_bytes(),
+            'stages': {name: dict(stats) for name, stats in self.stages.items()},
+        }
+
+    def to_json(self):
+        """A jelentés JSON szövegként"""
+        return json.dumps(self.report(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """
+        A jelentés Prometheus szöveges formátumban (pl. a node_exporter textfile gyűjtőjéhez).
+        """
+        report = self.report()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{{{label_text}}} {value}")
+
+        stages = report['stages']
+        metric('stage_calls_total', 'counter', 'A szakasz futásainak száma',
+               [({'stage': name}, stats['calls']) for name, stats in stages.items()])
+        metric('stage_wall_seconds_total', 'counter', 'A szakasz összes falióra ideje',
+               [({'stage': name}, stats['wall_seconds']) for name, stats in stages.items()])
+        metric('stage_cpu_seconds_total', 'counter', 'A szakasz összes CPU ideje',
+               [({'stage': name}, stats['cpu_seconds']) for name, stats in stages.items()])
+        metric('stage_max_wall_seconds', 'gauge', 'A szakasz leghosszabb futása',
+               [({'stage': name}, stats['max_wall_seconds']) for name, stats in stages.items()])
+        metric('stage_items_total', 'counter', 'A szakaszban feldolgozott elemek száma',
+               [({'stage': name, 'item': counter}, stats[counter])
+                for name, stats in stages.items() for counter in COUNTERS if counter in stats])
+        metric('stage_peak_rss_growth_bytes_total', 'counter',
+               'A folyamat memóriacsúcsának növekedése a szakasz futásai alatt',
+               [({'stage': name}, stats['peak_rss_growth_bytes']) for name, stats in stages.items()
+                if stats['peak_rss_growth_bytes'] is not None])
+        if report['peak_rss_bytes'] is not None:
+            metric('peak_rss_bytes', 'gauge', 'A folyamat memóriacsúcsa',
+                   [({}, report['peak_rss_bytes'])])
+        return '\n'.join(lines) + '\n'
+
+
+# A folyamat közös mérője, ezt használják a feldolgozó modulok
+metrics = MetricsRecorder()
+
+
+@contextmanager
+def profile_session(json_path=None, prometheus_path=None, profile_path=None):
+    """
+    Mérés egy futás idejére: ha bármelyik kimenet meg van adva, bekapcsolja
+    a szakaszonkénti mérést, a végén pedig kiírja a JSON jelentést, a Prometheus
+    szöveget, illetve profile_path esetén a cProfile eredményét (pstats formátumban,
+    a legdrágább függvények listáját a kimenetre is kiírva).
+    """
+    if not (json_path or prometheus_path or profile_path):
+        yield metrics
+        return
+
+    metrics.enable()
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(20)
+            print(output.getvalue())
+        metrics.disable()
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                f.write(metrics.to_json())
+        if prometheus_path:
+            with open(prometheus_path, 'w', encoding='utf-8') as f:
+                f.write(metrics.to_prometheus())
@@ -2,7 +2,13 @@
 Kormányhatározatok kinyerésére és elemzésére szolgáló modul.
 """
 
-from .extractor import extract_resolutions
+from .extractor import extract_resolutions, iter_resolutions
 from .analyzer import analyze_resolutions
+from .memo import AnalysisMemo
+from .columnar import ResolutionBatch, ResolutionRecord
+from .rules import RuleEngine, RuleSet, load_rule_engine
+from .lemma_index import LemmaIndex
 
-__all__ = ['extract_resolutions', 'analyze_resolutions']
\ No newline at end of file
+__all__ = ['extract_resolutions', 'iter_resolutions', 'analyze_resolutions', 'AnalysisMemo',
+           'ResolutionBatch', 'ResolutionRecord', 'RuleEngine', 'RuleSet', 'load_rule_engine',
+           'LemmaIndex']
\ No newline at end of file
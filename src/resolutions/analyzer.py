@@ -1,71 +1,354 @@
-import re
-import huspacy
-
-# NLP modell betöltése
-try:
-    # nlp = spacy.load("hu_core_news_lg")    
-    nlp = huspacy.load()
-except:
-    import sys
-    print("Magyar nyelvi modell letöltése...")
-    huspacy.download("hu_core_news_lg")
-    # huspacy.cli.download("hu_core_news_lg")
-    nlp = huspacy.load("hu_core_news_lg")
-
-def analyze_resolutions(resolutions):
+import os
+from functools import lru_cache
+from itertools import islice
+from .rules import default_rule_set, get_rule_engine
+from .columnar import ResolutionBatch
+from .memo import content_hash, settings_hash, model_version
+from .lemma_index import LemmaPostings, ResolutionLemmas, token_lemmas
+from ..profiling import metrics
+
+# Az alapértelmezett magyar nyelvi modell, a GDSPACYPDF_MODEL környezeti változóval felülírható
+DEFAULT_MODEL = "hu_core_news_lg"
+MODEL_ENV = "GDSPACYPDF_MODEL"
+
+# Az összefoglaláshoz az nlp.pipe alapértelmezett kötegmérete
+DEFAULT_BATCH_SIZE = 32
+# A mondathatárokat meghatározó komponensek és az általuk használt tok2vec;
+# az összefoglaláskor a modell többi komponense (ner, lemmatizer, tagger...) ki van kapcsolva
+SENTENCE_COMPONENTS = ('tok2vec', 'senter', 'parser',
+                       'experimental_arc_predicter', 'experimental_arc_labeler')
+# Az összefoglalóba kerülő mondatok száma
+SUMMARY_SENTENCES = 3
+# A lemma indexhez futó komponensek: a szótári alakhoz szükségesek és a mondatra bontó;
+# a parser és a ner ki van kapcsolva
+LEMMA_COMPONENTS = ('tok2vec', 'tagger', 'morphologizer', 'lookup_lemmatizer',
+                    'trainable_lemmatizer', 'lemmatizer', 'lemma_smoother', 'senter')
+# Szemantikus pontozás: a mondat és a kulcsszó vektorának minimális koszinusz
+# hasonlósága, és a kormányhatározatonként megtartott legjobb találatok száma
+DEFAULT_SEMANTIC_THRESHOLD = 0.6
+DEFAULT_TOP_K = 3
+
+def get_nlp(model_name=None):
+    """
+    NLP modell lekérése. A modell csak az első használatkor töltődik be,
+    utána a betöltött példányt adja vissza.
+    """
+    return _load_nlp(_model_name(model_name))
+
+def _model_name(model_name=None):
+    """
+    A használt modell neve: a megadott, a GDSPACYPDF_MODEL környezeti változó, vagy az alapértelmezett.
+    """
+    return model_name or os.environ.get(MODEL_ENV) or DEFAULT_MODEL
+
+@lru_cache(maxsize=None)
+def _load_nlp(model_name):
+    """
+    NLP modell betöltése, ha hiányzik, letöltése.
+    """
+    # A huspacy importálása is lassú, ezért csak itt történik
+    import huspacy
+    try:
+        return huspacy.load(model_name)
+    except Exception:
+        print("Magyar nyelvi modell letöltése...")
+        huspacy.download(model_name)
+        return huspacy.load(model_name)
+
+@lru_cache(maxsize=None)
+def _load_sentencizer():
+    """
+    Szabályalapú mondatra bontó, nyelvi modell nélkül.
+    Sokkal gyorsabb, de a mondathatárok eltérhetnek a modellétől.
+    """
+    import spacy
+    nlp = spacy.blank("hu")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+def _pipe_docs(contents, model_name=None, batch_size=DEFAULT_BATCH_SIZE,
+               n_process=1, sentencizer=False):
+    """
+    Szövegek kötegelt feldolgozása nlp.pipe-pal, csak a mondathatárokhoz
+    szükséges komponensekkel (a szóvektorokhoz nem kell komponens).
+    """
+    if sentencizer:
+        nlp = _load_sentencizer()
+        components = nlp.pipe_names
+    else:
+        nlp = get_nlp(model_name)
+        # Ha a modell egyik ismert komponenssel sem bont mondatokra, minden komponens fut
+        components = [name for name in nlp.pipe_names if name in SENTENCE_COMPONENTS] or nlp.pipe_names
+
+    with nlp.select_pipes(enable=components):
+        yield from nlp.pipe(contents, batch_size=batch_size, n_process=n_process)
+
+def _summarize_doc(doc):
+    """
+    Egyszerű összefoglaló: az első pár mondat.
+    """
+    return '. '.join(sent.text for sent in islice(doc.sents, SUMMARY_SENTENCES))
+
+def summarize_contents(contents, model_name=None, batch_size=DEFAULT_BATCH_SIZE,
+                       n_process=1, sentencizer=False):
+    """
+    Összefoglalók készítése kötegelt nlp.pipe feldolgozással: az első pár mondat.
+    A modellből csak a mondathatárokhoz szükséges komponensek futnak,
+    sentencizer=True esetén a modell helyett szabályalapú mondatra bontás történik.
+    """
+    contents = list(contents)
+    if not contents:
+        return []
+    return [_summarize_doc(doc) for doc in _pipe_docs(contents, model_name, batch_size,
+                                                      n_process, sentencizer)]
+
+def _lemma_docs(texts, model_name=None, batch_size=DEFAULT_BATCH_SIZE, n_process=1):
+    """
+    Szövegek kötegelt lemmatizálása nlp.pipe-pal, csak a szótári alakhoz és a
+    mondathatárokhoz szükséges komponensekkel.
+    """
+    nlp = get_nlp(model_name)
+    components = [name for name in nlp.pipe_names if name in LEMMA_COMPONENTS] or nlp.pipe_names
+    with nlp.select_pipes(enable=components):
+        yield from nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+
+def index_lemmas(resolutions, hashes, lemma_index, model_name=None,
+                 batch_size=DEFAULT_BATCH_SIZE, n_process=1):
+    """
+    A kormányhatározatok lemma indexei (content_hash -> ResolutionLemmas).
+    A lemma_index-ben (LemmaIndex) tárolt indexeket onnan veszi, a hiányzókat
+    egyetlen nlp.pipe menetben készíti el és menti. Az első mondatok határai is
+    az indexbe kerülnek, így az összefoglalóhoz sem kell újabb spaCy menet.
+    """
+    model = model_version(_model_name(model_name))
+    indexes = lemma_index.get_many(hashes, model)
+    missing = {}
+    for resolution, resolution_hash in zip(resolutions, hashes):
+        if resolution_hash not in indexes:
+            missing.setdefault(resolution_hash, resolution)
+    if not missing:
+        return indexes
+    
+    with metrics.stage('lemma_indexing', resolutions=len(missing)):
+        texts = (text for resolution in missing.values()
+                 for text in (resolution['title'], resolution['content']))
+        docs = _lemma_docs(texts, model_name, batch_size, n_process)
+        new_indexes = {}
+        for resolution_hash in missing:
+            title_doc, content_doc = next(docs), next(docs)
+            sentences = None
+            if content_doc.has_annotation("SENT_START"):
+                sentences = [(sent.start_char, sent.end_char)
+                             for sent in islice(content_doc.sents, SUMMARY_SENTENCES)]
+            new_indexes[resolution_hash] = ResolutionLemmas(
+                LemmaPostings.from_lemmas(token_lemmas(title_doc)),
+                LemmaPostings.from_lemmas(token_lemmas(content_doc)),
+                sentences)
+        lemma_index.put_many(new_indexes, model)
+    indexes.update(new_indexes)
+    return indexes
+
+def _normalize_rows(matrix):
+    """
+    A mátrix sorainak egységnyi hosszúra normálása (a nulla sorok nullák maradnak),
+    így a skaláris szorzat koszinusz hasonlóság.
+    """
+    import numpy as np
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+@lru_cache(maxsize=32)
+def embed_keywords(keywords, model_name=None):
+    """
+    A kulcsszavak (tuple) vektorai egyetlen, soronként normált NumPy mátrixban.
+    Kulcsszó listánként és modellenként egyszer számolódik.
+    """
+    import numpy as np
+    nlp = get_nlp(model_name)
+    if not nlp.vocab.vectors.shape[0]:
+        raise ValueError("A szemantikus pontozáshoz szóvektorokat tartalmazó modell kell "
+                         "(pl. hu_core_news_lg)")
+    # Csak tokenizálás: a kulcsszó vektora a szavai vektorainak átlaga
+    matrix = np.vstack([nlp.make_doc(keyword).vector for keyword in keywords]).astype(np.float32)
+    return _normalize_rows(matrix)
+
+def _sentence_vectors(doc, sentences):
+    """
+    A mondatok vektorai (a szavak vektorainak átlaga, mint a Span.vector), a
+    dokumentum szóvektoraiból egyetlen táblázat-kereséssel és összegzéssel.
+    """
+    import numpy as np
+    from spacy.attrs import ORTH
+    vectors = doc.vocab.vectors
+    if vectors.mode != 'default':
+        # Pl. floret vektoroknál nincs közvetlen sorindex
+        return np.vstack([sent.vector for sent in sentences]).astype(np.float32)
+
+    rows = vectors.find(keys=doc.to_array(ORTH))
+    token_matrix = np.asarray(vectors.data, dtype=np.float32)[rows]
+    # A szókincsen kívüli szavak vektora nulla
+    token_matrix[rows < 0] = 0
+    starts = np.array([sent.start for sent in sentences])
+    lengths = np.diff(np.append(starts, len(doc)))
+    return np.add.reduceat(token_matrix, starts, axis=0) / lengths[:, None]
+
+def score_semantic(doc, keywords, keyword_matrix, threshold=DEFAULT_SEMANTIC_THRESHOLD,
+                   top_k=DEFAULT_TOP_K):
+    """
+    Egy dokumentum mondatainak összevetése a kulcsszavakkal egyetlen mátrixszorzással.
+    Visszaadja a legjobb top_k (mondat, kulcsszó) párt, amelynek hasonlósága
+    legalább threshold, valamint ezek átlagát szemantikus pontszámként.
+    """
+    import numpy as np
+    sentences = list(doc.sents)
+    if not sentences:
+        return 0.0, []
+    sentence_matrix = _normalize_rows(_sentence_vectors(doc, sentences))
+    similarities = sentence_matrix @ keyword_matrix.T
+
+    flat = similarities.ravel()
+    candidates = np.flatnonzero(flat >= threshold)
+    if not len(candidates):
+        return 0.0, []
+    best = candidates[np.argsort(flat[candidates])[::-1][:top_k]]
+    matches = []
+    for index in best:
+        sentence_index, keyword_index = divmod(int(index), len(keywords))
+        matches.append({
+            'keyword': keywords[keyword_index],
+            'sentence': sentences[sentence_index].text,
+            'similarity': float(flat[index]),
+        })
+    return float(np.mean(flat[best])), matches
+
+# Önkormányzati vonatkozást jelző kulcsszavak (a beépített szabálykészletből, lásd rules/onkormanyzat.json)
+KEYWORDS = default_rule_set().keywords
+
+def analyze_resolutions(resolutions, keywords=None, model_name=None,
+                        batch_size=DEFAULT_BATCH_SIZE, n_process=1, sentencizer=False,
+                        semantic=False, semantic_threshold=DEFAULT_SEMANTIC_THRESHOLD,
+                        top_k=DEFAULT_TOP_K, memo=None, rules=None, lemma_index=None):
     """
     Kormányhatározatok elemzése önkormányzati vonatkozású tartalom szempontjából.
-    A címben való előfordulás kétszeres súlyt kap
-    """
-
-    keywords = [
-        "ix. helyi önkormányzatok",
-        "települési önkormányzatok", 
-        "önkormányzatok adósságot keletkeztető",
-        "gazdasági társaságok adósságot keletkeztető",
-        "helyi önkormányzat",
-        "önkormányzati adósság",
-        "önkormányzati hitelfelvétel",
-        "adósságot keletkeztető ügyletek",
-        "iparűzési adó"
-    ]
+    A pontozást egy RuleEngine végzi: a rules (pl. rules.load_rule_engine
+    fájlokból), ennek hiányában a keywords vagy a beépített szabálykészlet,
+    amelyben a címben való előfordulás kétszeres súlyt kap. Több szabálykészlet
+    esetén a kormányhatározat akkor releváns, ha legalább az egyik szerint az;
+    a szabálykészletenkénti pontszámok a rule_scores mezőbe kerülnek, a
+    relevance_score ezek maximuma, a keyword_matches a találataik uniója.
+    Az NLP modell csak akkor töltődik be, ha van releváns kormányhatározat,
+    az összefoglalók egy kötegben készülnek (lásd summarize_contents).
+    semantic=True esetén a szó szerinti találatok előszűrőként szolgálnak: az
+    így releváns kormányhatározatok mondatait ugyanabban az nlp.pipe menetben
+    a kulcsszavak vektoraival is összeveti (lásd score_semantic), az eredmény
+    a semantic_score és semantic_matches mezőkbe kerül, és a rendezés elsődleges
+    szempontja a semantic_score lesz.
+    Ha a memo (AnalysisMemo) meg van adva, a korábban már elemzett, változatlan
+    kormányhatározatok eredményét onnan veszi, és csak a többit elemzi.
+    Ha a lemma_index (LemmaIndex) meg van adva és a szabálykészletekben van
+    lemma módú kulcsszó, ezek a kormányhatározatok lemma indexében keresendők
+    (lásd index_lemmas); a nyelvi modell csak a még nem indexelt
+    kormányhatározatokhoz kell, az összefoglaló is az index mondathatáraiból készül.
+    A resolutions szótárak listája vagy ResolutionBatch is lehet; ez utóbbinál
+    az eredményben a 'resolution' a batch egy ResolutionRecord nézete.
+    """
+    if rules is None:
+        rules = get_rule_engine(tuple(keywords) if keywords is not None else None)
+    # Az összes szabálykészlet kulcsszavait egyetlen, előre lefordított illesztő keresi
+    keywords = rules.keywords
+    
+    use_lemmas = lemma_index is not None and rules.uses_lemmas
+    cached = {}
+    hashes = [None] * len(resolutions)
+    if memo is not None or use_lemmas:
+        if isinstance(resolutions, ResolutionBatch):
+            hashes = resolutions.content_hashes()
+        else:
+            hashes = [content_hash(resolution) for resolution in resolutions]
+    if memo is not None:
+        settings = settings_hash(keywords, rules=rules.fingerprint, semantic=semantic,
+                                 semantic_threshold=semantic_threshold, top_k=top_k,
+                                 summary_sentences=SUMMARY_SENTENCES, lemma_index=use_lemmas)
+        model = model_version(_model_name(model_name), sentencizer and not semantic and not use_lemmas)
+        cached = memo.get_many(hashes, settings, model)
+    
+    lemmas = {}
+    if use_lemmas:
+        uncached = [(resolution, resolution_hash) for resolution, resolution_hash in zip(resolutions, hashes)
+                    if resolution_hash not in cached]
+        lemmas = index_lemmas([resolution for resolution, _ in uncached],
+                              [resolution_hash for _, resolution_hash in uncached],
+                              lemma_index, model_name, batch_size, n_process)
     
     relevant_resolutions = []
+    # Az újonnan elemzendő releváns kormányhatározatok és a tárolandó eredmények
+    pending = []
+    new_results = {}
     
-    for resolution in resolutions:
-        relevance_score = 0
-        keyword_matches = []
-        
-        # Ellenőrizzük a címben és a tartalomban a kulcsszavakat
-        for keyword in keywords:
-            title_matches = len(re.findall(r'\b' + keyword + r'\w*\b', resolution['title'].lower()))
-            content_matches = len(re.findall(r'\b' + keyword + r'\w*\b', resolution['content'].lower()))
+    with metrics.stage('keyword_scoring', resolutions=len(resolutions)):
+        for resolution, resolution_hash in zip(resolutions, hashes):
+            result = cached.get(resolution_hash)
+            if result is not None:
+                if result['relevance_score'] > 0:
+                    relevant_resolutions.append({'resolution': resolution, **result})
+                continue
             
-            if title_matches > 0 or content_matches > 0:
-                keyword_matches.append({
-                    'keyword': keyword,
-                    'title_count': title_matches,
-                    'content_count': content_matches
-                })
-                relevance_score += (title_matches * 2) + content_matches
-                
-        if relevance_score > 0:
-            doc = nlp(resolution['content'])
+            # Ellenőrizzük a címben és a tartalomban a kulcsszavakat, szabálykészletenként
+            scores = rules.score(resolution, lemmas.get(resolution_hash))
             
-            # Egyszerű összefoglaló készítése: az első pár mondat
-            summary = '. '.join([sent.text for sent in list(doc.sents)[:3]])
-            
-            relevant_resolutions.append({
-                'resolution': resolution,
-                'relevance_score': relevance_score,
-                'keyword_matches': keyword_matches,
-                'summary': summary
-            })
+            if scores:
+                keyword_matches = {}
+                for score in scores.values():
+                    for match in score['keyword_matches']:
+                        keyword_matches.setdefault(match['keyword'], match)
+                item = {
+                    'resolution': resolution,
+                    'relevance_score': max(score['relevance_score'] for score in scores.values()),
+                    'keyword_matches': list(keyword_matches.values()),
+                    'rule_scores': {name: score['relevance_score'] for name, score in scores.items()},
+                    'summary': None
+                }
+                relevant_resolutions.append(item)
+                pending.append((resolution_hash, item))
+            elif memo is not None:
+                new_results[resolution_hash] = {'relevance_score': 0, 'keyword_matches': [],
+                                                'rule_scores': {}, 'summary': None}
+    
+    if semantic:
+        if pending:
+            contents = [item['resolution']['content'] for _, item in pending]
+            # A mondatvektorokhoz a nyelvi modell kell, a szabályalapú mondatra bontás nem elég
+            keyword_matrix = embed_keywords(keywords, model_name)
+            with metrics.stage('semantic_scoring', resolutions=len(pending)):
+                docs = _pipe_docs(contents, model_name, batch_size, n_process)
+                for (_, item), doc in zip(pending, docs):
+                    item['summary'] = _summarize_doc(doc)
+                    item['semantic_score'], item['semantic_matches'] = score_semantic(
+                        doc, keywords, keyword_matrix, semantic_threshold, top_k)
+        relevant_resolutions.sort(key=lambda x: (x['semantic_score'], x['relevance_score']), reverse=True)
+    else:
+        # Egyszerű összefoglaló készítése: az első pár mondat; ahol a lemma index
+        # tárolja a mondathatárokat, onnan, a többinél kötegelt spaCy menettel
+        for resolution_hash, item in pending:
+            if resolution_hash in lemmas:
+                item['summary'] = lemmas[resolution_hash].summary(item['resolution']['content'])
+        remaining = [item for _, item in pending if item['summary'] is None]
+        with metrics.stage('summarization', resolutions=len(remaining)):
+            summaries = summarize_contents([item['resolution']['content'] for item in remaining],
+                                           model_name=model_name, batch_size=batch_size,
+                                           n_process=n_process, sentencizer=sentencizer)
+        for item, summary in zip(remaining, summaries):
+            item['summary'] = summary
+        
+        # Eredmények rendezése relevancia szerint
+        relevant_resolutions.sort(key=lambda x: x['relevance_score'], reverse=True)
     
-    # Eredmények rendezése relevancia szerint
-    relevant_resolutions.sort(key=lambda x: x['relevance_score'], reverse=True)
+    if memo is not None:
+        for resolution_hash, item in pending:
+            new_results[resolution_hash] = {key: value for key, value in item.items() if key != 'resolution'}
+        memo.put_many(new_results, settings, model)
     
     return {
         'total_resolutions': len(resolutions),
         'relevant_resolutions': relevant_resolutions
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,154 @@
+import datetime
+import hashlib
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+
+class ResolutionRecord:
+    """
+    Egy ResolutionBatch-beli kormányhatározat nézete.
+
+    Csak a batch-re és a sorszámra hivatkozik; a cím és a tartalom
+    hozzáféréskor dekódolódik. Szótárként is olvasható (resolution['title']),
+    így mindenhol használható, ahol az extract_resolutions szótára.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    KEYS = ('number', 'year', 'month', 'day', 'date', 'title', 'content')
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def number(self):
+        return self._batch.text(3 * self._index)
+
+    @property
+    def year(self):
+        return str(self._batch.years[self._index])
+
+    @property
+    def month(self):
+        return self._batch.months[self._index]
+
+    @property
+    def day(self):
+        return self._batch.days[self._index]
+
+    @property
+    def date(self):
+        batch, index = self._batch, self._index
+        return datetime.date(batch.years[index], batch.months[index], batch.days[index])
+
+    @property
+    def title(self):
+        return self._batch.text(3 * self._index + 1)
+
+    @property
+    def content(self):
+        return self._batch.text(3 * self._index + 2)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        """Az extract_resolutions szótárával azonos alakú szótár"""
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def __repr__(self):
+        return f"ResolutionRecord({self.title!r})"
+
+
+class ResolutionBatch:
+    """
+    Kormányhatározatok tömör, oszlopos tárolása nagy (többéves) feldolgozásokhoz.
+
+    Az év, a hónap és a nap típusos tömbökben, a számok, címek és tartalmak
+    egyetlen közös UTF-8 pufferben vannak, eltolásokkal (a szám szövegként,
+    hogy a vezető nullák és a hosszú számok is megmaradjanak); kormányhatározatonként így nem
+    keletkezik szótár, dátum és szöveg objektum. Az elemek ResolutionRecord
+    nézetek, amelyek szótárként is olvashatók. Az extract_resolutions(columnar=True)
+    adja, az analyze_resolutions és a ResolutionStore közvetlenül elfogadja.
+    A tömbök miatt folyamatok között is olcsón átadható (pickle).
+    """
+
+    def __init__(self):
+        self.years = array('H')
+        self.months = array('B')
+        self.days = array('B')
+        # A 3i. szöveg az i. szám, a 3i+1. az i. cím, a 3i+2. az i. tartalom:
+        # _buffer[_offsets[k]:_offsets[k + 1]]
+        self._buffer = bytearray()
+        self._offsets = array('Q', [0])
+
+    @classmethod
+    def from_dicts(cls, resolutions: Iterable[Dict]) -> 'ResolutionBatch':
+        """Batch az extract_resolutions szótáraiból"""
+        batch = cls()
+        for resolution in resolutions:
+            batch.append(resolution['number'], resolution['year'], resolution['month'],
+                         resolution['day'], resolution['title'], resolution['content'])
+        return batch
+
+    def append(self, number, year, month, day, title, content) -> None:
+        """Egy kormányhatározat hozzáadása (az év szövegként is megadható)"""
+        self.years.append(int(year))
+        self.months.append(month)
+        self.days.append(day)
+        for text in (str(number), title, content):
+            self._buffer += text.encode('utf-8')
+            self._offsets.append(len(self._buffer))
+
+    def text(self, position: int) -> str:
+        """A position. szöveg (3i: szám, 3i+1: cím, 3i+2: tartalom) a pufferből"""
+        return self._buffer[self._offsets[position]:self._offsets[position + 1]].decode('utf-8')
+
+    def content_hashes(self) -> List[str]:
+        """
+        A kormányhatározatok memo.content_hash értékei, a szövegek dekódolása nélkül
+        """
+        buffer, offsets = memoryview(self._buffer), self._offsets
+        hashes = []
+        for index in range(len(self)):
+            title = 3 * index + 1
+            digest = hashlib.sha256(buffer[offsets[title]:offsets[title + 1]])
+            digest.update(b'\0')
+            digest.update(buffer[offsets[title + 1]:offsets[title + 2]])
+            hashes.append(digest.hexdigest())
+        return hashes
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def __getitem__(self, index: int) -> ResolutionRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("A kormányhatározat sorszáma kívül esik a tartományon")
+        return ResolutionRecord(self, index)
+
+    def __iter__(self) -> Iterator[ResolutionRecord]:
+        return (ResolutionRecord(self, index) for index in range(len(self)))
+
+    def to_dicts(self) -> List[Dict]:
+        """A kormányhatározatok szótárként (pl. JSON-hoz)"""
+        return [record.to_dict() for record in self]
+
+    @property
+    def nbytes(self) -> int:
+        """A tömbök és a szövegpuffer által lefoglalt bájtok száma"""
+        columns = (self.years, self.months, self.days, self._offsets)
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns) + len(self._buffer)
+
+    def __repr__(self):
+        return f"ResolutionBatch({len(self)} kormányhatározat, {self.nbytes} bájt)"
@@ -1,67 +1,246 @@
 import re
 import datetime
+from functools import partial
+from .columnar import ResolutionBatch
+from ..profiling import metrics
 
-def extract_resolutions(text):
+# Rugalmasabb regex minta a kormányhatározatok fejlécének azonosítására
+# Több whitespace-t és sortörést is engedélyez, rugalmasabb formátumot elfogad
+HEADER_PATTERN = r"A\s+Kormány\s+(\d+)[\/\s]+(\d{4})[\.|\s]+[\(]+((?:I|V|X|L|C|D|M)+)[\.|\s]+(\d+)[\.|\s]+[\)]+\s+Korm[\.|\s]+határozata"
+HEADER_RE = re.compile(HEADER_PATTERN, re.IGNORECASE)
+# Egy kormányhatározat tartalma a következő ilyen hivatkozásig (vagy a szöveg végéig) tart
+BOUNDARY_PATTERN = r"A\s+Kormány\s+\d+[\/\s]+\d{4}"
+BOUNDARY_RE = re.compile(BOUNDARY_PATTERN, re.IGNORECASE)
+# Nagyon egyszerű minta csak a címsor alapszerkezetével (diagnosztika, ha a fenti nem talál semmit)
+SIMPLE_PATTERN = r"Korm[á|a]ny\s+(\d+)[\/|\s]+(\d{4})[\.|\s]+((?:I|V|X|L|C|D|M)+)[\.|\s]+(\d+)[\.|\s]+Korm[\.|\s]+hat[á|a]rozata"
+SIMPLE_RE = re.compile(SIMPLE_PATTERN, re.DOTALL | re.IGNORECASE)
+
+# Római szám -> hónap
+MONTH_MAPPING = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6,
+                 'VII': 7, 'VIII': 8, 'IX': 9, 'X': 10, 'XI': 11, 'XII': 12}
+
+# Fejléc nélküli szövegből ennyi karakter marad a pufferben oldalhatáron,
+# hogy a két oldal közé eső fejléc se vesszen el
+_HEADER_TAIL = 200
+
+def extract_resolutions(text, columnar=False):
     """
     Kormányhatározatok kinyerése a szövegből és strukturált adattá alakítása.
+    A text lehet a teljes szöveg, vagy oldalak sorozata (lásd iter_resolutions).
+    columnar=True esetén szótárak listája helyett tömör ResolutionBatch-et ad.
     """
+    if columnar:
+        batch = ResolutionBatch()
+        build = partial(_append_resolution, batch)
+    else:
+        build = _build_resolution
+    
+    if not isinstance(text, str):
+        resolutions = list(_iter_built(text, build))
+        return batch if columnar else resolutions
+    
     # Diagnosztika - ellenőrizzük, hogy egyáltalán található-e a tipikus szövegrész
     if "Korm. határozata" not in text:
-        print("FIGYELMEZTETÉS: A PDF szöveg nem tartalmaz 'Korm. határozata' kifejezést!")
-        print("Az első 200 karakter a szövegből:")
-        print(text[:200])
-    
-    # Rugalmasabb regex minta a kormányhatározatok azonosítására
-    # Több whitespace-t és sortörést is engedélyez, rugalmasabb formátumot elfogad
-    resolution_pattern = r"A\s+Kormány\s+(\d+)[\/\s]+(\d{4})[\.|\s]+[\(]+((?:I|V|X|L|C|D|M)+)[\.|\s]+(\d+)[\.|\s]+[\)]+\s+Korm[\.|\s]+határozata(.*?)(?=A\s+Kormány\s+\d+[\/\s]+\d{4}|$)"
+        _warn_missing_phrase(text[:200])
     
-    # Összes találat kinyerése
-    matches = list(re.finditer(resolution_pattern, text, re.DOTALL | re.IGNORECASE))
+    with metrics.stage('segmentation', chars=len(text)) as counts:
+        # Összes találat kinyerése
+        segments = list(segment_resolutions(text))
+        counts['resolutions'] = len(segments)
     
-    print(f"Találatok száma a rugalmasabb mintával: {len(matches)}")
+    print(f"Találatok száma a rugalmasabb mintával: {len(segments)}")
     
     # Ha nincs találat, próbáljunk egy még egyszerűbb mintát
-    if len(matches) == 0:
-        print("Nincs találat, próbálok egyszerűbb mintát...")
-        # Nagyon egyszerű minta csak a címsor alapszerkezetével
-        simple_pattern = r"Korm[á|a]ny\s+(\d+)[\/|\s]+(\d{4})[\.|\s]+((?:I|V|X|L|C|D|M)+)[\.|\s]+(\d+)[\.|\s]+Korm[\.|\s]+hat[á|a]rozata"
-        simple_matches = list(re.finditer(simple_pattern, text, re.DOTALL | re.IGNORECASE))
-        print(f"Egyszerűbb mintával találatok száma: {len(simple_matches)}")
-        
-        # Mutassunk egy mintát a szövegből, ahol esetleg kormányhatározat lehet
+    if len(segments) == 0:
         sample_text = text.find("Kormány")
-        if sample_text != -1:
-            print("Minta a szövegből, ahol a 'Kormány' szó található:")
-            print(text[sample_text:sample_text+150])
+        _report_simple_matches(len(SIMPLE_RE.findall(text)),
+                               text[sample_text:sample_text+150] if sample_text != -1 else None)
     
     resolutions = []
-    for match in matches:
-        try:
-            number = match.group(1)
-            year = match.group(2)
-            month_roman = match.group(3)
-            day = match.group(4)
-            content = match.group(5).strip() if match.group(5) else ""
-            
-            # Római szám konvertálása decimálissá
-            month_mapping = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6,
-                             'VII': 7, 'VIII': 8, 'IX': 9, 'X': 10, 'XI': 11, 'XII': 12}
-            month = month_mapping.get(month_roman.upper(), 0)
-            
-            title = f"A Kormány {number}/{year}. ({month_roman}. {day}.) Korm. határozata"
+    for header, end in segments:
+        resolution = build(header, text[header.end():end])
+        if resolution is not None:
+            resolutions.append(resolution)
+    
+    return batch if columnar else resolutions
+
+def _warn_missing_phrase(head):
+    """
+    Figyelmeztetés, ha a szövegben nincs 'Korm. határozata' kifejezés (pl. hibás szövegréteg).
+    """
+    print("FIGYELMEZTETÉS: A PDF szöveg nem tartalmaz 'Korm. határozata' kifejezést!")
+    print("Az első 200 karakter a szövegből:")
+    print(head)
+
+def _report_simple_matches(count, sample):
+    """
+    Találat nélküli szövegnél az egyszerűbb minta találatainak száma, és egy
+    minta a szövegből, ahol esetleg kormányhatározat lehet.
+    """
+    print("Nincs találat, próbálok egyszerűbb mintát...")
+    print(f"Egyszerűbb mintával találatok száma: {count}")
+    if sample is not None:
+        print("Minta a szövegből, ahol a 'Kormány' szó található:")
+        print(sample)
+
+class _Diagnostics:
+    """
+    Az oldalankénti feldolgozásban a találat nélküli szöveg diagnosztikájához
+    gyűjtött adatok (mint az extract_resolutions teljes szövegnél), a teljes
+    szöveg megtartása nélkül. Csak az első kormányhatározatig kell gyűjteni.
+    """
+
+    def __init__(self):
+        self.head = ""
+        self.has_phrase = False
+        self.simple_count = 0
+        self.sample = None
+
+    def feed(self, buffer, new_from):
+        """A puffer vizsgálata, amelynek new_from-tól kezdődő része az új szöveg"""
+        if len(self.head) < 200:
+            self.head += buffer[new_from:new_from + 200 - len(self.head)]
+        # A puffer eleje az előző oldal vége, így az oldalhatárra eső találatok sem vesznek el
+        if not self.has_phrase:
+            self.has_phrase = "Korm. határozata" in buffer
+        self.simple_count += sum(1 for match in SIMPLE_RE.finditer(buffer) if match.end() > new_from)
+        if self.sample is None:
+            sample_text = buffer.find("Kormány")
+            if sample_text != -1:
+                self.sample = buffer[sample_text:sample_text+150]
+        elif len(self.sample) < 150:
+            self.sample += buffer[new_from:new_from + 150 - len(self.sample)]
+
+def segment_resolutions(text):
+    """
+    A szöveg kormányhatározatokra bontása egyetlen menetben.
+    
+    (fejléc találat, tartalom vége) párokat ad: a tartalom a fejléc végétől a
+    következő "A Kormány <szám>/<év>" hivatkozásig vagy a szöveg végéig tart.
+    Minden karaktert legfeljebb egyszer vizsgál, így a futásidő a szöveg
+    hosszával lineárisan nő.
+    """
+    pos = 0
+    while True:
+        header = HEADER_RE.search(text, pos)
+        if header is None:
+            return
+        boundary = BOUNDARY_RE.search(text, header.end())
+        end = boundary.start() if boundary else len(text)
+        yield header, end
+        pos = end
+
+def _parse_header(header):
+    """
+    Egy fejléc találat mezői: (szám, év, hónap, nap, dátum, cím).
+    Érvénytelen dátum esetén ValueError-t dob.
+    """
+    number = header.group(1)
+    year = header.group(2)
+    month_roman = header.group(3)
+    day = header.group(4)
+    
+    # Római szám konvertálása decimálissá
+    month = MONTH_MAPPING.get(month_roman.upper(), 0)
+    date = datetime.date(int(year), month, int(day))
+    
+    title = f"A Kormány {number}/{year}. ({month_roman}. {day}.) Korm. határozata"
+    return number, year, month, int(day), date, title
+
+def _build_resolution(header, content):
+    """
+    Egy fejléc találatból és a hozzá tartozó tartalomból kormányhatározat szótár készítése.
+    Hibás adatok esetén None-t ad vissza.
+    """
+    try:
+        number, year, month, day, date, title = _parse_header(header)
+        
+        return {
+            'number': number,
+            'year': year,
+            'month': month,
+            'day': day,
+            'date': date,
+            'title': title,
+            'content': content.strip()
+        }
+    except Exception as e:
+        print(f"Hiba a feldolgozás közben: {e}")
+        return None
+
+def _append_resolution(batch, header, content):
+    """
+    Mint a _build_resolution, de a kormányhatározat a batch-be kerül (ResolutionBatch).
+    Sikeres hozzáadáskor True-t, hibás adatok esetén None-t ad vissza.
+    """
+    try:
+        number, year, month, day, _, title = _parse_header(header)
+        batch.append(number, year, month, day, title, content.strip())
+        return True
+    except Exception as e:
+        print(f"Hiba a feldolgozás közben: {e}")
+        return None
+
+def iter_resolutions(pages):
+    """
+    Kormányhatározatok fokozatos kinyerése oldalankénti szövegből.
+
+    A pages elemei az iter_pdf_pages által adott szótárak (vagy egyszerű
+    szövegdarabok), amelyek összefűzve a teljes normalizált szöveget adják.
+    Oldalhatárokon csak a még le nem zárt kormányhatározat szövege marad
+    a pufferben, így a memóriahasználat nem függ a dokumentum méretétől.
+    Az eredmény megegyezik az extract_resolutions(teljes_szöveg) eredményével.
+    """
+    return _iter_built(pages, _build_resolution)
+
+def _iter_built(pages, build):
+    """
+    Az iter_resolutions megvalósítása: a lezárt kormányhatározatokból a
+    build(fejléc, tartalom) eredményét adja (a None eredmények kimaradnak).
+    """
+    buffer = ""
+    count = 0
+    diagnostics = _Diagnostics()
+    for page in pages:
+        text = page['text'] if isinstance(page, dict) else page
+        with metrics.stage('segmentation', chars=len(text)) as counts:
+            buffer += text
+            if count == 0:
+                diagnostics.feed(buffer, len(buffer) - len(text))
             
-            resolution = {
-                'number': number,
-                'year': year,
-                'month': month,
-                'day': int(day),
-                'date': datetime.date(int(year), month, int(day)),
-                'title': title,
-                'content': content
-            }
+            # Egy kormányhatározat csak akkor lezárt, ha a tartalmát lezáró hivatkozás már a pufferben van
+            completed = []
+            last_end = 0
+            keep_from = None
+            for header, end in segment_resolutions(buffer):
+                if end == len(buffer):
+                    keep_from = header.start()
+                    break
+                last_end = end
+                resolution = build(header, buffer[header.end():end])
+                if resolution is not None:
+                    completed.append(resolution)
             
-            resolutions.append(resolution)
-        except Exception as e:
-            print(f"Hiba a feldolgozás közben: {e}")
+            if keep_from is None:
+                # Nincs lezáratlan kormányhatározat: csak egy esetleg félbevágott fejlécnyi végét őrizzük meg
+                keep_from = max(last_end, len(buffer) - _HEADER_TAIL)
+            buffer = buffer[keep_from:]
+            counts['resolutions'] = len(completed)
+        count += len(completed)
+        yield from completed
+    
+    # Az utolsó kormányhatározat a szöveg végéig tart
+    with metrics.stage('segmentation') as counts:
+        completed = [resolution for resolution in
+                     (build(header, buffer[header.end():end])
+                      for header, end in segment_resolutions(buffer))
+                     if resolution is not None]
+        counts['resolutions'] = len(completed)
+    count += len(completed)
+    yield from completed
     
-    return resolutions
\ No newline at end of file
+    if count == 0 and not diagnostics.has_phrase:
+        _warn_missing_phrase(diagnostics.head)
+    print(f"Találatok száma a rugalmasabb mintával: {count}")
+    if count == 0:
+        _report_simple_matches(diagnostics.simple_count, diagnostics.sample)
@@ -0,0 +1,250 @@
+import json
+import sqlite3
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def token_lemmas(doc) -> List[str]:
+    """
+    Egy spaCy dokumentum tokenjeinek kisbetűs szótári alakjai (a szóközök nélkül);
+    ha a modell nem ad szótári alakot, a token maga
+    """
+    return [token.lemma_.lower() or token.lower_ for token in doc if not token.is_space]
+
+
+class LemmaPostings:
+    """
+    Egy szöveg (cím vagy tartalom) fordított indexe: szótári alak -> tokenpozíciók
+
+    A pozíciók egyetlen tömbben, szótári alakonként egymás után vannak; a
+    szótári alakokhoz csak a tömbbeli tartomány tartozik.
+    """
+
+    __slots__ = ('_ranges', '_positions')
+
+    def __init__(self, ranges: Dict[str, Tuple[int, int]], positions: array):
+        self._ranges = ranges
+        self._positions = positions
+
+    @classmethod
+    def from_lemmas(cls, lemmas: Iterable[str]) -> 'LemmaPostings':
+        """Index a szöveg tokenjeinek szótári alakjaiból (a tokenek sorrendjében)"""
+        postings = {}
+        for position, lemma in enumerate(lemmas):
+            postings.setdefault(lemma, []).append(position)
+        ranges = {}
+        positions = array('I')
+        for lemma, lemma_positions in postings.items():
+            ranges[lemma] = (len(positions), len(positions) + len(lemma_positions))
+            positions.extend(lemma_positions)
+        return cls(ranges, positions)
+
+    def positions(self, lemma: str) -> Sequence[int]:
+        """Egy szótári alak tokenpozíciói növekvő sorrendben"""
+        start, end = self._ranges.get(lemma, (0, 0))
+        return self._positions[start:end]
+
+    def count(self, lemmas: Sequence[str]) -> int:
+        """
+        Egy szótári alakokból álló kifejezés egymást nem átfedő előfordulásainak száma
+
+        A kifejezés szavainak egymást követő tokeneken kell lenniük (mint a
+        szóközzel elválasztott kulcsszavaknál a regex illesztésnél).
+        """
+        first = self.positions(lemmas[0])
+        if len(lemmas) == 1:
+            return len(first)
+        following = [set(self.positions(lemma)) for lemma in lemmas[1:]]
+        if not all(following):
+            return 0
+        count = 0
+        next_free = 0
+        for position in first:
+            if position < next_free:
+                continue
+            if all(position + offset in positions for offset, positions in enumerate(following, 1)):
+                count += 1
+                next_free = position + len(lemmas)
+        return count
+
+    def to_bytes(self) -> bytes:
+        """Tömör bináris alak: fejléc, a szótári alakok, a darabszámok és a pozíciók"""
+        vocabulary = '\0'.join(self._ranges).encode('utf-8')
+        counts = array('I', (end - start for start, end in self._ranges.values()))
+        header = array('I', [len(vocabulary), len(counts), len(self._positions)])
+        return header.tobytes() + vocabulary + counts.tobytes() + self._positions.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: memoryview, offset: int = 0) -> Tuple['LemmaPostings', int]:
+        """A to_bytes alak visszaolvasása; visszaadja az indexet és a következő eltolást"""
+        header = array('I')
+        header.frombytes(data[offset:offset + 3 * header.itemsize])
+        vocabulary_size, lemma_count, position_count = header
+        offset += 3 * header.itemsize
+        lemmas = bytes(data[offset:offset + vocabulary_size]).decode('utf-8').split('\0') if lemma_count else []
+        offset += vocabulary_size
+        counts = array('I')
+        counts.frombytes(data[offset:offset + lemma_count * counts.itemsize])
+        offset += lemma_count * counts.itemsize
+        positions = array('I')
+        positions.frombytes(data[offset:offset + position_count * positions.itemsize])
+        offset += position_count * positions.itemsize
+
+        ranges = {}
+        start = 0
+        for lemma, count in zip(lemmas, counts):
+            ranges[lemma] = (start, start + count)
+            start += count
+        return cls(ranges, positions), offset
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class ResolutionLemmas:
+    """
+    Egy kormányhatározat címének és tartalmának lemma indexe, valamint a
+    tartalom első mondatainak karakterhatárai (az összefoglalóhoz)
+    """
+
+    __slots__ = ('title', 'content', 'sentences')
+
+    def __init__(self, title: LemmaPostings, content: LemmaPostings,
+                 sentences: Optional[List[Tuple[int, int]]] = None):
+        """
+        Args:
+            title: A cím indexe
+            content: A tartalom indexe
+            sentences: A tartalom első mondatainak (kezdet, vég) karakterpozíciói;
+                       None, ha a lemmatizáló menet nem bontott mondatokra
+        """
+        self.title = title
+        self.content = content
+        self.sentences = sentences
+
+    def summary(self, content: str) -> Optional[str]:
+        """Összefoglaló a tárolt mondathatárokból (mint az analyzer._summarize_doc)"""
+        if self.sentences is None:
+            return None
+        return '. '.join(content[start:end] for start, end in self.sentences)
+
+    def to_bytes(self) -> bytes:
+        """Tömörített bináris alak az adatbázishoz"""
+        sentences = array('i', [-1] if self.sentences is None else
+                          [len(self.sentences)] + [offset for span in self.sentences for offset in span])
+        payload = sentences.tobytes() + self.title.to_bytes() + self.content.to_bytes()
+        return zlib.compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ResolutionLemmas':
+        """A to_bytes alak visszaolvasása"""
+        buffer = memoryview(zlib.decompress(data))
+        sentences = array('i')
+        sentences.frombytes(buffer[:sentences.itemsize])
+        offset = sentences.itemsize
+        spans = None
+        if sentences[0] >= 0:
+            offsets = array('i')
+            offsets.frombytes(buffer[offset:offset + 2 * sentences[0] * offsets.itemsize])
+            offset += 2 * sentences[0] * offsets.itemsize
+            spans = list(zip(offsets[::2], offsets[1::2]))
+        title, offset = LemmaPostings.from_bytes(buffer, offset)
+        content, offset = LemmaPostings.from_bytes(buffer, offset)
+        return cls(title, content, spans)
+
+
+class LemmaIndex:
+    """
+    Kormányhatározatonkénti lemma indexek tartós tárolása
+
+    A kulcs a kormányhatározat tartalmának ellenőrzőösszege (memo.content_hash)
+    és a lemmatizáló nyelvi modell verziója. Egy kormányhatározat így egyszer
+    megy át a spaCy lemmatizálón; a lemma módú kulcsszavak (lásd rules) ezután
+    az indexben keresendők, az új kulcsszavakkal való újrapontozáshoz nem kell
+    a nyelvi modell.
+    """
+
+    DB_FILE = "lemmas.db"
+    # Ennyi másodpercig vár egy másik folyamat (pl. batch worker) írási zárolására
+    BUSY_TIMEOUT = 30.0
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Inicializálja a lemma index tárat
+
+        Args:
+            base_dir: Alap könyvtár, ahol az adatbázist tárolja
+                     Ha nincs megadva, az aktuális munkakönyvtárat használja
+        """
+        self.base_dir = Path(base_dir) if base_dir else Path.cwd()
+        self.db_path = self.base_dir / self.DB_FILE
+
+        self.conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_database()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Az adatbázis kapcsolat lezárása"""
+        self.conn.close()
+
+    def _init_database(self):
+        """A tábla létrehozása, ha még nem létezik"""
+        with self.conn:
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS lemma_index (
+                content_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (content_hash, model)
+            ) WITHOUT ROWID
+            ''')
+
+    def get_many(self, content_hashes: Iterable[str], model: str) -> Dict[str, ResolutionLemmas]:
+        """
+        Tárolt indexek lekérdezése egyetlen lekérdezéssel
+
+        Args:
+            content_hashes: A kormányhatározatok content_hash értékei
+            model: A model_version eredménye
+
+        Returns:
+            content_hash -> lemma index
+        """
+        hashes = list(dict.fromkeys(content_hashes))
+        if not hashes:
+            return {}
+        rows = self.conn.execute(
+            "SELECT content_hash, data FROM lemma_index "
+            "WHERE model = ? AND content_hash IN (SELECT value FROM json_each(?))",
+            (model, json.dumps(hashes))
+        ).fetchall()
+        return {content: ResolutionLemmas.from_bytes(data) for content, data in rows}
+
+    def put_many(self, indexes: Dict[str, ResolutionLemmas], model: str) -> None:
+        """
+        Indexek mentése egyetlen tranzakcióban
+
+        Args:
+            indexes: content_hash -> lemma index
+            model: A model_version eredménye
+        """
+        if not indexes:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO lemma_index (content_hash, model, data) VALUES (?, ?, ?)",
+                [(content, model, lemmas.to_bytes()) for content, lemmas in indexes.items()]
+            )
+
+    def count(self) -> int:
+        """A tárolt indexek száma"""
+        return self.conn.execute("SELECT COUNT(*) FROM lemma_index").fetchone()[0]
@@ -0,0 +1,124 @@
+import re
+from functools import lru_cache
+
+
+def _split_atoms(keyword):
+    """
+    Kulcsszó felbontása regex atomokra (egy karakter vagy egy escape-elt karakter).
+    A kulcsszavak regex töredékként értelmeződnek, pl. a '.' bármilyen karakterre illeszkedik.
+    """
+    atoms = []
+    i = 0
+    while i < len(keyword):
+        if keyword[i] == '\\' and i + 1 < len(keyword):
+            atoms.append(keyword[i:i + 2])
+            i += 2
+        else:
+            atoms.append(keyword[i])
+            i += 1
+    return atoms
+
+
+def _trie_pattern(node):
+    """
+    Prefix-fa regex alternációvá alakítása.
+    Ha egy kulcsszó ebben a csúcsban véget ér, a hosszabb folytatások már nem
+    számítanak, mert a minta csak azt jelzi, hogy valamelyik kulcsszó kezdődik itt.
+    """
+    if None in node:
+        return ''
+    alternatives = [atom + _trie_pattern(child) for atom, child in sorted(node.items())]
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+class KeywordMatcher:
+    """
+    Több kulcsszó egyidejű keresése egyetlen, előre lefordított mintával.
+
+    Ugyanazt számolja, mint kulcsszavanként a
+    len(re.findall(r'\\b' + keyword + r'\\w*\\b', text)), de a szöveget csak
+    egyszer járja be: egy prefix-fából épített mintával megkeresi azokat a
+    szóhatárokat, ahol valamelyik kulcsszó kezdődhet, és csak ott ellenőrzi
+    az érintett kulcsszavakat.
+
+    A patterns megadásával kulcsszavanként más ellenőrző minta is használható
+    (pl. teljes szó illesztés, lásd rules.compile_term); ennek a kulcsszóval
+    kell kezdődnie, mert a szöveg bejárása a kulcsszavak elejét keresi.
+    """
+
+    def __init__(self, keywords, patterns=None):
+        self.keywords = list(keywords)
+        if patterns is None:
+            patterns = [keyword + r'\w*\b' for keyword in self.keywords]
+        self._patterns = [re.compile(pattern) for pattern in patterns]
+
+        # Kulcsszavak csoportosítása az első karakterük szerint
+        self._by_first_char = {}
+        self._wildcards = []
+        trie = {}
+        for index, keyword in enumerate(self.keywords):
+            atoms = _split_atoms(keyword)
+            first = atoms[0] if atoms else ''
+            if len(first) == 1 and first != '.':
+                self._by_first_char.setdefault(first, []).append(index)
+            else:
+                self._wildcards.append(index)
+
+            node = trie
+            for atom in atoms:
+                node = node.setdefault(atom, {})
+            node[None] = {}
+
+        self._candidates = {char: sorted(indices + self._wildcards)
+                            for char, indices in self._by_first_char.items()}
+        self._scanner = re.compile(r'\b(?=' + _trie_pattern(trie) + ')') if self.keywords else None
+
+    def count(self, text):
+        """
+        Kulcsszavankénti találatszám a (már kisbetűsített) szövegben,
+        a kulcsszavak sorrendjében.
+        """
+        counts = [0] * len(self.keywords)
+        if self._scanner is None:
+            return counts
+
+        # Kulcsszavanként az utolsó találat vége: a találatok nem fedhetik át egymást
+        last_end = [0] * len(self.keywords)
+        for candidate in self._scanner.finditer(text):
+            pos = candidate.start()
+            for index in self._candidates.get(text[pos], self._wildcards):
+                if pos < last_end[index]:
+                    continue
+                match = self._patterns[index].match(text, pos)
+                if match:
+                    counts[index] += 1
+                    last_end[index] = match.end()
+        return counts
+
+    def match_resolution(self, resolution):
+        """
+        Kulcsszó találatok egy kormányhatározat címében és tartalmában.
+        Csak a legalább egyszer előforduló kulcsszavakat adja vissza, a kulcsszavak sorrendjében.
+        """
+        title_counts = self.count(resolution['title'].lower())
+        content_counts = self.count(resolution['content'].lower())
+
+        keyword_matches = []
+        for keyword, title_count, content_count in zip(self.keywords, title_counts, content_counts):
+            if title_count > 0 or content_count > 0:
+                keyword_matches.append({
+                    'keyword': keyword,
+                    'title_count': title_count,
+                    'content_count': content_count
+                })
+        return keyword_matches
+
+
+@lru_cache(maxsize=32)
+def get_keyword_matcher(keywords):
+    """
+    Gyorsítótárazott illesztő egy kulcsszó listához (tuple-ként megadva).
+    """
+    return KeywordMatcher(keywords)
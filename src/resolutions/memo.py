@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(resolution: Dict) -> str:
+    """A kormányhatározat címének és tartalmának SHA-256 ellenőrzőösszege"""
+    digest = hashlib.sha256(resolution['title'].encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(resolution['content'].encode('utf-8'))
+    return digest.hexdigest()
+
+
+def settings_hash(keywords: Sequence[str], **settings) -> str:
+    """A kulcsszó lista és az elemzés egyéb beállításainak ellenőrzőösszege"""
+    payload = json.dumps({'keywords': list(keywords), **settings}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def model_version(model_name: str, sentencizer: bool = False) -> str:
+    """
+    A nyelvi modell azonosítója verzióval, a modell betöltése nélkül
+    (a telepített csomag metaadataiból).
+    """
+    package = 'spacy' if sentencizer else model_name
+    try:
+        version = metadata.version(package)
+    except metadata.PackageNotFoundError:
+        version = 'unknown'
+    return f"{'sentencizer' if sentencizer else model_name}-{version}"
+
+
+class AnalysisMemo:
+    """
+    Kormányhatározatonkénti elemzési eredmények tartós tárolása
+
+    A kulcs a kormányhatározat tartalmának, a kulcsszó listának (és az elemzés
+    beállításainak), valamint a nyelvi modell verziójának ellenőrzőösszege, így
+    az elemzés újrafuttatásakor csak az új vagy megváltozott kormányhatározatok
+    jutnak el a spaCy pipeline-ig. A különböző kulcsszó listákhoz (beállításokhoz)
+    tartozó eredmények egymás mellett megmaradnak; a tár méretét a legrégebben
+    használt eredmények törlése korlátozza, a teljes törlés kézi (invalidate,
+    gdspacypdf memo --clear).
+    """
+
+    DB_FILE = "analysis.db"
+    # A tárolt eredmények maximális száma; felette a legrégebben használtak törlődnek
+    MAX_ENTRIES = 200_000
+    # A párhuzamos batch workerek ugyanazt az adatbázist írják: ennyi másodpercig
+    # várnak a másik író tranzakciójának végére ("database is locked" helyett)
+    BUSY_TIMEOUT = 30.0
+
+    def __init__(self, base_dir: Optional[str] = None, max_entries: int = MAX_ENTRIES):
+        """
+        Inicializálja az elemzési eredmények tárát
+
+        Args:
+            base_dir: Alap könyvtár, ahol az adatbázist tárolja
+                     Ha nincs megadva, az aktuális munkakönyvtárat használja
+            max_entries: A tárolt eredmények maximális száma
+        """
+        self.base_dir = Path(base_dir) if base_dir else Path.cwd()
+        self.db_path = self.base_dir / self.DB_FILE
+        self.max_entries = max_entries
+
+        self.conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_database()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Az adatbázis kapcsolat lezárása"""
+        self.conn.close()
+
+    def _init_database(self):
+        """Táblák és indexek létrehozása, ha még nem léteznek"""
+        with self.conn:
+            self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS analysis_memo (
+                content_hash TEXT NOT NULL,
+                settings_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_used TEXT NOT NULL,
+                PRIMARY KEY (content_hash, settings_hash, model)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_analysis_memo_last_used ON analysis_memo (last_used);
+            ''')
+
+    def get_many(self, content_hashes: Iterable[str], settings: str, model: str) -> Dict[str, Dict]:
+        """
+        Tárolt eredmények lekérdezése egyetlen lekérdezéssel
+
+        Args:
+            content_hashes: A kormányhatározatok content_hash értékei
+            settings: A settings_hash eredménye
+            model: A model_version eredménye
+
+        Returns:
+            content_hash -> eredmény (relevance_score, keyword_matches, summary...)
+        """
+        hashes = list(dict.fromkeys(content_hashes))
+        if not hashes:
+            return {}
+        rows = self.conn.execute(
+            "SELECT content_hash, result FROM analysis_memo "
+            "WHERE settings_hash = ? AND model = ? AND content_hash IN (SELECT value FROM json_each(?))",
+            (settings, model, json.dumps(hashes))
+        ).fetchall()
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE analysis_memo SET last_used = ? WHERE content_hash = ? AND settings_hash = ? AND model = ?",
+                    [(datetime.now().isoformat(), content, settings, model) for content, _ in rows]
+                )
+        return {content: json.loads(result) for content, result in rows}
+
+    def put_many(self, results: Dict[str, Dict], settings: str, model: str) -> None:
+        """
+        Eredmények mentése egyetlen tranzakcióban, majd a legrégebben használtak
+        törlése, ha a tár túl nagy
+
+        Args:
+            results: content_hash -> eredmény
+            settings: A settings_hash eredménye
+            model: A model_version eredménye
+        """
+        if not results:
+            return
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO analysis_memo (content_hash, settings_hash, model, result, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(content, settings, model, json.dumps(result, ensure_ascii=False), now)
+                 for content, result in results.items()]
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """A max_entries feletti, legrégebben használt eredmények törlése"""
+        excess = self.count() - self.max_entries
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM analysis_memo WHERE (content_hash, settings_hash, model) IN ("
+                "SELECT content_hash, settings_hash, model FROM analysis_memo ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+        return excess
+
+    def invalidate(self, keep_settings: Optional[str] = None) -> int:
+        """
+        Tárolt eredmények törlése
+
+        Args:
+            keep_settings: Ha meg van adva, csak az ehhez a kulcsszó listához
+                           tartozó eredmények maradnak meg, különben minden törlődik
+
+        Returns:
+            A törölt eredmények száma
+        """
+        with self.conn:
+            if keep_settings is None:
+                return self.conn.execute("DELETE FROM analysis_memo").rowcount
+            return self.conn.execute("DELETE FROM analysis_memo WHERE settings_hash != ?",
+                                     (keep_settings,)).rowcount
+
+    def count(self) -> int:
+        """A tárolt eredmények száma"""
+        return self.conn.execute("SELECT COUNT(*) FROM analysis_memo").fetchone()[0]
@@ -0,0 +1,461 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .matcher import KeywordMatcher
+from .lemma_index import ResolutionLemmas, token_lemmas
+from .memo import model_version
+from ..pdf.cache import CACHE_DIR, CACHE_DIR_ENV
+
+logger = logging.getLogger(__name__)
+
+# Kulcsszó illesztési módok:
+#   prefix: a kulcsszó után a szó tetszőlegesen folytatódhat (a korábbi, kódba írt viselkedés)
+#   exact:  a kulcsszó teljes szóként (szavakként) illeszkedik
+#   lemma:  a kulcsszó szavai szótári alakra hozva, mindegyik szó ragozott alakjaira is illeszkedik
+MATCH_MODES = ('prefix', 'exact', 'lemma')
+DEFAULT_MATCH_MODE = 'prefix'
+# Alapértelmezett mezősúlyok: a címben való előfordulás kétszeres súlyt kap
+DEFAULT_WEIGHTS = {'title': 2, 'content': 1}
+# A beépített, önkormányzati vonatkozású szabálykészlet (ebből jön az analyzer.KEYWORDS is)
+DEFAULT_RULES_PATH = Path(__file__).parent / 'rules' / 'onkormanyzat.json'
+# A lefordított szabálykészletek alakjának verziója; ha változik, a lemezen tárolt példányok érvénytelenek
+COMPILED_VERSION = 2
+# A lefordított szabálykészletek alkönyvtára a gyorsítótár könyvtárában
+RULES_CACHE_DIR = "rules"
+
+_SUFFIX = ".pickle"
+
+
+class RuleTerm:
+    """Egy szabálykészlet egy lefordított kulcsszava"""
+
+    __slots__ = ('keyword', 'mode', 'weight', 'scan', 'pattern', 'lemmas')
+
+    def __init__(self, keyword: str, mode: str, weight: int, scan: str, pattern: str,
+                 lemmas: Optional[Tuple[str, ...]] = None):
+        """
+        Args:
+            keyword: A kulcsszó, ahogy a szabálykészletben szerepel (a találatok ezzel jelennek meg)
+            mode: Az illesztési mód (MATCH_MODES)
+            weight: A kulcsszó súlya
+            scan: A regex töredék, amellyel a kulcsszó kezdődik (a KeywordMatcher prefix-fájához)
+            pattern: A teljes illesztő minta
+            lemmas: Lemma módban a kulcsszó szavainak szótári alakja (a lemma indexhez)
+        """
+        self.keyword = keyword
+        self.mode = mode
+        self.weight = weight
+        self.scan = scan
+        self.pattern = pattern
+        self.lemmas = lemmas
+
+    def __repr__(self):
+        return f"RuleTerm({self.keyword!r}, {self.mode}, weight={self.weight})"
+
+
+def _check_int(value, what):
+    """Egész szám ellenőrzése a szabálykészlet beolvasásakor"""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{what}: egész szám kell, nem {value!r}")
+    return value
+
+
+def compile_term(spec, default_mode: str = DEFAULT_MATCH_MODE,
+                 lemmatize: Optional[Callable[[str], List[str]]] = None) -> RuleTerm:
+    """
+    Egy kulcsszó lefordítása
+
+    Args:
+        spec: A kulcsszó szövege, vagy {"term": ..., "match": ..., "weight": ...} szótár
+        default_mode: Az illesztési mód, ha a kulcsszónál nincs megadva
+        lemmatize: Szöveg -> szavainak szótári alakja; csak a lemma módhoz kell
+
+    Returns:
+        A lefordított kulcsszó
+    """
+    if isinstance(spec, str):
+        spec = {'term': spec}
+    keyword = spec.get('term')
+    if not isinstance(keyword, str) or not keyword.strip():
+        raise ValueError(f"Hiányzó vagy üres kulcsszó: {spec!r}")
+    mode = spec.get('match', default_mode)
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Ismeretlen illesztési mód: {mode} (lehetséges: {', '.join(MATCH_MODES)})")
+    weight = _check_int(spec.get('weight', 1), f"A(z) '{keyword}' kulcsszó súlya")
+
+    if mode == 'lemma':
+        if lemmatize is None:
+            raise ValueError(f"A(z) '{keyword}' kulcsszó lemma illesztéséhez szótári alakra hozó kell")
+        lemmas = [lemma for lemma in lemmatize(keyword) if lemma]
+        if not lemmas:
+            raise ValueError(f"A(z) '{keyword}' kulcsszónak nincs szótári alakja")
+        # Minden szó a szótári alakjával kezdődik, utána a ragok, toldalékok következnek
+        scan = re.escape(lemmas[0])
+        pattern = r'\s+'.join(re.escape(lemma) + r'\w*' for lemma in lemmas) + r'\b'
+        lemmas = tuple(lemmas)
+    elif mode == 'exact':
+        scan, pattern, lemmas = keyword, keyword + r'\b', None
+    else:
+        scan, pattern, lemmas = keyword, keyword + r'\w*\b', None
+    re.compile(pattern)
+    return RuleTerm(keyword, mode, weight, scan, pattern, lemmas)
+
+
+class RuleSet:
+    """
+    Egy lefordított szabálykészlet: pozitív és negatív kulcsszavak, mezősúlyok
+
+    A pontszám kulcsszavanként súly * (címbeli találatok * cím súly + tartalombeli
+    találatok * tartalom súly). Ha valamelyik negatív kulcsszó előfordul, a
+    kormányhatározat ebben a szabálykészletben nem releváns.
+    """
+
+    def __init__(self, name: str, terms: Sequence[RuleTerm], negatives: Sequence[RuleTerm] = (),
+                 title_weight: int = DEFAULT_WEIGHTS['title'],
+                 content_weight: int = DEFAULT_WEIGHTS['content'], min_score: int = 1):
+        """
+        Args:
+            name: A szabálykészlet neve (pl. ügyfél azonosító)
+            terms: A pozitív kulcsszavak
+            negatives: A negatív (kizáró) kulcsszavak
+            title_weight: A címbeli találatok súlya
+            content_weight: A tartalombeli találatok súlya
+            min_score: A relevanciához szükséges legkisebb pontszám
+        """
+        if not terms:
+            raise ValueError(f"A(z) '{name}' szabálykészletben nincs kulcsszó")
+        self.name = name
+        self.terms = list(terms)
+        self.negatives = list(negatives)
+        self.title_weight = title_weight
+        self.content_weight = content_weight
+        self.min_score = min_score
+
+    @classmethod
+    def from_dict(cls, data: Dict, default_name: str,
+                  lemmatize: Optional[Callable[[str], List[str]]] = None) -> 'RuleSet':
+        """
+        Szabálykészlet a fájlformátum szerinti szótárból
+
+        {
+            "name": "onkormanyzat",
+            "match": "prefix",
+            "weights": {"title": 2, "content": 1},
+            "min_score": 1,
+            "keywords": ["helyi önkormányzat", {"term": "iparűzési adó", "weight": 3},
+                         {"term": "önkormányzatok adósságot keletkeztető", "match": "lemma"}],
+            "negative": [{"term": "választás", "match": "lemma"}]
+        }
+
+        Csak a "keywords" kötelező. A kulcsszavak kisbetűs regex töredékek (mint
+        eddig a KEYWORDS), a lemma módú kulcsszavak szövegként értelmeződnek.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"A szabálykészlet JSON objektum kell, nem {type(data).__name__}")
+        unknown = set(data) - {'name', 'description', 'match', 'weights', 'min_score', 'keywords', 'negative'}
+        if unknown:
+            raise ValueError(f"Ismeretlen mezők a szabálykészletben: {', '.join(sorted(unknown))}")
+        name = data.get('name', default_name)
+        mode = data.get('match', DEFAULT_MATCH_MODE)
+        weights = {**DEFAULT_WEIGHTS, **data.get('weights', {})}
+        if set(weights) != set(DEFAULT_WEIGHTS):
+            raise ValueError(f"Ismeretlen mezősúly: {', '.join(sorted(set(weights) - set(DEFAULT_WEIGHTS)))}")
+        min_score = _check_int(data.get('min_score', 1), f"A(z) '{name}' min_score értéke")
+        if min_score < 1:
+            raise ValueError(f"A(z) '{name}' min_score értéke legalább 1 kell legyen")
+        return cls(
+            name,
+            [compile_term(spec, mode, lemmatize) for spec in data.get('keywords', [])],
+            [compile_term(spec, mode, lemmatize) for spec in data.get('negative', [])],
+            title_weight=_check_int(weights['title'], f"A(z) '{name}' cím súlya"),
+            content_weight=_check_int(weights['content'], f"A(z) '{name}' tartalom súlya"),
+            min_score=min_score,
+        )
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str], name: str = 'keywords') -> 'RuleSet':
+        """Szabálykészlet egy egyszerű kulcsszó listából, az alapértelmezett súlyokkal"""
+        return cls(name, [compile_term(keyword) for keyword in keywords])
+
+    @property
+    def keywords(self) -> List[str]:
+        """A pozitív kulcsszavak"""
+        return [term.keyword for term in self.terms]
+
+    def to_dict(self) -> Dict:
+        """A lefordított szabálykészlet JSON-ba írható leírása (az ellenőrzőösszeghez)"""
+        return {
+            'name': self.name,
+            'weights': {'title': self.title_weight, 'content': self.content_weight},
+            'min_score': self.min_score,
+            'keywords': [[term.keyword, term.pattern, term.weight] for term in self.terms],
+            'negative': [[term.keyword, term.pattern] for term in self.negatives],
+        }
+
+    def __repr__(self):
+        return f"RuleSet({self.name!r}, {len(self.terms)} kulcsszó, {len(self.negatives)} negatív)"
+
+
+class RuleEngine:
+    """
+    Több szabálykészlet egyidejű kiértékelése
+
+    Az összes szabálykészlet (pozitív és negatív) kulcsszavai egyetlen
+    KeywordMatcher-be kerülnek (az azonos minták egyszer), így egy
+    kormányhatározat címét és tartalmát egyszer kell bejárni, a
+    szabálykészletenkénti pontszámok a közös találatszámokból adódnak.
+    A lemma módú kulcsszavak külön illesztőbe kerülnek: ha a kormányhatározatnak
+    van lemma indexe (lásd LemmaIndex), ezeket a regex illesztés helyett az
+    indexben keresi, különben a szótári alakkal kezdődő szavakra illeszt.
+    """
+
+    def __init__(self, rule_sets: Sequence[RuleSet]):
+        """
+        Args:
+            rule_sets: A szabálykészletek (a nevük egyedi kell legyen)
+        """
+        self.rule_sets = list(rule_sets)
+        names = [rule_set.name for rule_set in self.rule_sets]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Ismétlődő szabálykészlet nevek: {', '.join(duplicates)}")
+
+        # (kezdő töredék, minta, szótári alakok) -> a közös találatszám lista sorszáma; a
+        # szótári alak miatt az azonos mintájú lemma és regex kulcsszavak külön számolódnak
+        indices = {}
+        terms_by_index = {}
+        self._plans = []
+        for rule_set in self.rule_sets:
+            terms = []
+            for term in rule_set.terms:
+                index = indices.setdefault((term.scan, term.pattern, term.lemmas), len(indices))
+                terms_by_index[index] = term
+                terms.append((index, term))
+            negatives = []
+            for term in rule_set.negatives:
+                index = indices.setdefault((term.scan, term.pattern, term.lemmas), len(indices))
+                terms_by_index[index] = term
+                negatives.append(index)
+            self._plans.append((rule_set, terms, negatives))
+        self._size = len(indices)
+
+        keys = list(indices)
+        self._regex_indices = [index for index in range(self._size) if terms_by_index[index].lemmas is None]
+        self._lemma_indices = [index for index in range(self._size) if terms_by_index[index].lemmas is not None]
+        self._lemma_phrases = [terms_by_index[index].lemmas for index in self._lemma_indices]
+        self.matcher = KeywordMatcher([keys[index][0] for index in self._regex_indices],
+                                      [keys[index][1] for index in self._regex_indices])
+        self.stem_matcher = KeywordMatcher([keys[index][0] for index in self._lemma_indices],
+                                           [keys[index][1] for index in self._lemma_indices])
+
+        # A pozitív kulcsszavak ismétlődés nélkül (pl. a szemantikus pontozáshoz)
+        self.keywords = tuple(dict.fromkeys(keyword for rule_set in self.rule_sets
+                                            for keyword in rule_set.keywords))
+        payload = json.dumps([rule_set.to_dict() for rule_set in self.rule_sets],
+                             ensure_ascii=False, sort_keys=True)
+        self.fingerprint = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @property
+    def names(self) -> List[str]:
+        """A szabálykészletek nevei"""
+        return [rule_set.name for rule_set in self.rule_sets]
+
+    @property
+    def uses_lemmas(self) -> bool:
+        """Van-e lemma módú kulcsszó (csak ekkor van haszna a lemma indexnek)"""
+        return bool(self._lemma_indices)
+
+    def _count(self, text: str, postings=None) -> List[int]:
+        """Kulcsszavankénti találatszámok egy (kisbetűsített) szövegben"""
+        if not self._lemma_indices:
+            return self.matcher.count(text)
+        counts = [0] * self._size
+        for index, count in zip(self._regex_indices, self.matcher.count(text)):
+            counts[index] = count
+        if postings is not None:
+            lemma_counts = [postings.count(lemmas) for lemmas in self._lemma_phrases]
+        else:
+            lemma_counts = self.stem_matcher.count(text)
+        for index, count in zip(self._lemma_indices, lemma_counts):
+            counts[index] = count
+        return counts
+
+    def score(self, resolution, lemmas: Optional[ResolutionLemmas] = None) -> Dict[str, Dict]:
+        """
+        Egy kormányhatározat pontozása az összes szabálykészlet szerint
+
+        Args:
+            resolution: A kormányhatározat (title és content mezőkkel)
+            lemmas: A kormányhatározat lemma indexe; ha meg van adva, a lemma
+                    módú kulcsszavak találatai ebből jönnek
+
+        Returns:
+            Szabálykészlet neve -> {'relevance_score', 'keyword_matches'}, csak
+            azokra a szabálykészletekre, amelyek szerint a kormányhatározat releváns
+        """
+        title_counts = self._count(resolution['title'].lower(), lemmas and lemmas.title)
+        content_counts = self._count(resolution['content'].lower(), lemmas and lemmas.content)
+
+        scores = {}
+        for rule_set, terms, negatives in self._plans:
+            if any(title_counts[index] or content_counts[index] for index in negatives):
+                continue
+            relevance_score = 0
+            keyword_matches = []
+            for index, term in terms:
+                title_count, content_count = title_counts[index], content_counts[index]
+                if title_count > 0 or content_count > 0:
+                    relevance_score += term.weight * (title_count * rule_set.title_weight
+                                                      + content_count * rule_set.content_weight)
+                    keyword_matches.append({
+                        'keyword': term.keyword,
+                        'title_count': title_count,
+                        'content_count': content_count
+                    })
+            if keyword_matches and relevance_score >= rule_set.min_score:
+                scores[rule_set.name] = {'relevance_score': relevance_score,
+                                         'keyword_matches': keyword_matches}
+        return scores
+
+    def __repr__(self):
+        return f"RuleEngine({', '.join(self.names)})"
+
+
+def _model_lemmatizer(model_name: Optional[str]) -> Callable[[str], List[str]]:
+    """Szótári alakra hozás a huspacy modellel (a modell csak az első lemma kulcsszónál töltődik be)"""
+    def lemmatize(text):
+        from .analyzer import get_nlp
+        return token_lemmas(get_nlp(model_name)(text))
+    return lemmatize
+
+
+def parse_rule_file(path: str, lemmatize: Optional[Callable[[str], List[str]]] = None) -> List[RuleSet]:
+    """
+    Egy szabálykészlet fájl (JSON) beolvasása és lefordítása gyorsítótár nélkül
+
+    A fájl egy szabálykészlet objektum vagy ezek listája (lásd RuleSet.from_dict).
+    A név alapértelmezése a fájl neve (listánál sorszámmal kiegészítve).
+    """
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Hibás szabálykészlet fájl: {path}: {e}")
+    if isinstance(data, list):
+        return [RuleSet.from_dict(item, f"{path.stem}-{index}", lemmatize)
+                for index, item in enumerate(data, 1)]
+    return [RuleSet.from_dict(data, path.stem, lemmatize)]
+
+
+def _cache_dir(cache_dir: Optional[str]) -> Path:
+    """A lefordított szabálykészletek könyvtára (alapértelmezés: a szövegkinyerés gyorsítótára mellett)"""
+    if cache_dir:
+        return Path(cache_dir)
+    return Path(os.environ.get(CACHE_DIR_ENV) or Path.cwd() / CACHE_DIR) / RULES_CACHE_DIR
+
+
+# Fájl útvonala -> ((módosítás ideje, méret, modell), szabálykészletek)
+_loaded = {}
+
+
+def load_rule_sets(path: str, model_name: Optional[str] = None,
+                   cache_dir: Optional[str] = None) -> List[RuleSet]:
+    """
+    Egy szabálykészlet fájl lefordított szabálykészletei, kétszintű gyorsítótárral
+
+    Amíg a fájl módosítási ideje és mérete nem változik, a memóriában tárolt
+    példányt adja vissza. Különben a fájl tartalmának ellenőrzőösszegével a
+    lemezen keres lefordított példányt, és csak ha ott sincs, fordít (a lemma
+    módú kulcsszavakhoz ekkor töltődik be a nyelvi modell).
+
+    Args:
+        path: A szabálykészlet fájl (JSON)
+        model_name: A lemma illesztéshez használt huspacy modell neve
+        cache_dir: A lefordított szabálykészletek könyvtára (alapértelmezés:
+                   cache/rules, illetve $GDSPACYPDF_CACHE_DIR/rules)
+
+    Returns:
+        A fájl szabálykészletei
+    """
+    from .analyzer import _model_name
+    path = Path(path).resolve()
+    stat = path.stat()
+    model = model_version(_model_name(model_name))
+    stamp = (stat.st_mtime_ns, stat.st_size, model)
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+
+    data = path.read_bytes()
+    digest = hashlib.sha256(data)
+    digest.update(f"\0{COMPILED_VERSION}\0{model}".encode('utf-8'))
+    entry = _cache_dir(cache_dir) / f"{digest.hexdigest()}{_SUFFIX}"
+
+    rule_sets = None
+    if entry.exists():
+        try:
+            with open(entry, 'rb') as f:
+                rule_sets = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Sérült lefordított szabálykészlet, újrafordítás: {entry.name} ({e})")
+    if rule_sets is None:
+        rule_sets = parse_rule_file(path, _model_lemmatizer(model_name))
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(rule_sets, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry)
+
+    if loaded is not None:
+        logger.info(f"Szabálykészlet újratöltve: {path}")
+    _loaded[path] = (stamp, rule_sets)
+    return rule_sets
+
+
+# Fájlok listája -> (szabálykészlet listák, motor)
+_engines = {}
+
+
+def load_rule_engine(paths: Sequence[str], model_name: Optional[str] = None,
+                     cache_dir: Optional[str] = None) -> RuleEngine:
+    """
+    Az összes megadott fájl szabálykészleteit egyszerre kiértékelő motor
+
+    Minden hívás ellenőrzi, változtak-e a fájlok; ha nem, ugyanazt a motort adja
+    vissza, ha igen, csak a megváltozott fájlok fordítódnak újra. Így egy
+    hosszan futó folyamat (pl. daemon) újraindítás nélkül átveszi a módosított
+    szabálykészleteket.
+    """
+    key = tuple(str(Path(path).resolve()) for path in paths)
+    rule_set_lists = [load_rule_sets(path, model_name, cache_dir) for path in key]
+    cached = _engines.get(key)
+    if cached is not None and len(cached[0]) == len(rule_set_lists) and \
+            all(old is new for old, new in zip(cached[0], rule_set_lists)):
+        return cached[1]
+    engine = RuleEngine([rule_set for rule_sets in rule_set_lists for rule_set in rule_sets])
+    _engines[key] = (rule_set_lists, engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def default_rule_set() -> RuleSet:
+    """A beépített szabálykészlet (DEFAULT_RULES_PATH); csak prefix és exact kulcsszavakat tartalmazhat"""
+    return parse_rule_file(DEFAULT_RULES_PATH)[0]
+
+
+@lru_cache(maxsize=32)
+def get_rule_engine(keywords: Optional[tuple] = None) -> RuleEngine:
+    """
+    Gyorsítótárazott motor egy kulcsszó listához (tuple-ként megadva), az
+    alapértelmezett súlyokkal; None esetén a beépített szabálykészlethez
+    """
+    if keywords is None:
+        return RuleEngine([default_rule_set()])
+    return RuleEngine([RuleSet.from_keywords(keywords)])
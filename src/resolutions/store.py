@@ -0,0 +1,187 @@
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class ResolutionStore:
+    """Kormányhatározatok tartós tárolása és teljes szöveges keresése (SQLite FTS5)"""
+
+    DB_FILE = "resolutions.db"
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Inicializálja a kormányhatározat tárat
+
+        Args:
+            base_dir: Alap könyvtár, ahol az adatbázist tárolja (a gazettes.db mellett)
+                     Ha nincs megadva, az aktuális munkakönyvtárat használja
+        """
+        self.base_dir = Path(base_dir) if base_dir else Path.cwd()
+        self.db_path = self.base_dir / self.DB_FILE
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_database()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Az adatbázis kapcsolat lezárása"""
+        self.conn.close()
+
+    def _init_database(self):
+        """Táblák, indexek és a teljes szöveges index létrehozása, ha még nem léteznek"""
+        with self.conn:
+            self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS resolutions (
+                id INTEGER PRIMARY KEY,
+                number TEXT NOT NULL,
+                year TEXT NOT NULL,
+                month INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                source TEXT,
+                ingest_date TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (year, number)
+            );
+            CREATE INDEX IF NOT EXISTS idx_resolutions_date ON resolutions (date);
+
+            -- Teljes szöveges index a címre és a tartalomra; a magyar ékezeteket megtartja
+            CREATE VIRTUAL TABLE IF NOT EXISTS resolutions_fts USING fts5(
+                title, content,
+                content='resolutions', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 0'
+            );
+
+            -- Az index szinkronban tartása a táblával
+            CREATE TRIGGER IF NOT EXISTS resolutions_ai AFTER INSERT ON resolutions BEGIN
+                INSERT INTO resolutions_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS resolutions_ad AFTER DELETE ON resolutions BEGIN
+                INSERT INTO resolutions_fts (resolutions_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS resolutions_au AFTER UPDATE ON resolutions BEGIN
+                INSERT INTO resolutions_fts (resolutions_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO resolutions_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+            END;
+            ''')
+
+    def add_resolutions(self, resolutions: Iterable[Dict], source: Optional[str] = None) -> int:
+        """
+        Kormányhatározatok mentése egyetlen tranzakcióban
+
+        A már tárolt (azonos évű és számú) kormányhatározatok felülíródnak.
+
+        Args:
+            resolutions: Az extract_resolutions által adott kormányhatározatok
+                         (szótárak vagy ResolutionBatch)
+            source: A forrás PDF fájl útvonala
+
+        Returns:
+            A mentett kormányhatározatok száma
+        """
+        rows = [
+            (r['number'], r['year'], r['month'], r['day'], r['date'].isoformat(),
+             r['title'], r['content'], source)
+            for r in resolutions
+        ]
+        with self.conn:
+            self.conn.executemany('''
+            INSERT INTO resolutions (number, year, month, day, date, title, content, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (year, number) DO UPDATE SET
+                month = excluded.month, day = excluded.day, date = excluded.date,
+                title = excluded.title, content = excluded.content, source = excluded.source,
+                ingest_date = CURRENT_TIMESTAMP
+            ''', rows)
+        return len(rows)
+
+    def delete_source(self, source: str) -> int:
+        """
+        Egy forrás PDF összes kormányhatározatának törlése (pl. a fájl megváltozásakor)
+
+        Args:
+            source: A forrás PDF fájl útvonala, ahogy az add_resolutions kapta
+
+        Returns:
+            A törölt kormányhatározatok száma
+        """
+        with self.conn:
+            return self.conn.execute("DELETE FROM resolutions WHERE source = ?", (source,)).rowcount
+
+    def search(self, query: Optional[str] = None, since: Optional[date] = None,
+               until: Optional[date] = None, year: Optional[str] = None,
+               limit: Optional[int] = 50) -> List[Dict]:
+        """
+        Kormányhatározatok keresése
+
+        Args:
+            query: FTS5 keresőkifejezés a címben és a tartalomban, pl. '"iparűzési adó"'
+                   vagy 'önkormányzat*'; ha nincs megadva, csak a többi feltétel szűr
+            since: Legkorábbi dátum (beleértve)
+            until: Legkésőbbi dátum (beleértve)
+            year: A kormányhatározat éve
+            limit: A találatok maximális száma, None esetén mind
+
+        Returns:
+            A találatok dátum szerint csökkenő sorrendben, az extract_resolutions
+            szótáraival azonos mezőkkel, kiegészítve a source és a snippet mezővel
+        """
+        conditions = []
+        params = []
+        if query:
+            # Rövid, kiemelt részlet a tartalom illeszkedő részéből
+            sql = ("SELECT r.number, r.year, r.month, r.day, r.date, r.title, r.content, r.source, "
+                   "snippet(resolutions_fts, 1, '[', ']', '…', 12) "
+                   "FROM resolutions_fts JOIN resolutions r ON r.id = resolutions_fts.rowid")
+            conditions.append("resolutions_fts MATCH ?")
+            params.append(query)
+        else:
+            sql = ("SELECT r.number, r.year, r.month, r.day, r.date, r.title, r.content, r.source, NULL "
+                   "FROM resolutions r")
+        if since:
+            conditions.append("r.date >= ?")
+            params.append(since.isoformat())
+        if until:
+            conditions.append("r.date <= ?")
+            params.append(until.isoformat())
+        if year:
+            conditions.append("r.year = ?")
+            params.append(str(year))
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY r.date DESC, r.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            {
+                'number': number,
+                'year': year,
+                'month': month,
+                'day': day,
+                'date': date.fromisoformat(date_text),
+                'title': title,
+                'content': content,
+                'source': source,
+                'snippet': snippet,
+            }
+            for number, year, month, day, date_text, title, content, source, snippet
+            in self.conn.execute(sql, params)
+        ]
+
+    def count(self) -> int:
+        """A tárolt kormányhatározatok száma"""
+        return self.conn.execute("SELECT COUNT(*) FROM resolutions").fetchone()[0]
@@ -0,0 +1,24 @@
+import json
+import os
+
+from src.pipeline import batch
+
+
+def _crash_on_first(pdf_path, *args):
+    """A worker folyamat azonnali leállása (mint pl. memóriahiány esetén)"""
+    if pdf_path.endswith('first.pdf'):
+        os._exit(1)
+    return batch.process_file(pdf_path, *args)
+
+
+def test_killed_worker_is_recorded_as_failed(tmp_path, monkeypatch):
+    pdf_paths = [str(tmp_path / 'first.pdf'), str(tmp_path / 'second.pdf')]
+    output_path = tmp_path / 'results.jsonl'
+    monkeypatch.setattr(batch, 'process_file', _crash_on_first)
+
+    total, failed = batch.run_batch(pdf_paths, str(output_path), workers=1)
+
+    results = [json.loads(line) for line in output_path.read_text(encoding='utf-8').splitlines()]
+    assert total == 2 and failed == 2
+    assert sorted(result['source'] for result in results) == sorted(pdf_paths)
+    assert all(result['error'] for result in results)
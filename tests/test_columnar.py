@@ -0,0 +1,39 @@
+import pickle
+from datetime import date
+
+from src.resolutions.columnar import ResolutionBatch
+from src.resolutions.memo import content_hash
+
+
+def _resolution(number, title="A Kormány határozata", content="Tartalom ő ű"):
+    return {'number': number, 'year': '2025', 'month': 5, 'day': 14,
+            'date': date(2025, 5, 14), 'title': title, 'content': content}
+
+
+def test_numbers_are_kept_as_text():
+    numbers = ['1', '0042', '99999999999999999999999', '1a']
+    batch = ResolutionBatch.from_dicts(_resolution(number) for number in numbers)
+
+    assert [record['number'] for record in batch] == numbers
+
+
+def test_records_match_dicts():
+    resolutions = [_resolution('1001', "Cím", "Első tartalom"), _resolution('1002', "", "")]
+    batch = ResolutionBatch.from_dicts(resolutions)
+
+    assert len(batch) == 2
+    assert batch.to_dicts() == resolutions
+    assert batch[-1]['title'] == ""
+
+
+def test_content_hashes_match_memo():
+    resolutions = [_resolution(str(number), f"Cím {number}", "tartalom " * number) for number in range(5)]
+    batch = ResolutionBatch.from_dicts(resolutions)
+
+    assert batch.content_hashes() == [content_hash(resolution) for resolution in resolutions]
+
+
+def test_pickle_round_trip():
+    batch = ResolutionBatch.from_dicts([_resolution('007')])
+
+    assert pickle.loads(pickle.dumps(batch)).to_dicts() == batch.to_dicts()
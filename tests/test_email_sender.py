@@ -0,0 +1,160 @@
+import email
+import socketserver
+import threading
+
+import pytest
+
+from src.notification.email_sender import EmailSender, SmtpSettings
+
+RECIPIENTS = ['a@example.com', 'b@example.com', 'c@example.com']
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Minimális SMTP szerver (EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT) a tesztekhez"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 localhost ESMTP")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline().decode('utf-8').rstrip("\r\n")
+            if not line:
+                return
+            command = line.split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self.reply("250 localhost")
+            elif command == 'MAIL':
+                sender, recipients = line.split(':', 1)[1].strip(' <>'), []
+                self.reply("250 OK")
+            elif command == 'RCPT':
+                recipient = line.split(':', 1)[1].strip(' <>')
+                if recipient in server.refuse:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(recipient)
+                    self.reply("250 OK")
+            elif command == 'DATA':
+                if server.drop_on_data:
+                    # A kapcsolat megszakad, mielőtt a szerver elfogadná az üzenetet
+                    server.drop_on_data -= 1
+                    return
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data[1:] if data.startswith(b"..") else data)
+                server.messages.append((sender, recipients, email.message_from_bytes(b"".join(lines))))
+                self.reply("250 Accepted")
+            elif command in ('NOOP', 'RSET'):
+                self.reply("250 OK")
+            elif command == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SmtpHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    server.refuse = set()
+    server.drop_on_data = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sender(smtp_server):
+    settings = SmtpSettings('127.0.0.1', smtp_server.server_address[1], sender='kozlony@example.com',
+                            recipients=list(RECIPIENTS), timeout=5)
+    with EmailSender(settings) as sender:
+        yield sender
+
+
+def _gazette(title):
+    return {'title': title, 'relevant_resolutions': []}
+
+
+def test_send_delivers_one_message_to_all_recipients(smtp_server, sender):
+    assert sender.send([_gazette('Magyar Közlöny 2025. évi 1. szám')]) == len(RECIPIENTS)
+
+    assert len(smtp_server.messages) == 1
+    mail_from, recipients, message = smtp_server.messages[0]
+    assert mail_from == 'kozlony@example.com'
+    assert recipients == RECIPIENTS
+    # A címzettek egymás címét nem látják
+    assert not any(address in message['To'] for address in RECIPIENTS)
+
+
+def test_send_reuses_connection(smtp_server, sender):
+    sender.send([_gazette('1. szám')])
+    sender.send([_gazette('2. szám')])
+
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 2
+
+
+def test_send_retries_on_disconnect_without_duplicates(smtp_server, sender):
+    smtp_server.drop_on_data = 1
+
+    assert sender.send([_gazette('1. szám')]) == len(RECIPIENTS)
+
+    assert smtp_server.connections == 2
+    delivered = [recipient for _, recipients, _ in smtp_server.messages for recipient in recipients]
+    assert sorted(delivered) == sorted(RECIPIENTS)
+
+
+def test_failed_send_retried_later_sends_each_recipient_once(smtp_server, sender):
+    smtp_server.drop_on_data = 2
+    sender.queue('1. szám', [], key=1)
+
+    with pytest.raises(Exception):
+        sender.flush(force=True)
+    assert smtp_server.messages == []
+
+    # Az incremental pipeline a hiba után eldobja, majd később újra sorba állítja
+    assert sender.discard() == [1]
+    sender.queue('1. szám', [], key=1)
+    assert sender.flush(force=True) == [1]
+    delivered = [recipient for _, recipients, _ in smtp_server.messages for recipient in recipients]
+    assert sorted(delivered) == sorted(RECIPIENTS)
+
+
+def test_refused_recipient_does_not_block_others(smtp_server, sender):
+    smtp_server.refuse = {'b@example.com'}
+
+    assert sender.send([_gazette('1. szám')]) == len(RECIPIENTS) - 1
+    assert smtp_server.messages[0][1] == ['a@example.com', 'c@example.com']
+
+
+def test_digest_sends_queued_gazettes_in_one_message(smtp_server, sender):
+    sender.queue('Magyar Közlöny 1. szám', [], key=1)
+    sender.queue('Magyar Közlöny 2. szám', [], key=2)
+
+    assert sender.flush(force=True) == [1, 2]
+    assert sender.pending_count == 0
+    assert len(smtp_server.messages) == 1
+    body = smtp_server.messages[0][2].get_payload(decode=True).decode('utf-8')
+    assert '1. szám' in body and '2. szám' in body
+
+
+def test_send_without_sender_address_is_rejected(smtp_server):
+    settings = SmtpSettings('127.0.0.1', smtp_server.server_address[1], recipients=list(RECIPIENTS), timeout=5)
+    with EmailSender(settings) as sender:
+        with pytest.raises(ValueError, match='SENDER_EMAIL'):
+            sender.send([_gazette('1. szám')])
+
+    assert smtp_server.connections == 0
+    assert smtp_server.messages == []
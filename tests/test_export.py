@@ -0,0 +1,59 @@
+import json
+from datetime import date
+
+import pytest
+
+from src.export import ResultExporter
+
+
+def _resolutions(count, months):
+    """count darab kormányhatározat, egyenletesen elosztva months különböző hónapra"""
+    for index in range(count):
+        year, month = 2000 + index % months // 12, index % months % 12 + 1
+        yield {
+            'number': f"{index + 1}/{year}",
+            'year': str(year),
+            'month': month,
+            'day': 1,
+            'date': date(year, month, 1),
+            'title': f"A Kormány {index + 1}/{year}. (V. 1.) Korm. határozata",
+            'content': "tartalom " * 10,
+        }
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for part in sorted(path.rglob('part-*.jsonl')) for line in part.open(encoding='utf-8')]
+
+
+def test_many_small_partitions_flush_before_close(tmp_path):
+    exporter = ResultExporter(tmp_path, format='jsonl', max_buffered_rows=100)
+    exporter.write_gazette(_resolutions(2000, months=240))
+
+    # Egyik partíció sem éri el a row_group_size-t, a közös korlát mégis kiíratja őket
+    assert exporter.rows_written >= 1900
+    assert sum(len(buffer) for buffer in exporter._buffers.values()) <= 100
+
+    exporter.close()
+    rows = _read_jsonl(tmp_path)
+    assert len(rows) == 2000
+    assert len({row['number'] for row in rows}) == 2000
+    assert len(list(tmp_path.glob('year=*/month=*'))) == 240
+
+
+def test_partition_buffer_flushes_at_row_group_size(tmp_path):
+    with ResultExporter(tmp_path, format='jsonl', row_group_size=10) as exporter:
+        exporter.write_gazette(_resolutions(25, months=1))
+        assert exporter.rows_written == 20
+        # Írás közben csak a rejtett, félkész fájl létezik
+        assert not list(tmp_path.rglob('part-*.jsonl'))
+    assert len(_read_jsonl(tmp_path)) == 25
+
+
+def test_parquet_small_partitions(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    with ResultExporter(tmp_path, format='parquet', max_buffered_rows=50) as exporter:
+        exporter.write_gazette(_resolutions(600, months=24))
+        assert exporter.rows_written >= 550
+
+    table = pq.read_table(tmp_path)
+    assert table.num_rows == 600
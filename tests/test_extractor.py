@@ -0,0 +1,31 @@
+import pytest
+
+from src.resolutions.extractor import extract_resolutions
+
+TEXTS = [
+    "Semmi érdekes itt. " * 40 + "A Kormány döntött. " * 5,
+    "Bevezető szöveg. Kormány 1234/2025. V. 14. Korm. határozata valami " * 3 + "vége " * 100,
+    "A Kormány 1234/2025. (V. 14.) Korm. határozata a helyi önkormányzatokról " * 4,
+]
+
+
+def _pages(text, size):
+    return [{'text': text[start:start + size]} for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('text', TEXTS)
+@pytest.mark.parametrize('page_size', [7, 37, 1000])
+def test_streaming_diagnostics_match_full_text(text, page_size, capsys):
+    expected = extract_resolutions(text)
+    expected_output = capsys.readouterr().out
+
+    assert extract_resolutions(_pages(text, page_size)) == expected
+    assert capsys.readouterr().out == expected_output
+
+
+def test_streaming_warns_when_no_resolution_found(capsys):
+    extract_resolutions(_pages(TEXTS[0], 50))
+
+    output = capsys.readouterr().out
+    assert "FIGYELMEZTETÉS: A PDF szöveg nem tartalmaz 'Korm. határozata' kifejezést!" in output
+    assert "Egyszerűbb mintával találatok száma: 0" in output
@@ -0,0 +1,119 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.fetching.fetch_gazette import GazetteFetcher
+
+CONTENT = bytes(range(256)) * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """A server.responses listából sorban veszi a válaszok leírását"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('Range'))
+        kind = self.server.responses.pop(0) if self.server.responses else 'ok'
+
+        if isinstance(kind, int):
+            self.send_response(kind)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        offset = 0
+        status = 200
+        range_header = self.headers.get('Range')
+        if range_header and kind != 'ignore-range':
+            offset = int(range_header.split('=')[1].rstrip('-'))
+            status = 206
+        body = CONTENT[offset:]
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {offset}-{len(CONTENT) - 1}/{len(CONTENT)}")
+        self.end_headers()
+        if kind == 'drop':
+            # A törzs felének elküldése után a kapcsolat megszakad
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.requests = []
+    httpd.responses = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    with GazetteFetcher(str(tmp_path)) as fetcher:
+        fetcher.BACKOFF = 0
+        yield fetcher
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_port}/kozlony.pdf"
+
+
+def test_download_resumes_with_range_after_dropped_connection(server, fetcher, tmp_path):
+    server.responses = ['drop', 'ok']
+    target = tmp_path / 'kozlony.pdf'
+
+    fetcher._download_file(_url(server), target)
+
+    assert target.read_bytes() == CONTENT
+    assert server.requests[0] is None
+    assert server.requests[1] == f"bytes={len(CONTENT) // 2}-"
+    assert not list(fetcher.download_path.glob('*.part'))
+
+
+@pytest.mark.parametrize('status', [500, 503, 429])
+def test_download_retries_server_errors_and_throttling(server, fetcher, tmp_path, status):
+    server.responses = [status, status, 'ok']
+    target = tmp_path / 'kozlony.pdf'
+
+    fetcher._download_file(_url(server), target)
+
+    assert target.read_bytes() == CONTENT
+    assert len(server.requests) == 3
+
+
+def test_download_gives_up_after_max_retries(server, fetcher, tmp_path):
+    server.responses = [503] * (fetcher.MAX_RETRIES + 1)
+
+    with pytest.raises(Exception):
+        fetcher._download_file(_url(server), tmp_path / 'kozlony.pdf')
+    assert len(server.requests) == fetcher.MAX_RETRIES + 1
+    assert not (tmp_path / 'kozlony.pdf').exists()
+
+
+def test_download_does_not_retry_client_errors(server, fetcher, tmp_path):
+    server.responses = [404]
+
+    with pytest.raises(Exception):
+        fetcher._download_file(_url(server), tmp_path / 'kozlony.pdf')
+    assert len(server.requests) == 1
+
+
+def test_download_restarts_when_server_ignores_range(server, fetcher, tmp_path):
+    server.responses = ['drop', 'ignore-range']
+    target = tmp_path / 'kozlony.pdf'
+
+    fetcher._download_file(_url(server), target)
+
+    # A 200-as válasz a teljes fájl, ezért a .part fájlt elölről kell írni
+    assert server.requests[1] is not None
+    assert target.read_bytes() == CONTENT
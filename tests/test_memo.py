@@ -0,0 +1,23 @@
+from src.resolutions.memo import AnalysisMemo, settings_hash
+
+
+def test_results_for_different_settings_are_kept(tmp_path):
+    rules_a = settings_hash(['adó'], rules='a')
+    rules_b = settings_hash(['adó'], rules='b')
+    with AnalysisMemo(str(tmp_path)) as memo:
+        memo.put_many({'h1': {'relevance_score': 1}}, rules_a, 'model')
+        memo.put_many({'h1': {'relevance_score': 2}}, rules_b, 'model')
+
+        assert memo.get_many(['h1'], rules_a, 'model') == {'h1': {'relevance_score': 1}}
+        assert memo.get_many(['h1'], rules_b, 'model') == {'h1': {'relevance_score': 2}}
+
+
+def test_evict_and_invalidate(tmp_path):
+    settings = settings_hash(['adó'])
+    with AnalysisMemo(str(tmp_path), max_entries=2) as memo:
+        for index in range(3):
+            memo.put_many({f'h{index}': {}}, settings, 'model')
+        assert memo.count() == 2
+
+        assert memo.invalidate() == 2
+        assert memo.count() == 0
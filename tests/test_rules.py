@@ -0,0 +1,42 @@
+from src.resolutions.lemma_index import LemmaPostings, ResolutionLemmas
+from src.resolutions.rules import RuleEngine, RuleSet, compile_term
+
+
+def _lemmatize(text):
+    return text.lower().split()
+
+
+def _resolution(content, title=""):
+    return {'title': title, 'content': content}
+
+
+def _lemmas(title, content):
+    return ResolutionLemmas(LemmaPostings.from_lemmas(title), LemmaPostings.from_lemmas(content))
+
+
+def test_same_text_in_lemma_and_prefix_mode_counted_separately():
+    prefix = RuleSet('prefix', [compile_term('adó')])
+    lemma = RuleSet('lemma', [compile_term({'term': 'adó', 'match': 'lemma'}, lemmatize=_lemmatize)])
+    resolution = _resolution("adóhatóság adó")
+    # A lemma index szerint csak a második szó szótári alakja "adó"
+    lemmas = _lemmas([], ['adóhatóság', 'adó'])
+
+    for rule_sets in ([prefix, lemma], [lemma, prefix]):
+        engine = RuleEngine(rule_sets)
+        assert engine.uses_lemmas
+        with_index = engine.score(resolution, lemmas)
+        without_index = engine.score(resolution)
+
+        assert with_index['prefix'] == without_index['prefix']
+        assert with_index['prefix']['relevance_score'] == 2
+        assert with_index['lemma']['relevance_score'] == 1
+        assert without_index['lemma']['relevance_score'] == 2
+
+
+def test_shared_pattern_counted_once_for_all_rule_sets():
+    engine = RuleEngine([RuleSet('a', [compile_term('adó')]), RuleSet('b', [compile_term('adó')])])
+
+    scores = engine.score(_resolution("adó adója"))
+
+    assert scores['a'] == scores['b']
+    assert scores['a']['relevance_score'] == 2